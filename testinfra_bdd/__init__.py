@@ -6,7 +6,9 @@ https://github.com/cbdq-io/testinfra-bdd
 
 Please avoid already-imported warning: PYTEST_DONT_REWRITE.
 """
-from testinfra_bdd.fixture import TestinfraBDD
+from testinfra_bdd.async_engine import MAX_CONCURRENT_CHECKS, get_async_fixture
+from testinfra_bdd.fixture import TestinfraBDD  # noqa: F401
+from testinfra_bdd.host_pool import HOST_POOL
 
 """PYTEST_MODULES.
 
@@ -16,13 +18,18 @@ PYTEST_MODULES = [
     'testinfra_bdd',
     'testinfra_bdd.given',
     'testinfra_bdd.address',
+    'testinfra_bdd.async_engine',
+    'testinfra_bdd.cassette',
     'testinfra_bdd.command',
+    'testinfra_bdd.command_modes',
     'testinfra_bdd.file',
     'testinfra_bdd.group',
+    'testinfra_bdd.instrumentation',
     'testinfra_bdd.package',
     'testinfra_bdd.pip',
     'testinfra_bdd.process',
     'testinfra_bdd.service',
+    'testinfra_bdd.sharding',
     'testinfra_bdd.socket',
     'testinfra_bdd.user',
     'testinfra_bdd.when'
@@ -40,6 +47,12 @@ def get_host_fixture(hostspec, timeout=0):
     """
     Return a host that is confirmed as ready.
 
+    Ready backends are shared between scenarios via the process-wide
+    testinfra_bdd.host_pool.HOST_POOL, but each call returns a new
+    TestinfraBDD object so that no state leaks between scenarios.  If
+    testinfra_bdd.async_engine.MAX_CONCURRENT_CHECKS is set, the object is a
+    TestinfraBDDAsync that runs consecutive Then steps concurrently.
+
     hostspec : str
         The URL of the System Under Test (SUT).  Must comply to the Testinfra
         URL patterns.  See
@@ -62,6 +75,6 @@ def get_host_fixture(hostspec, timeout=0):
     else:
         message = f'The host {hostspec} is not ready.'
 
-    host = TestinfraBDD(hostspec)
-    assert host.is_host_ready(timeout), message
-    return host
+    host = HOST_POOL.get_host(hostspec, timeout)
+    assert host, message
+    return get_async_fixture(host) if MAX_CONCURRENT_CHECKS else host
@@ -0,0 +1,146 @@
+"""
+A snapshot of the user and group databases of a host.
+
+Rather than running id and getent for each property of each user or group,
+all of the users and groups are listed with "getent passwd" and "getent
+group" and then looked up locally.  Users and groups that are not in the
+snapshot (e.g. directory services that can't be enumerated) are looked up
+on the host as normal.
+"""
+import os
+
+from testinfra_bdd.account_helpers import list_accounts
+from testinfra_bdd.host_cache import HostCache
+
+"""ACCOUNT_DATABASES.
+
+The process-wide cache of user and group databases.  The number of seconds
+that the databases of a host are cached for can be configured with the
+TESTINFRA_BDD_ACCOUNT_DATABASE_TTL environment variable.
+"""
+ACCOUNT_DATABASES = HostCache(ttl=float(os.environ.get('TESTINFRA_BDD_ACCOUNT_DATABASE_TTL', '300')))
+
+
+def get_account_database(host):
+    """
+    Get the (cached) user and group databases of a host.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+
+    Returns
+    -------
+    testinfra_bdd.account_helpers.AccountDatabase or None
+        The users and groups.  None if they could not be listed.
+    """
+    return ACCOUNT_DATABASES.get((host, 'accounts'), lambda: list_accounts(host))
+
+
+def get_group(host, name):
+    """
+    Get the properties and members of a group.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+    name : str
+        The name of the group.
+
+    Returns
+    -------
+    dict
+        The gid, members and state of the group.  The gid is None and the
+        members are empty if the group is absent.
+    """
+    database = get_account_database(host)
+    group = database.groups.get(name) if database is not None else None
+
+    if group is not None:
+        return {'gid': group['gid'], 'members': group['members'], 'state': 'present'}
+
+    group = host.group(name)
+
+    if not group.exists:
+        return {'gid': None, 'members': [], 'state': 'absent'}
+
+    return {'gid': str(group.gid), 'members': group.members, 'state': 'present'}
+
+
+def get_group_membership(host, group_name, user_name):
+    """
+    Check if a user is a member of a group.
+
+    The membership is looked up in the index of the groups of each member,
+    so the member list of the group is not searched.  Users that are not in
+    the snapshot (e.g. that were created after it was taken) are looked up
+    on the host.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+    group_name : str
+        The name of the group.
+    user_name : str
+        The name of the user.
+
+    Returns
+    -------
+    tuple
+        str
+            The state of the group (absent or present).
+        bool
+            True if the user is a member of the group.
+    """
+    database = get_account_database(host)
+
+    if database is not None and group_name in database.groups and user_name in database.users:
+        return 'present', group_name in database.groups_by_member.get(user_name, ())
+
+    group = host.group(group_name)
+
+    if not group.exists:
+        return 'absent', False
+
+    return 'present', user_name in group.members
+
+
+def get_user_properties(host, name):
+    """
+    Get the properties of a user.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+    name : str
+        The name of the user.
+
+    Returns
+    -------
+    dict
+        The gid, group, home, shell, state and uid of the user.  Only the
+        state if the user is absent.
+    """
+    database = get_account_database(host)
+    properties = database.get_user_properties(name) if database is not None else None
+
+    if properties is not None:
+        return properties
+
+    user = host.user(name)
+
+    if not user.exists:
+        return {'state': 'absent'}
+
+    return {
+        'gid': str(user.gid),
+        'group': user.group,
+        'home': user.home,
+        'shell': user.shell,
+        'state': 'present',
+        'uid': str(user.uid)
+    }
@@ -0,0 +1,126 @@
+"""Helper functions for listing all of the users and groups of a host."""
+
+
+class AccountDatabase:
+    """The users and groups of a host, indexed by name and ID and the groups by member."""
+
+    def __init__(self, passwd, group):
+        """
+        Create an AccountDatabase object.
+
+        Parameters
+        ----------
+        passwd : str
+            The output of "getent passwd".
+        group : str
+            The output of "getent group".
+        """
+        self.groups = {}
+        self.groups_by_gid = {}
+        self.groups_by_member = {}
+        self.users = {}
+        self.users_by_uid = {}
+        self._add_users(passwd)
+        self._add_groups(group)
+
+    def _add_groups(self, group):
+        """
+        Index the groups of the group database.
+
+        Parameters
+        ----------
+        group : str
+            The output of "getent group".
+        """
+        for line in group.splitlines():
+            fields = line.split(':')
+
+            if len(fields) == 4:
+                members = fields[3].split(',') if fields[3] else []
+                group_entry = {'name': fields[0], 'gid': fields[2], 'members': members}
+                self.groups_by_gid.setdefault(group_entry['gid'], group_entry)
+
+                if self.groups.setdefault(group_entry['name'], group_entry) is group_entry:
+                    self._add_members(group_entry)
+
+    def _add_members(self, group_entry):
+        """
+        Index a group by each of its members.
+
+        Parameters
+        ----------
+        group_entry : dict
+            The name, gid and members of the group.
+        """
+        for member in group_entry['members']:
+            self.groups_by_member.setdefault(member, set()).add(group_entry['name'])
+
+    def _add_users(self, passwd):
+        """
+        Index the users of the passwd database.
+
+        Parameters
+        ----------
+        passwd : str
+            The output of "getent passwd".
+        """
+        for line in passwd.splitlines():
+            fields = line.split(':')
+
+            if len(fields) == 7:
+                user = dict(zip(('name', 'password', 'uid', 'gid', 'gecos', 'home', 'shell'), fields))
+                self.users.setdefault(user['name'], user)
+                self.users_by_uid.setdefault(user['uid'], user)
+
+    def get_user_properties(self, name):
+        """
+        Get the properties of a user.
+
+        Parameters
+        ----------
+        name : str
+            The name of the user.
+
+        Returns
+        -------
+        dict or None
+            The gid, group, home, shell, state and uid of the user.  None if
+            the user is not in the database.
+        """
+        user = self.users.get(name)
+
+        if user is None:
+            return None
+
+        primary_group = self.groups_by_gid.get(user['gid'], {'name': user['gid']})
+        return {
+            'gid': user['gid'],
+            'group': primary_group['name'],
+            'home': user['home'],
+            'shell': user['shell'],
+            'state': 'present',
+            'uid': user['uid']
+        }
+
+
+def list_accounts(host):
+    """
+    List the users and groups of a host.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+
+    Returns
+    -------
+    AccountDatabase or None
+        The users and groups.  None if getent is not available on the host.
+    """
+    passwd = host.run('getent passwd')
+    group = host.run('getent group')
+
+    if passwd.rc != 0 or group.rc != 0:
+        return None
+
+    return AccountDatabase(passwd.stdout, group.stdout)
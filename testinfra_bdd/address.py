@@ -3,12 +3,26 @@ Then address fixtures for testinfra-bdd.
 
 Please avoid already-imported warning: PYTEST_DONT_REWRITE.
 """
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
 
-from testinfra_bdd.parsers import parse_addr_and_port
+from testinfra_bdd import parsers
+from testinfra_bdd.address_sweep import get_sweep_mismatches
+from testinfra_bdd.fleet import for_each_host
+from testinfra_bdd.parsers import parse_addr_and_port, parse_table
+
+"""ADDRESS_STATES.
+
+The states that an address can be checked for and the attribute of the
+Testinfra address that is only evaluated when that state is checked.
+"""
+ADDRESS_STATES = {
+    'resolvable': 'is_resolvable',
+    'reachable': 'is_reachable'
+}
 
 
 @when(parsers.parse('the TestInfra address is {address}'))
+@for_each_host
 def when_the_address_is(address: str, testinfra_bdd_host):
     """
     Check the status of a user.
@@ -24,6 +38,7 @@ def when_the_address_is(address: str, testinfra_bdd_host):
 
 
 @when(parsers.parse('the TestInfra address and port is {url}'))
+@for_each_host
 def when_the_address_and_port_is(url, testinfra_bdd_host):
     """
     Check the status of an address and port.
@@ -43,6 +58,7 @@ def when_the_address_and_port_is(url, testinfra_bdd_host):
 
 
 @then(parsers.parse('the TestInfra address is {expected_state}'))
+@for_each_host
 def the_address_is(expected_state, testinfra_bdd_host):
     """
     Check the actual state of an address against an expected state.
@@ -62,17 +78,14 @@ def the_address_is(expected_state, testinfra_bdd_host):
     """
     address = testinfra_bdd_host.address
     assert address, 'Address is not set.  Did you miss a "When address is" step?'
-    properties = {
-        'resolvable': address.is_resolvable,
-        'reachable': address.is_reachable
-    }
     expected_state = expected_state.strip('"')
-    assert expected_state in properties, f'Invalid state for {address.name} ("{expected_state}").'
+    assert expected_state in ADDRESS_STATES, f'Invalid state for {address.name} ("{expected_state}").'
     message = f'Expected the address {address.name} to be {expected_state} but it is not.'
-    assert properties[expected_state], message
+    assert getattr(address, ADDRESS_STATES[expected_state]), message
 
 
 @then(parsers.parse('the TestInfra port is {expected_state}'))
+@for_each_host
 def the_port_is(expected_state, testinfra_bdd_host):
     """
     Check the actual state of an address port against an expected state.
@@ -93,9 +106,30 @@ def the_port_is(expected_state, testinfra_bdd_host):
     port = testinfra_bdd_host.port
     expected_state = expected_state.strip('"')
     assert port, 'Port is not set.  Did you miss a "When the address and port" step?'
-    properties = {
-        'reachable': port.is_reachable
-    }
-    assert expected_state in properties, f'Unknown Port property ("{expected_state}").'
+    assert expected_state == 'reachable', f'Unknown Port property ("{expected_state}").'
     message = f'{testinfra_bdd_host.address.name}:{testinfra_bdd_host.port_number} is unreachable.'
-    assert properties['reachable'], message
+    assert port.is_reachable, message
+
+
+@then(parsers.parse('the TestInfra addresses and ports are\n{table}'))
+@for_each_host
+def the_addresses_and_ports_are(table, testinfra_bdd_host):
+    """
+    Probe many address and port pairs from the host concurrently.
+
+    Parameters
+    ----------
+    table : str
+        A data table with a "url" (e.g. "www.google.com:443") and a "state"
+        (either "reachable" or "unreachable") column.
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+
+    Raises
+    ------
+    AssertError
+        If any of the actual states do not match the expected states.  All of
+        the mismatches are reported together.
+    """
+    mismatches = get_sweep_mismatches(testinfra_bdd_host.host, parse_table(table))
+    assert not mismatches, '\n'.join(mismatches)
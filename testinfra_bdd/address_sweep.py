@@ -0,0 +1,160 @@
+"""
+Check that many address and port pairs are reachable from the host at once.
+
+All of the ports are probed concurrently by a single remote command, so the
+time taken is bounded by the slowest probe rather than the sum of them.
+"""
+import concurrent.futures
+import os
+import re
+
+from testinfra_bdd.exception_message import exception_message
+from testinfra_bdd.fleet import MAX_WORKERS
+from testinfra_bdd.parsers import check_table_columns, parse_addr_and_port
+
+"""PROBE_TIMEOUT.
+
+The number of seconds that each port probe waits for a connection.  Can be
+configured with the TESTINFRA_BDD_PROBE_TIMEOUT environment variable.
+"""
+PROBE_TIMEOUT = int(os.environ.get('TESTINFRA_BDD_PROBE_TIMEOUT', '1'))
+
+"""PROBE_FUNCTION.
+
+A shell function that probes a port (with nc or, like Testinfra, falling
+back to bash) and prints the index and return code of the probe.  Each
+probe is run in the background.
+"""
+PROBE_FUNCTION = (
+    'probe() { '
+    'if command -v nc >/dev/null 2>&1; then nc -w "$3" -z "$1" "$2"; '
+    "else timeout \"$3\" bash -c 'cat </dev/null >\"/dev/tcp/$0/$1\"' \"$1\" \"$2\"; fi >/dev/null 2>&1; "
+    'echo "$4 $?"; }; '
+)
+
+
+def get_sweep_mismatches(host, rows, timeout=PROBE_TIMEOUT):
+    """
+    Compare the actual reachability of many address and port pairs against the expectation.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host to probe the ports from.
+    rows : list
+        A list of dictionaries, each with a "url" (e.g. "www.google.com:443")
+        and a "state" (either "reachable" or "unreachable") key.
+    timeout : int, optional
+        The number of seconds that each probe waits for a connection.
+
+    Returns
+    -------
+    list
+        A message for each address and port that is not in the expected state.
+
+    Raises
+    ------
+    ValueError
+        If a row has no url or state or a url can't be parsed.
+    """
+    check_table_columns(rows, ('url', 'state'))
+    reachable = sweep_ports(host, [row['url'] for row in rows], timeout)
+    mismatches = []
+
+    for (row, is_reachable) in zip(rows, reachable):
+        actual_state = 'reachable' if is_reachable else 'unreachable'
+
+        if actual_state != row['state']:
+            mismatches.append(exception_message(f'address and port {row["url"]}', actual_state, row['state']))
+
+    return mismatches
+
+
+def get_probe_script(ports, timeout):
+    """
+    Get the command that probes many ports concurrently.
+
+    Parameters
+    ----------
+    ports : list
+        The (address, port, port number) of each port (see
+        testinfra_bdd.parsers.parse_addr_and_port).
+    timeout : int
+        The number of seconds that each probe waits for a connection.
+
+    Returns
+    -------
+    tuple
+        str
+            The command.
+        list
+            The arguments that are quoted into the command.
+    """
+    probes = ''.join(f'probe %s %s {timeout} {index} & ' for index in range(len(ports)))
+    args = [arg for (address, _, port_number) in ports for arg in (address.name, str(port_number))]
+    return PROBE_FUNCTION + probes + 'wait', args
+
+
+def probe_ports(host, ports, timeout):
+    """
+    Probe many ports concurrently with a single remote command.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host to probe the ports from.
+    ports : list
+        The (address, port, port number) of each port.
+    timeout : int
+        The number of seconds that each probe waits for a connection.
+
+    Returns
+    -------
+    list or None
+        True for each port that is reachable.  None if the ports could not
+        be probed with a single command.
+    """
+    (command, args) = get_probe_script(ports, timeout)
+    cmd = host.run(command, *args)
+    return_codes = dict(re.findall(r'^(\d+) (\d+)$', cmd.stdout, re.MULTILINE))
+
+    if cmd.rc != 0 or len(return_codes) != len(ports):
+        return None
+
+    return [return_codes[str(index)] == '0' for index in range(len(ports))]
+
+
+def sweep_ports(host, urls, timeout=PROBE_TIMEOUT):
+    """
+    Probe many address and port pairs from the host concurrently.
+
+    If the ports can't be probed with a single command, each port is
+    probed with Testinfra instead (on a pool of threads).
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host to probe the ports from.
+    urls : list
+        The address and port pairs (e.g. "www.google.com:443").
+    timeout : int, optional
+        The number of seconds that each probe waits for a connection.
+
+    Returns
+    -------
+    list
+        True for each address and port that is reachable.
+
+    Raises
+    ------
+    ValueError
+        If a url can't be parsed.
+    """
+    ports = [parse_addr_and_port(url, host) for url in urls]
+    reachable = probe_ports(host, ports, timeout)
+
+    if reachable is None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(ports)))) as executor:
+            reachable = list(executor.map(lambda port: port[1].is_reachable, ports))
+
+    return reachable
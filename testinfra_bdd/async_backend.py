@@ -0,0 +1,172 @@
+"""
+Run the commands of hosts with asyncio.subprocess on a shared event loop.
+
+The backends that run each command with a local process (e.g. the local,
+docker and ssh backends) are copied with a run_local method that runs the
+process on EVENT_LOOP, so that many commands can be in flight at once.
+
+Please avoid already-imported warning: PYTEST_DONT_REWRITE.
+"""
+import asyncio
+import copy
+import functools
+import math
+import threading
+
+import testinfra.host
+
+from testinfra_bdd.backend_helpers import LOCAL_PROCESS_BACKENDS
+from testinfra_bdd.host_cache import HostCache
+
+
+class EventLoopThread:
+    """An asyncio event loop that runs in a daemon thread, so that synchronous code can wait for coroutines."""
+
+    def __init__(self):
+        """Create an EventLoopThread object.  The loop is started when it is first used."""
+        self._lock = threading.Lock()
+        self._loop = None
+
+    def run(self, coroutine):
+        """
+        Run a coroutine on the event loop and wait for its result.
+
+        Parameters
+        ----------
+        coroutine : coroutine
+            The coroutine to run.
+
+        Returns
+        -------
+        object
+            The result of the coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop()).result()
+
+    def _get_loop(self):
+        """
+        Get the event loop, starting it if required.
+
+        Returns
+        -------
+        asyncio.AbstractEventLoop
+            The running event loop.
+        """
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='testinfra-bdd-event-loop', daemon=True).start()
+
+        return self._loop
+
+
+"""EVENT_LOOP.
+
+The process-wide event loop that the commands and the deferred steps are
+run on.
+"""
+EVENT_LOOP = EventLoopThread()
+
+"""ASYNC_HOSTS.
+
+The host with an asyncio.subprocess backend of each host.
+"""
+ASYNC_HOSTS = HostCache(ttl=math.inf, snapshot=False)
+
+
+async def communicate(command):
+    """
+    Run a local command with asyncio.subprocess.
+
+    Parameters
+    ----------
+    command : bytes
+        The command line, run with the shell.
+
+    Returns
+    -------
+    tuple
+        The return code, stdout and stderr of the command.
+    """
+    process = await asyncio.create_subprocess_shell(
+        command, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    (stdout, stderr) = await process.communicate()
+    return process.returncode, stdout, stderr
+
+
+def get_async_host(host):
+    """
+    Get a host that runs its commands with asyncio.subprocess.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The Testinfra host.
+
+    Returns
+    -------
+    testinfra.host.Host
+        A host with a copy of the backend that runs each local process on
+        EVENT_LOOP or the host itself if the backend doesn't run commands
+        with a local process.
+    """
+    if host.backend.NAME not in LOCAL_PROCESS_BACKENDS:
+        return host
+
+    def make_async_host():
+        backend = copy.copy(host.backend)
+        backend.run_local = functools.partial(run_local, backend)
+        return testinfra.host.Host(backend)
+
+    return ASYNC_HOSTS.get((host, 'async'), make_async_host)
+
+
+async def run_concurrently(calls, limit):
+    """
+    Call synchronous functions concurrently, each in a thread of the event loop.
+
+    Parameters
+    ----------
+    calls : list
+        The function and keyword arguments of each call.
+    limit : int
+        The maximum number of functions to call concurrently.
+
+    Returns
+    -------
+    list
+        The result (or exception) of each call, in the same order.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def call(function, kwargs):
+        async with semaphore:
+            return await asyncio.to_thread(function, **kwargs)
+
+    return await asyncio.gather(*[call(function, kwargs) for (function, kwargs) in calls], return_exceptions=True)
+
+
+def run_local(backend, command, *args):
+    """
+    Run a local command for a backend with asyncio.subprocess.
+
+    Replaces the run_local method of the backends of asynchronous hosts.
+
+    Parameters
+    ----------
+    backend : testinfra.backend.base.BaseBackend
+        The backend.
+    command : str
+        The command.
+    *args : tuple
+        Arguments that are quoted into the command.
+
+    Returns
+    -------
+    testinfra.backend.base.CommandResult
+        The result of the command.
+    """
+    command = backend.encode(backend.quote(command, *args))
+    (rc, stdout, stderr) = EVENT_LOOP.run(communicate(command))
+    return backend.result(rc, command, stdout, stderr)
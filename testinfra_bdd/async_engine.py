@@ -0,0 +1,214 @@
+"""
+Run the independent Then steps of a scenario concurrently.
+
+The steps of a TestinfraBDDAsync fixture are run as normal, except that
+consecutive Then steps are deferred until the last of them and then run
+concurrently.  The backend calls, time and failures of each deferred step
+are still recorded against it (see testinfra_bdd.instrumentation).  The commands of
+the host are run with asyncio.subprocess (see testinfra_bdd.async_backend),
+so one worker can have many commands in flight.
+
+Please avoid already-imported warning: PYTEST_DONT_REWRITE.
+"""
+import os
+import threading
+
+import pytest
+
+from testinfra_bdd import cassette
+from testinfra_bdd.async_backend import (EVENT_LOOP, get_async_host,
+                                         run_concurrently)
+from testinfra_bdd.deferred_steps import (get_last_deferred_step,
+                                          get_step_failures, get_step_skip,
+                                          run_deferred_step)
+from testinfra_bdd.fixture import TestinfraBDD
+from testinfra_bdd.instrumentation import BACKEND_CALLS
+
+"""MAX_CONCURRENT_CHECKS.
+
+The maximum number of Then steps that are run concurrently by a
+TestinfraBDDAsync fixture.  Can be configured with the
+TESTINFRA_BDD_MAX_CONCURRENT_CHECKS environment variable.  If it is zero
+(the default), testinfra_bdd.get_host_fixture returns TestinfraBDD fixtures
+that run each step in turn.
+"""
+MAX_CONCURRENT_CHECKS = int(os.environ.get('TESTINFRA_BDD_MAX_CONCURRENT_CHECKS', '0'))
+
+"""ASYNC_HOST.
+
+The key of the last TestinfraBDDAsync fixture of a scenario in the stash of
+its test item.
+"""
+ASYNC_HOST = pytest.StashKey['TestinfraBDDAsync']()
+
+
+class TestinfraBDDAsync(TestinfraBDD):
+    """A fixture that runs consecutive Then steps concurrently."""
+
+    def __init__(self, url, host=None, max_concurrent_checks=MAX_CONCURRENT_CHECKS):
+        """
+        Create a TestinfraBDDAsync object.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the System Under Test (SUT).  Must comply to the Testinfra
+            URL patterns.  See https://testinfra.readthedocs.io/en/latest/backends.html
+        host : testinfra.host.Host, optional
+            An existing backend for the URL (e.g. from a pool of ready hosts).
+            If not provided, one is obtained from testinfra.get_host.
+        max_concurrent_checks : int, optional
+            The maximum number of Then steps that are run concurrently.
+        """
+        super().__init__(url, get_async_host(host if host is not None else cassette.get_host(url)))
+        self.deferred_step = None
+        self.last_step = None
+        self.max_concurrent_checks = max(1, max_concurrent_checks)
+        self.pending_steps = []
+        self._lock = threading.Lock()
+
+    def get_file_properties(self):
+        """
+        Get the properties of the file, only once for the steps that are run concurrently.
+
+        Returns
+        -------
+        dict
+            The properties of the file.
+        """
+        with self._lock:
+            return super().get_file_properties()
+
+    def get_process_snapshot(self):
+        """
+        Get the process snapshot, only once for the steps that are run concurrently.
+
+        Returns
+        -------
+        testinfra_bdd.process_snapshot.ProcessSnapshot
+            The snapshot of the processes of the host.
+        """
+        with self._lock:
+            return super().get_process_snapshot()
+
+    def get_socket_inventory(self):
+        """
+        Get the socket inventory, only once for the steps that are run concurrently.
+
+        Returns
+        -------
+        testinfra_bdd.socket_inventory.SocketInventory
+            The listening sockets of the host.
+        """
+        with self._lock:
+            return super().get_socket_inventory()
+
+    def run_pending_steps(self):
+        """
+        Run the deferred Then steps concurrently.
+
+        Raises
+        ------
+        AssertError
+            If any of the steps failed.  The failures of every step are
+            reported together.
+        pytest.skip.Exception
+            If none of the steps failed but one of them was skipped.
+        """
+        (steps, self.pending_steps) = (self.pending_steps, [])
+
+        if not steps:
+            return
+
+        calls = [(run_deferred_step, {'record': record, 'step_function': step_function, 'kwargs': kwargs})
+                 for (_, step_function, kwargs, record) in steps]
+        results = EVENT_LOOP.run(run_concurrently(calls, self.max_concurrent_checks))
+        failures = get_step_failures(steps, results)
+        assert not failures, 'The deferred step(s) failed:\n{}'.format('\n'.join(failures))
+        skipped = get_step_skip(results)
+
+        if skipped is not None:
+            raise skipped
+
+    def run_step(self, step_function, kwargs):
+        """
+        Run a step, or defer it if it is a Then step.
+
+        The deferred steps are run with the last of the consecutive Then
+        steps.
+
+        Parameters
+        ----------
+        step_function : callable
+            The step to run.
+        kwargs : dict
+            The arguments for the step.
+
+        Returns
+        -------
+        object
+            The result of the step or None if it was deferred.
+        """
+        if self.deferred_step is None:
+            return step_function(**kwargs)
+
+        # The backend calls of the step are attributed to its record, although they are made later.
+        self.pending_steps.append((self.deferred_step, step_function, kwargs, BACKEND_CALLS.current_step))
+
+        if self.deferred_step is self.last_step:
+            self.run_pending_steps()
+
+        return None
+
+    def start_step(self, step, scenario):
+        """
+        Prepare to run a step, running any deferred steps before a step other than a Then step.
+
+        Parameters
+        ----------
+        step : pytest_bdd.parser.Step
+            The step that is about to be run.
+        scenario : pytest_bdd.parser.Scenario
+            The scenario of the step.
+        """
+        self.deferred_step = step if step.type == 'then' else None
+        self.last_step = get_last_deferred_step(scenario.steps, step)
+
+        if self.deferred_step is None:
+            self.run_pending_steps()
+
+
+def get_async_fixture(host):
+    """
+    Get a TestinfraBDDAsync fixture for the same host as a TestinfraBDD fixture.
+
+    Parameters
+    ----------
+    host : testinfra_bdd.fixture.TestinfraBDD
+        The fixture (e.g. from testinfra_bdd.host_pool.HOST_POOL).
+
+    Returns
+    -------
+    TestinfraBDDAsync
+        The fixture, with the facts of the host loaded.
+    """
+    async_host = TestinfraBDDAsync(host.url, host.host)
+    async_host.load_host_facts()
+    return async_host
+
+
+def pytest_bdd_after_scenario(request, feature, scenario):
+    """Run any Then steps that are still deferred at the end of a scenario."""
+    host = request.node.stash.get(ASYNC_HOST, None)
+
+    if host is not None:
+        host.run_pending_steps()
+
+
+def pytest_bdd_before_step_call(request, feature, scenario, step, step_func, step_func_args):
+    """Defer a Then step of a TestinfraBDDAsync fixture or run the deferred steps before any other step."""
+    host = step_func_args.get('testinfra_bdd_host', request.node.stash.get(ASYNC_HOST, None))
+
+    if isinstance(host, TestinfraBDDAsync):
+        request.node.stash[ASYNC_HOST] = host
+        host.start_step(step, scenario)
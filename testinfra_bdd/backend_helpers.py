@@ -0,0 +1,48 @@
+"""Helper functions for working with the Testinfra backends."""
+import copy
+
+"""LOCAL_PROCESS_BACKENDS.
+
+The Testinfra backends that run each command with a local process (e.g.
+docker exec or ssh).
+"""
+LOCAL_PROCESS_BACKENDS = ('chroot', 'docker', 'kubectl', 'local', 'lxc', 'openshift', 'podman', 'ssh')
+
+
+class CapturedCommand(Exception):
+    """Raised instead of running the local command that a backend would run."""
+
+
+def get_local_command(backend, command):
+    """
+    Get the local command line that a backend would run for a command.
+
+    The command is not run.
+
+    Parameters
+    ----------
+    backend : testinfra.backend.base.BaseBackend
+        The backend of the host.
+    command : str
+        The command to be run on the host.
+
+    Returns
+    -------
+    bytes or None
+        The local command line (e.g. b"docker exec sut /bin/sh -c ls") or
+        None if the backend does not run commands with a local process.
+    """
+    if backend.NAME not in LOCAL_PROCESS_BACKENDS:
+        return None
+
+    backend = copy.copy(backend)
+
+    def capture(local_command, *args):
+        raise CapturedCommand(backend.encode(backend.quote(local_command, *args)))
+
+    backend.run_local = capture
+
+    try:
+        backend.run(command)
+    except CapturedCommand as captured:
+        return captured.args[0]
@@ -0,0 +1,75 @@
+"""Polling with a jittered exponential backoff."""
+import random
+import time
+
+"""INITIAL_POLL_INTERVAL.
+
+The approximate number of seconds to wait after the first failed poll.
+"""
+INITIAL_POLL_INTERVAL = 0.05
+
+"""MAX_POLL_INTERVAL.
+
+The maximum number of seconds to wait between polls.
+"""
+MAX_POLL_INTERVAL = 2.0
+
+
+def backoff_delays(initial=INITIAL_POLL_INTERVAL, maximum=MAX_POLL_INTERVAL):
+    """
+    Generate jittered, exponentially increasing delays.
+
+    Each delay is between half and all of the current interval, which
+    doubles after each delay until it reaches the maximum.  The jitter stops
+    many workers polling the same host in lock step.
+
+    Parameters
+    ----------
+    initial : float, optional
+        The initial interval in seconds.
+    maximum : float, optional
+        The maximum interval in seconds.
+
+    Yields
+    ------
+    float
+        The next delay in seconds.
+    """
+    interval = initial
+
+    while True:
+        yield interval / 2 + random.uniform(0, interval / 2)  # nosec B311
+        interval = min(interval * 2, maximum)
+
+
+def wait_until(predicate, timeout):
+    """
+    Poll a predicate until it is true or the timeout expires.
+
+    The predicate is always called at least once and once more when the
+    timeout expires.
+
+    Parameters
+    ----------
+    predicate : callable
+        A function that takes no arguments and returns a bool.
+    timeout : float
+        The maximum number of seconds to wait.
+
+    Returns
+    -------
+    bool
+        True if the predicate returned True within the timeout.
+    """
+    deadline = time.monotonic() + timeout
+
+    for delay in backoff_delays():
+        if predicate():
+            return True
+
+        remaining = deadline - time.monotonic()
+
+        if remaining <= 0:
+            return False
+
+        time.sleep(min(delay, remaining))
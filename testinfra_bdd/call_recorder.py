@@ -0,0 +1,187 @@
+"""
+Record the number and duration of the backend calls of each step.
+
+See testinfra_bdd.instrumentation.
+"""
+import contextlib
+import os
+import threading
+import time
+
+"""TIMING_TOP.
+
+The number of the slowest steps that are reported.  Can be configured with
+the TESTINFRA_BDD_TIMING_TOP environment variable.  The terminal summary is
+not shown if it is zero.
+"""
+TIMING_TOP = int(os.environ.get('TESTINFRA_BDD_TIMING_TOP', '10'))
+
+
+class BackendCallRecorder:
+    """The backend calls of each step and host."""
+
+    def __init__(self):
+        """Create a BackendCallRecorder object."""
+        self._lock = threading.Lock()
+        self._thread = threading.local()
+        self.clear()
+
+    @contextlib.contextmanager
+    def attribute_to(self, step):
+        """
+        Attribute the calls of this thread to a step other than the current step.
+
+        This is for steps that are run later in another thread (see
+        testinfra_bdd.async_engine).  The time taken is added to the step.
+
+        Parameters
+        ----------
+        step : dict or None
+            The step (see current_step).  None to attribute the calls to the
+            current step.
+
+        Yields
+        ------
+        dict or None
+            The step.
+        """
+        started = time.perf_counter()
+        self._thread.step = step
+
+        try:
+            yield step
+        finally:
+            self._thread.step = None
+
+            if step is not None and 'seconds' in step:
+                step['seconds'] += time.perf_counter() - started
+
+    def clear(self):
+        """Forget all of the recorded calls and steps."""
+        self.current_step = None
+        self.hosts = {}
+        self.steps = []
+        self.unattributed = {'calls': 0, 'backend_seconds': 0.0}
+
+    def finish_step(self, failed=False):
+        """
+        Finish the current step.
+
+        Parameters
+        ----------
+        failed : bool, optional
+            True if the step failed.
+        """
+        with self._lock:
+            step = self.current_step
+            self.current_step = None
+
+        if step is not None:
+            step['failed'] = failed
+            step['seconds'] = time.perf_counter() - step.pop('_started')
+            self.steps.append(step)
+
+    def get_report(self, top=TIMING_TOP):
+        """
+        Get a summary of the recorded calls.
+
+        Parameters
+        ----------
+        top : int, optional
+            The number of the slowest steps to include.
+
+        Returns
+        -------
+        dict
+            The slowest steps ("slowest_steps"), the calls and backend time
+            of each step, aggregated by step text ("steps"), the calls and
+            backend time of each host ("hosts") and the calls that were made
+            outside of a step ("unattributed").
+        """
+        steps = {}
+
+        for step in self.steps:
+            aggregate = steps.setdefault(step['step'], {'executions': 0, 'calls': 0, 'backend_seconds': 0.0})
+            aggregate['executions'] += 1
+            aggregate['calls'] += step['calls']
+            aggregate['backend_seconds'] += step['backend_seconds']
+
+        return {
+            'slowest_steps': sorted(self.steps, key=lambda step: step['seconds'], reverse=True)[:top],
+            'steps': steps,
+            'hosts': self.hosts,
+            'unattributed': self.unattributed
+        }
+
+    def record(self, hostspec, seconds):
+        """
+        Record a call to the backend of a host.
+
+        Parameters
+        ----------
+        hostspec : str
+            The host (e.g. "docker://sut").
+        seconds : float
+            The time taken by the call.
+        """
+        with self._lock:
+            step = getattr(self._thread, 'step', None) or self.current_step or self.unattributed
+
+            for totals in (step, self.hosts.setdefault(hostspec, {})):
+                totals['calls'] = totals.get('calls', 0) + 1
+                totals['backend_seconds'] = totals.get('backend_seconds', 0.0) + seconds
+
+    def start_step(self, feature, scenario, step):
+        """
+        Start attributing calls to a step.
+
+        Parameters
+        ----------
+        feature : str
+            The name of the feature.
+        scenario : str
+            The name of the scenario.
+        step : str
+            The keyword and text of the step (e.g. "When the TestInfra user is ntp").
+        """
+        step = {
+            'feature': feature,
+            'scenario': scenario,
+            'step': step,
+            'calls': 0,
+            'backend_seconds': 0.0,
+            '_started': time.perf_counter()
+        }
+
+        with self._lock:
+            self.current_step = step
+
+
+def get_summary_lines(report):
+    """
+    Format a report of the backend calls for the terminal.
+
+    Parameters
+    ----------
+    report : dict
+        The report (see BackendCallRecorder.get_report).
+
+    Returns
+    -------
+    list
+        The lines of the summary.
+    """
+    lines = ['Slowest steps:']
+
+    for step in report['slowest_steps']:
+        lines.append(
+            f'  {step["seconds"]:8.3f}s {step["calls"]:5d} calls {step["backend_seconds"]:8.3f}s backend'
+            f'  {step["scenario"]}: {step["step"]}'
+        )
+
+    lines.append('Backend time per host:')
+
+    for (hostspec, totals) in sorted(report['hosts'].items()):
+        lines.append(f'  {totals["backend_seconds"]:8.3f}s {totals["calls"]:5d} calls  {hostspec}')
+
+    return lines
@@ -0,0 +1,141 @@
+"""
+Record the commands run on hosts to a cassette and replay them without the hosts.
+
+In record mode, every command that is run through the host of a
+TestinfraBDD object (see testinfra_bdd.instrumentation) is saved with its
+result, keyed by hostspec, to a gzipped JSON cassette at the end of the
+session.  In replay mode, the hosts are replaced by a backend that answers
+each command from the cassette, so the features can be re-run offline.
+
+With pytest-xdist, each worker sends its recorded commands to the
+controller, which merges them and writes the cassette.  This module must be
+loaded by the controller (e.g. from a conftest.py or with "-p
+testinfra_bdd.cassette") for the commands to be recorded.
+
+Please avoid already-imported warning: PYTEST_DONT_REWRITE.
+"""
+import os
+
+import pytest
+import testinfra.host
+
+from testinfra_bdd.cassette_store import Cassette
+from testinfra_bdd.replay_backend import ReplayBackend
+
+"""CASSETTE_PATH.
+
+The path of the cassette.  Can be configured with the
+TESTINFRA_BDD_CASSETTE environment variable.  Commands are not recorded or
+replayed if it is empty (the default).
+"""
+CASSETTE_PATH = os.environ.get('TESTINFRA_BDD_CASSETTE', '')
+
+"""CASSETTE_MODE.
+
+Either "record", "replay" or "once" (the default) to replay the cassette if
+it exists and record it if it doesn't.  Can be configured with the
+TESTINFRA_BDD_CASSETTE_MODE environment variable.
+"""
+CASSETTE_MODE = os.environ.get('TESTINFRA_BDD_CASSETTE_MODE', 'once')
+
+
+def get_cassette(path=CASSETTE_PATH, mode=CASSETTE_MODE):
+    """
+    Get the cassette to record or replay.
+
+    Parameters
+    ----------
+    path : str, optional
+        The path of the cassette.
+    mode : str, optional
+        Either "record", "replay" or "once".
+
+    Returns
+    -------
+    Cassette or None
+        The cassette or None if no path was given.
+
+    Raises
+    ------
+    ValueError
+        If the mode is not recognised.
+    """
+    if not path:
+        return None
+
+    if mode not in ('once', 'record', 'replay'):
+        raise ValueError(f'Unknown cassette mode "{mode}".')
+
+    return Cassette(path, mode == 'record' or (mode == 'once' and not os.path.exists(path)))
+
+
+"""CASSETTE.
+
+The process-wide cassette that commands are recorded to or replayed from.
+None if commands are not recorded or replayed.
+"""
+CASSETTE = get_cassette()
+
+"""REPLAY_HOSTS.
+
+The replayed host of each hostspec.
+"""
+REPLAY_HOSTS = {}
+
+
+def get_host(hostspec, cassette=CASSETTE):
+    """
+    Get a host, replayed from the cassette if it is being replayed.
+
+    Parameters
+    ----------
+    hostspec : str
+        The URL of the host.
+    cassette : Cassette or None, optional
+        The cassette.
+
+    Returns
+    -------
+    testinfra.host.Host
+        The host.
+    """
+    if cassette is None or cassette.is_recording:
+        return testinfra.host.get_host(hostspec)
+
+    return REPLAY_HOSTS.setdefault((cassette, hostspec), testinfra.host.Host(ReplayBackend(hostspec, cassette)))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Tell a pytest-xdist worker that the controller merges the recorded commands."""
+    node.workerinput['testinfra_bdd_cassette'] = CASSETTE is not None and CASSETTE.is_recording
+
+
+def pytest_configure(config):
+    """Refuse to record on a pytest-xdist worker if the controller can't merge the recorded commands."""
+    workerinput = getattr(config, 'workerinput', None)
+
+    if CASSETTE is not None and CASSETTE.is_recording and workerinput and not workerinput.get('testinfra_bdd_cassette'):
+        raise pytest.UsageError('Recording a cassette with pytest-xdist requires "-p testinfra_bdd.cassette".')
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write the recorded commands to the cassette, or send them to the pytest-xdist controller."""
+    if CASSETTE is None or not CASSETTE.is_recording:
+        return
+
+    workeroutput = getattr(session.config, 'workeroutput', None)
+
+    if workeroutput is None:
+        CASSETTE.save()
+    else:
+        workeroutput['testinfra_bdd_cassette'] = CASSETTE.hosts
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """Merge the commands recorded by a pytest-xdist worker."""
+    hosts = getattr(node, 'workeroutput', {}).get('testinfra_bdd_cassette')
+
+    if CASSETTE is not None and hosts:
+        CASSETTE.merge(hosts)
@@ -0,0 +1,125 @@
+"""
+The commands recorded for each host, stored in a gzipped JSON cassette.
+
+See testinfra_bdd.cassette.
+"""
+import gzip
+import json
+import threading
+
+
+class Cassette:
+    """The results of the commands run on each host, in the order that they were run."""
+
+    def __init__(self, path, is_recording):
+        """
+        Create a Cassette object, loading the cassette if it is being replayed.
+
+        Parameters
+        ----------
+        path : str
+            The path of the cassette.
+        is_recording : bool
+            True to record the cassette, False to replay it.
+        """
+        self.hosts = {}
+        self.is_recording = is_recording
+        self.path = path
+        self._lock = threading.Lock()
+        self._positions = {}
+
+        if not is_recording:
+            with gzip.open(path, 'rt', encoding='utf-8') as stream:
+                self.hosts = json.load(stream)
+
+    def get_encoding(self, hostspec):
+        """
+        Get the encoding of a recorded host.
+
+        Parameters
+        ----------
+        hostspec : str
+            The URL of the host.
+
+        Returns
+        -------
+        str
+            The encoding of the output of the commands.
+        """
+        return self.hosts.get(hostspec, {}).get('encoding', 'utf-8')
+
+    def merge(self, hosts):
+        """
+        Add the commands recorded by another cassette (e.g. by a pytest-xdist worker).
+
+        Parameters
+        ----------
+        hosts : dict
+            The recorded commands of each host (see the hosts attribute).
+        """
+        with self._lock:
+            for (hostspec, host) in hosts.items():
+                recorded = self.hosts.setdefault(hostspec, {'encoding': host['encoding'], 'commands': {}})
+
+                for (command, results) in host['commands'].items():
+                    recorded['commands'].setdefault(command, []).extend(results)
+
+    def play(self, hostspec, command):
+        """
+        Get the next recorded result of a command.
+
+        When all of the results of the command have been played, the last
+        result is played again.
+
+        Parameters
+        ----------
+        hostspec : str
+            The URL of the host.
+        command : str
+            The command, with its arguments quoted into it.
+
+        Returns
+        -------
+        tuple
+            The return code, stdout and stderr of the command.
+
+        Raises
+        ------
+        RuntimeError
+            If the command was not recorded for the host.
+        """
+        results = self.hosts.get(hostspec, {}).get('commands', {}).get(command)
+
+        if not results:
+            raise RuntimeError(f'The command "{command}" was not recorded for {hostspec} in {self.path}.')
+
+        with self._lock:
+            position = self._positions.get((hostspec, command), 0)
+            self._positions[(hostspec, command)] = position + 1
+
+        (rc, stdout, stderr) = results[min(position, len(results) - 1)]
+        return rc, stdout.encode('latin-1'), stderr.encode('latin-1')
+
+    def record(self, hostspec, command, result):
+        """
+        Record the result of a command.
+
+        Parameters
+        ----------
+        hostspec : str
+            The URL of the host.
+        command : str
+            The command, with its arguments quoted into it.
+        result : testinfra.backend.base.CommandResult
+            The result of the command.
+        """
+        response = [result.rc, result.stdout_bytes.decode('latin-1'), result.stderr_bytes.decode('latin-1')]
+
+        with self._lock:
+            host = self.hosts.setdefault(hostspec, {'encoding': result.backend.encoding, 'commands': {}})
+            host['commands'].setdefault(command, []).append(response)
+
+    def save(self):
+        """Write the recorded commands to the cassette."""
+        with self._lock, gzip.open(self.path, 'wt', encoding='utf-8') as stream:
+            json.dump(self.hosts, stream, separators=(',', ':'), sort_keys=True)
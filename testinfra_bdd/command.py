@@ -5,14 +5,32 @@ Please avoid already-imported warning: PYTEST_DONT_REWRITE.
 """
 import re
 
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
+
+from testinfra_bdd import parsers
+from testinfra_bdd.command_batch import get_commands_mismatches
+from testinfra_bdd.command_cache import COMMAND_CACHE
+from testinfra_bdd.command_stream import search_command_stream
+from testinfra_bdd.fleet import for_each_host
+from testinfra_bdd.parsers import parse_table
+from testinfra_bdd.regex_helpers import prepare_pattern
+
+"""ANY_CHARACTER.
+
+A pattern that matches any output at all (including a newline).
+"""
+ANY_CHARACTER = re.compile('.', re.DOTALL)
 
 
 @when(parsers.parse('the TestInfra command is {command}'))
+@for_each_host
 def the_command_is(command: str, testinfra_bdd_host):
     """
     Execute and check the status of a command.
 
+    The result is reused from the command cache if the command matches the
+    TESTINFRA_BDD_CACHED_COMMANDS pattern.
+
     Parameters
     ----------
     command : str
@@ -20,11 +38,12 @@ def the_command_is(command: str, testinfra_bdd_host):
     testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
         The test fixture.
     """
-    testinfra_bdd_host.command = testinfra_bdd_host.host.run(command.strip('"'))
+    testinfra_bdd_host.command = COMMAND_CACHE.run(testinfra_bdd_host.host, command.strip('"'))
 
 
 @then(parsers.parse('the TestInfra command {command} exists in path'))
 @then(parsers.parse('the TestInfra command "{command}" exists in path'))
+@for_each_host
 def check_command_exists_in_path(command, testinfra_bdd_host):
     """
     Assert that a specified command is present on the host path.
@@ -46,6 +65,7 @@ def check_command_exists_in_path(command, testinfra_bdd_host):
 
 
 @then(parsers.parse('the TestInfra command {stream_name} contains "{text}"'))
+@for_each_host
 def check_command_stream_contains(stream_name, text, testinfra_bdd_host):
     """
     Check that the stdout or stderr stream contains a string.
@@ -64,12 +84,13 @@ def check_command_stream_contains(stream_name, text, testinfra_bdd_host):
     AssertError
         When the specified stream does not contain the expected text.
     """
-    stream = testinfra_bdd_host.get_stream_from_command(stream_name)
-    message = f'The string "{text}" was not found in the {stream_name} ("{stream}") of the command.'
-    assert text in stream, message
+    (found, excerpt) = search_command_stream(testinfra_bdd_host, stream_name, text)
+    message = f'The string "{text}" was not found in the {stream_name} ({excerpt}) of the command.'
+    assert found, message
 
 
 @then(parsers.parse('the TestInfra command {stream_name} contains the expected value'))
+@for_each_host
 def the_command_stderr_contains_the_expected_value(stream_name, expected_value, testinfra_bdd_host):
     """
     Check that the stdout or stderr stream contains a pre-defined expected value.
@@ -88,12 +109,13 @@ def the_command_stderr_contains_the_expected_value(stream_name, expected_value,
     AssertError
         When the specified stream does not contain the expected text.
     """
-    stream = testinfra_bdd_host.get_stream_from_command(stream_name)
-    message = f'The string "{expected_value}" was not found in the {stream_name} ("{stream}") of the command.'
-    assert expected_value in stream, message
+    (found, excerpt) = search_command_stream(testinfra_bdd_host, stream_name, expected_value)
+    message = f'The string "{expected_value}" was not found in the {stream_name} ({excerpt}) of the command.'
+    assert found, message
 
 
 @then(parsers.parse('the TestInfra command {stream_name} does not contain "{text}"'))
+@for_each_host
 def the_command_stdout_does_not_contain_foo(stream_name, text, testinfra_bdd_host):
     """
     Check that the stdout or stderr stream does not contain a string.
@@ -112,12 +134,13 @@ def the_command_stdout_does_not_contain_foo(stream_name, text, testinfra_bdd_hos
     AssertError
         When the specified stream does contain the unexpected text.
     """
-    stream = testinfra_bdd_host.get_stream_from_command(stream_name)
-    message = f'The unexpected string "{text}" was found in the {stream_name} ("{stream}") of the command.'
-    assert text not in stream, message
+    (found, excerpt) = search_command_stream(testinfra_bdd_host, stream_name, text)
+    message = f'The unexpected string "{text}" was found in the {stream_name} ({excerpt}) of the command.'
+    assert not found, message
 
 
 @then(parsers.parse('the TestInfra command {stream_name} contains the regex "{pattern}"'))
+@for_each_host
 def check_command_stream_contains_the_regex(stream_name, pattern, testinfra_bdd_host):
     """
     Check that the stdout or stderr stream matches a regular expression pattern.
@@ -138,15 +161,13 @@ def check_command_stream_contains_the_regex(stream_name, pattern, testinfra_bdd_
     ValueError
         When the stream name is not recognized.
     """
-    stream = testinfra_bdd_host.get_stream_from_command(stream_name)
-    message = f'The regex "{pattern}" is not found in the {stream_name} "{stream}".'
-    # The parsers.parse function escapes the parsed string.  We need to clean it up before using it.
-    pattern = pattern.encode('utf-8').decode('unicode_escape')
-    prog = re.compile(pattern)
-    assert prog.search(stream) is not None, message
+    (found, excerpt) = search_command_stream(testinfra_bdd_host, stream_name, prepare_pattern(pattern))
+    message = f'The regex "{pattern}" is not found in the {stream_name} {excerpt}.'
+    assert found, message
 
 
 @then(parsers.parse('the TestInfra command return code is {expected_return_code:d}'))
+@for_each_host
 def check_command_return_code(expected_return_code, testinfra_bdd_host):
     """
     Check that the expected return code from a command matches the actual return code.
@@ -170,6 +191,7 @@ def check_command_return_code(expected_return_code, testinfra_bdd_host):
 
 
 @then(parsers.parse('the TestInfra command {stream_name} is empty'))
+@for_each_host
 def command_stream_is_empty(stream_name, testinfra_bdd_host):
     """
     Check that the specified command stream is empty.
@@ -186,5 +208,31 @@ def command_stream_is_empty(stream_name, testinfra_bdd_host):
     AssertError
         When the specified stream does not match the pattern.
     """
-    stream = testinfra_bdd_host.get_stream_from_command(stream_name)
-    assert not stream, f'Expected {stream_name} to be empty ("{stream}").'
+    (found, excerpt) = search_command_stream(testinfra_bdd_host, stream_name, ANY_CHARACTER)
+    assert not found, f'Expected {stream_name} to be empty ({excerpt}).'
+
+
+@then(parsers.parse('the TestInfra commands are\n{table}'))
+@for_each_host
+def the_commands_are(table, testinfra_bdd_host):
+    """
+    Run many commands with a single remote command and check their results.
+
+    Parameters
+    ----------
+    table : str
+        A data table with a "command" column and a column for each check
+        (rc, stdout contains, stdout does not contain, stdout regex, stderr
+        contains, stderr does not contain or stderr regex).  Empty cells are
+        not checked.
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+
+    Raises
+    ------
+    AssertError
+        If any of the results do not match the expectations.  All of the
+        mismatches are reported together.
+    """
+    mismatches = get_commands_mismatches(testinfra_bdd_host.host, parse_table(table))
+    assert not mismatches, '\n'.join(mismatches)
@@ -0,0 +1,159 @@
+"""
+Run many commands on a host with a single remote command.
+
+The commands are run one after the other by a shell script.  The output of
+each command is framed by a header line containing the return code and the
+number of bytes of stdout and stderr, so that the results can be separated
+again locally without any escaping.  The commands may change the host, so
+the snapshots of the host are cleared before the batch is run.
+"""
+from testinfra.backend.base import CommandResult
+
+from testinfra_bdd.command_checks import (BATCH_ASSERTIONS,
+                                          get_command_mismatches)
+from testinfra_bdd.host_cache import clear_host_caches
+
+"""BATCH_MARKER.
+
+The line written by the batch script once it is ready to run the commands.
+Without it, none of the commands were run (e.g. the host has no mktemp).
+"""
+BATCH_MARKER = b'testinfra-bdd batch\n'
+
+"""BATCH_COMMAND.
+
+The script that runs the commands (each passed as an argument) and frames
+their results.  Each command is run by its own shell, so that a command
+that exits (or has a syntax error) does not stop the rest of the batch.
+"""
+BATCH_COMMAND = (
+    'd=$(mktemp -d) || exit 1; '
+    "trap 'rm -rf \"$d\"' EXIT; "
+    'echo testinfra-bdd batch; '
+    '{commands}'
+)
+
+"""BATCH_STEP.
+
+The part of the batch script that runs a single command and frames its result.
+"""
+BATCH_STEP = (
+    '/bin/sh -c %s </dev/null >"$d/o" 2>"$d/e"; '
+    'printf "%%s %%s %%s\\n" $? $(wc -c <"$d/o") $(wc -c <"$d/e"); '
+    'cat "$d/o" "$d/e"; '
+)
+
+
+def get_commands_mismatches(host, rows):
+    """
+    Run many commands and compare their results against the expectations.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host to run the commands on.
+    rows : list
+        A list of dictionaries.  Each must have a "command" key and any other
+        non-empty values are the expectations (see BATCH_ASSERTIONS).
+
+    Returns
+    -------
+    list
+        A message for each expectation that is not met.
+
+    Raises
+    ------
+    ValueError
+        If the rows contain an unknown column.
+    """
+    unknown_columns = set(rows[0]) - set(BATCH_ASSERTIONS) - {'command'} if rows else set()
+
+    if unknown_columns:
+        raise ValueError(f'Unknown command columns {sorted(unknown_columns)}.')
+
+    commands = [row['command'] for row in rows]
+    mismatches = []
+
+    for (row, cmd) in zip(rows, run_commands(host, commands)):
+        mismatches.extend(get_command_mismatches(row, cmd))
+
+    return mismatches
+
+
+def parse_batch_output(backend, commands, output):
+    """
+    Separate the framed output of the batch script into command results.
+
+    Parameters
+    ----------
+    backend : testinfra.backend.base.BaseBackend
+        The backend the commands were run by.
+    commands : list
+        The commands in the order they were run.
+    output : bytes
+        The stdout of the batch script.
+
+    Returns
+    -------
+    list or None
+        A command result for each command.  None if the output could not be
+        parsed.
+    """
+    results = []
+    offset = 0
+
+    for command in commands:
+        end_of_header = output.find(b'\n', offset)
+
+        try:
+            (rc, stdout_length, stderr_length) = [int(value) for value in output[offset:end_of_header].split()]
+        except ValueError:
+            return None
+
+        offset = end_of_header + 1
+        stdout = output[offset:offset + stdout_length]
+        offset += stdout_length
+        stderr = output[offset:offset + stderr_length]
+        offset += stderr_length
+        results.append(CommandResult(backend, rc, backend.encode(command), stdout, stderr))
+
+    return results if offset == len(output) else None
+
+
+def run_commands(host, commands):
+    """
+    Run many commands, with a single remote command where the host supports it.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host to run the commands on.
+    commands : list
+        The commands to be run.
+
+    Hosts that can't run the batch script run each command separately
+    instead.  Once the batch has started, the commands are not run again.
+
+    Returns
+    -------
+    list
+        A command result for each command.
+
+    Raises
+    ------
+    RuntimeError
+        If the batch started but its output could not be parsed.
+    """
+    clear_host_caches(host, snapshots_only=True)
+    script = BATCH_COMMAND.format(commands=BATCH_STEP * len(commands))
+    cmd = host.run(script, *commands)
+
+    if not cmd.stdout_bytes.startswith(BATCH_MARKER):
+        return [host.run(command) for command in commands]
+
+    results = parse_batch_output(host.backend, commands, cmd.stdout_bytes[len(BATCH_MARKER):])
+
+    if results is None:
+        raise RuntimeError(f'Unable to parse the output of the batch of commands {cmd}')
+
+    return results
@@ -0,0 +1,93 @@
+"""
+Reuse the results of read-only commands across scenarios.
+
+Commands such as "uname -r" tend to be repeated in many scenarios.  Commands
+that are opted in (either with the "cached command" step or by matching the
+TESTINFRA_BDD_CACHED_COMMANDS pattern) are run once per host and the result
+is reused until it expires or the cache is cleared for the host.  Any other
+command run by the command steps may change the host, so it clears every
+snapshot of the host (e.g. its packages, users and services as well as its
+cached commands, see testinfra_bdd.host_cache.clear_host_caches).
+"""
+import os
+import re
+
+from testinfra_bdd.host_cache import HostCache, clear_host_caches
+
+
+class CommandCache(HostCache):
+    """A cache of the results of the read-only commands run on each host."""
+
+    def __init__(self, ttl=float('inf'), pattern=None):
+        """
+        Create a CommandCache object.
+
+        Parameters
+        ----------
+        ttl : float, optional
+            The number of seconds that the result of a command is cached for.
+            Defaults to the whole session.
+        pattern : str, optional
+            A regex pattern of the commands (e.g. "uname -r|sysctl -a") that
+            are always cached.  The whole command must match the pattern.
+        """
+        super().__init__(ttl)
+        self.pattern = re.compile(pattern) if pattern else None
+
+    def is_cacheable(self, command):
+        """
+        Check if a command matches the pattern of commands that are always cached.
+
+        Parameters
+        ----------
+        command : str
+            The command (e.g. "uname -r").
+
+        Returns
+        -------
+        bool
+            True if the command can be cached.
+        """
+        return self.pattern is not None and self.pattern.fullmatch(command) is not None
+
+    def run(self, host, command, cached=False):
+        """
+        Run a command, reusing the cached result of a cacheable command.
+
+        Any other command clears all of the snapshots of the host first
+        (including its cached results), as it may change the host.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host
+            The host to run the command on.
+        command : str
+            The command (e.g. "uname -r").
+        cached : bool, optional
+            Cache the result even if the command does not match the pattern.
+
+        Returns
+        -------
+        testinfra.backend.base.CommandResult
+            The result of the command.
+        """
+        if cached or self.is_cacheable(command):
+            return self.get((host, command), lambda: host.run(command))
+
+        clear_host_caches(host, snapshots_only=True)
+        return host.run(command)
+
+
+"""COMMAND_CACHE.
+
+The process-wide cache of command results.  Can be configured with the
+following environment variables:
+
+- TESTINFRA_BDD_CACHED_COMMANDS: A regex pattern of the commands that are
+  always cached.
+- TESTINFRA_BDD_COMMAND_CACHE_TTL: The number of seconds to cache for.
+"""
+COMMAND_CACHE = CommandCache(
+    ttl=float(os.environ.get('TESTINFRA_BDD_COMMAND_CACHE_TTL', 'inf')),
+    pattern=os.environ.get('TESTINFRA_BDD_CACHED_COMMANDS')
+)
@@ -0,0 +1,105 @@
+"""Compare the results of the commands in a batch against the expectations of their rows."""
+from testinfra_bdd.exception_message import exception_message
+from testinfra_bdd.regex_helpers import prepare_pattern
+from testinfra_bdd.stream_search import search_text
+
+"""BATCH_ASSERTIONS.
+
+The columns of a batch table (other than "command") and a function that
+takes the command result and the expected value of the cell and returns the
+mismatch description (or None if the result is as expected).
+"""
+BATCH_ASSERTIONS = {
+    'rc': lambda cmd, expected: check_return_code(cmd, expected),
+    'stdout contains': lambda cmd, expected: check_stream(cmd, 'stdout', expected, True),
+    'stdout does not contain': lambda cmd, expected: check_stream(cmd, 'stdout', expected, False),
+    'stdout regex': lambda cmd, expected: check_stream(cmd, 'stdout', prepare_pattern(expected), True),
+    'stderr contains': lambda cmd, expected: check_stream(cmd, 'stderr', expected, True),
+    'stderr does not contain': lambda cmd, expected: check_stream(cmd, 'stderr', expected, False),
+    'stderr regex': lambda cmd, expected: check_stream(cmd, 'stderr', prepare_pattern(expected), True)
+}
+
+
+def check_return_code(cmd, expected):
+    """
+    Check the return code of a command result.
+
+    Parameters
+    ----------
+    cmd : testinfra.backend.base.CommandResult
+        The result of the command.
+    expected : str
+        The expected return code (e.g. "0").
+
+    Returns
+    -------
+    tuple or None
+        The name, actual and expected return code if they do not match.
+    """
+    return None if str(cmd.rc) == expected else ('return code', cmd.rc, expected)
+
+
+def check_stream(cmd, stream_name, needle, expected):
+    """
+    Check if a stream of a command result contains a string or pattern.
+
+    Parameters
+    ----------
+    cmd : testinfra.backend.base.CommandResult
+        The result of the command.
+    stream_name : str
+        Either "stdout" or "stderr".
+    needle : str or re.Pattern
+        The text or compiled pattern to search for.
+    expected : bool
+        True if the stream is expected to contain the needle.
+
+    Returns
+    -------
+    tuple or None
+        The name, actual and expected state of the stream if it does not
+        match the expectation.
+    """
+    (found, excerpt) = search_text(getattr(cmd, stream_name), needle)
+
+    if found == expected:
+        return None
+
+    if isinstance(needle, str):
+        expected_state = f'containing "{needle}"' if expected else f'without "{needle}"'
+    else:
+        expected_state = f'matching "{needle.pattern}"'
+
+    return stream_name, excerpt, expected_state
+
+
+def get_command_mismatches(row, cmd):
+    """
+    Compare the result of a command against the expectations of its row.
+
+    Parameters
+    ----------
+    row : dict
+        The command and its expectations (see testinfra_bdd.command_batch.get_commands_mismatches).
+    cmd : testinfra.backend.base.CommandResult
+        The result of the command.
+
+    Returns
+    -------
+    list
+        A message for each expectation that is not met.
+    """
+    mismatches = []
+
+    for (column, expected_value) in row.items():
+        if column == 'command' or not expected_value:
+            continue
+
+        mismatch = BATCH_ASSERTIONS[column](cmd, expected_value)
+
+        if mismatch is not None:
+            (name, actual_state, expected_state) = mismatch
+            resource_name = f'the {name} of the command "{row["command"]}"'
+            mismatches.append(exception_message(resource_name, actual_state, expected_state))
+
+    return mismatches
@@ -0,0 +1,68 @@
+"""
+When steps that run the command with the command cache or as a stream.
+
+Please avoid already-imported warning: PYTEST_DONT_REWRITE.
+"""
+from pytest_bdd import when
+
+from testinfra_bdd import parsers
+from testinfra_bdd.command_cache import COMMAND_CACHE
+from testinfra_bdd.command_stream import StreamedCommand
+from testinfra_bdd.fleet import for_each_host
+from testinfra_bdd.host_cache import clear_host_caches
+
+
+@when(parsers.parse('the TestInfra cached command is {command}'))
+@for_each_host
+def the_cached_command_is(command: str, testinfra_bdd_host):
+    """
+    Execute a read-only command, reusing the result from an earlier scenario.
+
+    Parameters
+    ----------
+    command : str
+        The command (e.g. "uname -r").
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+    """
+    testinfra_bdd_host.command = COMMAND_CACHE.run(testinfra_bdd_host.host, command.strip('"'), cached=True)
+
+
+@when('the TestInfra command cache is cleared')
+@for_each_host
+def the_command_cache_is_cleared(testinfra_bdd_host):
+    """
+    Discard the snapshots of the host (e.g. after a command that changes it).
+
+    This includes its cached command results as well as its packages, users
+    and groups, services and outdated pip packages.
+
+    Parameters
+    ----------
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+    """
+    clear_host_caches(testinfra_bdd_host.host, snapshots_only=True)
+
+
+@when(parsers.parse('the TestInfra streamed command is {command}'))
+@for_each_host
+def the_streamed_command_is(command: str, testinfra_bdd_host):
+    """
+    Execute a command, writing its output to temporary files.
+
+    The output is not held in memory.  Instead, each check reads the output
+    a chunk at a time and stops as soon as the outcome is known, so this is
+    intended for commands with a large output (e.g. "journalctl --no-pager").
+    As the command may change the host, the snapshots of the host (e.g. its
+    cached command results) are cleared.
+
+    Parameters
+    ----------
+    command : str
+        The command (e.g. "find / -name '*.conf'").
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+    """
+    clear_host_caches(testinfra_bdd_host.host, snapshots_only=True)
+    testinfra_bdd_host.command = StreamedCommand(testinfra_bdd_host.host, command.strip('"'))
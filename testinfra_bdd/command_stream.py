@@ -0,0 +1,158 @@
+"""
+Check the output of a command without holding all of it in memory.
+
+The command is run once, by the streamed command step, and its stdout and
+stderr are written to temporary files as they arrive.  Every check (and the
+return code) is then served from that single run, reading the output a
+chunk at a time (see testinfra_bdd.stream_search) and stopping as soon as
+the outcome is known.
+
+Please avoid already-imported warning: PYTEST_DONT_REWRITE.
+"""
+import subprocess  # nosec B404
+import tempfile
+import threading
+import time
+
+from testinfra_bdd.backend_helpers import get_local_command
+from testinfra_bdd.instrumentation import BACKEND_CALLS
+from testinfra_bdd.stream_search import search_stream, search_text
+
+
+class StreamedCommand:
+    """A command whose output is spooled to temporary files rather than held in memory."""
+
+    def __init__(self, host, command):
+        """
+        Create a StreamedCommand object, running the command.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host
+            The host to run the command on.
+        command : str
+            The command (e.g. "journalctl --no-pager").
+        """
+        self.command = command
+        self._host = host
+        self._lock = threading.Lock()
+        self._rc = None
+        self._result = None
+        self._streams = {}
+        local_command = None
+
+        # Commands that are being recorded to a cassette must be run by the host.
+        if getattr(host, 'cassette', None) is None:
+            local_command = get_local_command(host.backend, command)
+
+        if local_command is None:
+            self._result = host.run(command)
+        else:
+            self._run(local_command)
+
+    def __del__(self):
+        """Remove the temporary files of the output."""
+        for stream in self._streams.values():
+            stream.close()
+
+    @property
+    def rc(self):
+        """int: The return code of the command."""
+        return self._rc if self._result is None else self._result.rc
+
+    def search(self, stream_name, needle):
+        """
+        Search a stream of the command.
+
+        Parameters
+        ----------
+        stream_name : str
+            The name of the stream.  Must be "stdout" or "stderr".
+        needle : str or re.Pattern
+            The text or compiled pattern to search for.  The pattern is used
+            as it is, as for a command that is not streamed.
+
+        Returns
+        -------
+        tuple
+            bool
+                True if the stream contains the needle.
+            str
+                The end of the stream (or the start for backends that can't
+                be streamed) for failure messages.
+
+        Raises
+        ------
+        ValueError
+            When the stream name is not recognized.
+        """
+        if stream_name not in ('stdout', 'stderr'):
+            raise ValueError(f'Unknown stream name "{stream_name}".')
+
+        if self._result is not None:
+            return search_text(getattr(self._result, stream_name), needle)
+
+        # Concurrent checks (see testinfra_bdd.async_engine) share the position of the file.
+        with self._lock:
+            stream = self._streams[stream_name]
+            stream.seek(0)
+            return search_stream(stream, self._host.backend.encoding, needle)
+
+    def _run(self, local_command):
+        """
+        Run the command to completion, spooling its output to temporary files.
+
+        The run is recorded in testinfra_bdd.instrumentation.BACKEND_CALLS.
+
+        Parameters
+        ----------
+        local_command : bytes
+            The local command line that the backend would run.
+        """
+        self._streams = {name: tempfile.TemporaryFile() for name in ('stdout', 'stderr')}
+        hostspec = getattr(self._host, 'hostspec', None) or self._host.backend.get_pytest_id()
+        started = time.perf_counter()
+
+        try:
+            # The command line was generated by the Testinfra backend, which quotes the arguments.
+            self._rc = subprocess.run(  # nosec B602
+                local_command, shell=True, stdin=subprocess.DEVNULL, check=False, **self._streams
+            ).returncode
+        finally:
+            BACKEND_CALLS.record(hostspec, time.perf_counter() - started)
+
+
+def search_command_stream(testinfra_bdd_host, stream_name, needle):
+    """
+    Search a stream of the command of the fixture.
+
+    Parameters
+    ----------
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+    stream_name : str
+        The name of the stream.  Must be "stdout" or "stderr".
+    needle : str or re.Pattern
+        The text or compiled pattern to search for.
+
+    Returns
+    -------
+    tuple
+        bool
+            True if the stream contains the needle.
+        str
+            A bounded excerpt of the stream for failure messages.
+
+    Raises
+    ------
+    AssertError
+        If the command attribute is None.
+    ValueError
+        When the stream name is not recognized.
+    """
+    command = testinfra_bdd_host.command
+
+    if isinstance(command, StreamedCommand):
+        return command.search(stream_name, needle)
+
+    return search_text(testinfra_bdd_host.get_stream_from_command(stream_name), needle)
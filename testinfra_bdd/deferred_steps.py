@@ -0,0 +1,120 @@
+"""
+Run the deferred Then steps of a TestinfraBDDAsync fixture and collect their outcomes.
+
+See testinfra_bdd.async_engine.
+"""
+import itertools
+
+import pytest
+
+from testinfra_bdd.instrumentation import BACKEND_CALLS
+
+
+def get_last_deferred_step(steps, step):
+    """
+    Get the last of the consecutive Then steps, which runs all of them.
+
+    Parameters
+    ----------
+    steps : list
+        The steps of the scenario.
+    step : pytest_bdd.parser.Step
+        The step that is about to be run.
+
+    Returns
+    -------
+    pytest_bdd.parser.Step or None
+        The last of the Then steps from the step onwards or None if the step
+        is not a Then step of the scenario.
+    """
+    following = itertools.dropwhile(lambda other: other is not step, steps)
+    deferred_steps = list(itertools.takewhile(lambda other: other.type == 'then', following))
+    return deferred_steps[-1] if deferred_steps else None
+
+
+def get_step_failures(steps, results):
+    """
+    Get the failures of the deferred steps.
+
+    Parameters
+    ----------
+    steps : list
+        The step, step function, arguments and backend call record of each
+        deferred step.
+    results : list
+        The result (or exception) of each step.
+
+    Returns
+    -------
+    list
+        A message (with the type of the exception) for each step that
+        failed.
+    """
+    return [
+        f'{step}: {type(result).__name__}: {result}'
+        for ((step, _, _, _), result) in zip(steps, results) if is_step_failure(result)
+    ]
+
+
+def get_step_skip(results):
+    """
+    Get the first skip of the deferred steps.
+
+    Parameters
+    ----------
+    results : list
+        The result (or exception) of each step.
+
+    Returns
+    -------
+    pytest.skip.Exception or None
+        The skip or None if none of the steps were skipped.
+    """
+    return next((result for result in results if isinstance(result, pytest.skip.Exception)), None)
+
+
+def is_step_failure(result):
+    """
+    Check if the result of a step is a failure.
+
+    Parameters
+    ----------
+    result : object
+        The result (or exception) of the step.
+
+    Returns
+    -------
+    bool
+        True if the step raised an exception (including pytest.fail) other
+        than a skip.
+    """
+    return isinstance(result, BaseException) and not isinstance(result, pytest.skip.Exception)
+
+
+def run_deferred_step(record, step_function, kwargs):
+    """
+    Run a deferred step, attributing its backend calls to the step rather than the current step.
+
+    Parameters
+    ----------
+    record : dict or None
+        The record of the step in testinfra_bdd.instrumentation.BACKEND_CALLS
+        (None if the step was not recorded).
+    step_function : callable
+        The step.
+    kwargs : dict
+        The arguments for the step.
+
+    Returns
+    -------
+    object
+        The result of the step.
+    """
+    with BACKEND_CALLS.attribute_to(record):
+        try:
+            return step_function(**kwargs)
+        except BaseException as exception:
+            if record is not None and is_step_failure(exception):
+                record['failed'] = True
+
+            raise
@@ -1,14 +1,19 @@
 """Then file fixtures for testinfra-bdd."""
-import json
-import re
-
-import jmespath
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
 
+from testinfra_bdd import parsers
 from testinfra_bdd.file_helpers import get_file_actual_state
+from testinfra_bdd.file_inventory import get_files_mismatches
+from testinfra_bdd.fleet import for_each_host
+from testinfra_bdd.json_helpers import (get_jmespath_mismatches,
+                                        get_json_document)
+from testinfra_bdd.parsers import parse_table
+from testinfra_bdd.regex_helpers import prepare_pattern
+from testinfra_bdd.search_helpers import search_file
 
 
 @when(parsers.parse('the TestInfra file is {file_name}'))
+@for_each_host
 def the_file_is(file_name: str, testinfra_bdd_host):
     """
     Check the status of a file.
@@ -21,9 +26,11 @@ def the_file_is(file_name: str, testinfra_bdd_host):
         The test fixture.
     """
     testinfra_bdd_host.file = testinfra_bdd_host.host.file(file_name.strip('"'))
+    testinfra_bdd_host.file_properties = None
 
 
 @then(parsers.parse('the TestInfra file contents contains "{text}"'))
+@for_each_host
 def the_file_contents_contains_text(text, testinfra_bdd_host):
     """
     Check if the file contains a string.
@@ -41,10 +48,12 @@ def the_file_contents_contains_text(text, testinfra_bdd_host):
         When the file does not contain the string.
     """
     file = testinfra_bdd_host.file
-    assert file.contains(text), f'The file {testinfra_bdd_host.hostname}:{file.path} does not contain "{text}".'
+    found, excerpt = search_file(file, 'text', text)
+    assert found, f'The file {testinfra_bdd_host.hostname}:{file.path} does not contain "{text}" ({excerpt}).'
 
 
 @then(parsers.parse('the TestInfra file contents contains the regex "{pattern}"'))
+@for_each_host
 def the_file_contents_matches_the_regex(pattern, testinfra_bdd_host):
     """
     Check if the file contains matches a regex pattern.
@@ -63,13 +72,12 @@ def the_file_contents_matches_the_regex(pattern, testinfra_bdd_host):
     """
     file = testinfra_bdd_host.file
     file_name = f'{testinfra_bdd_host.hostname}:{file.path}'
-    message = f'The regex "{pattern}" does not match the content of {file_name} ("{file.content_string}").'
-    # The parsers.parse function escapes the parsed string.  We need to clean it up before using it.
-    pattern = pattern.encode('utf-8').decode('unicode_escape')
-    assert re.search(pattern, file.content_string) is not None, message
+    found, excerpt = search_file(file, 'regex', prepare_pattern(pattern))
+    assert found, f'The regex "{pattern}" does not match the content of {file_name} ({excerpt}).'
 
 
 @then(parsers.parse('the TestInfra file is {expected_status}'))
+@for_each_host
 def the_file_status(expected_status, testinfra_bdd_host):
     """
     Check if the file is present or absent.
@@ -95,6 +103,7 @@ def the_file_status(expected_status, testinfra_bdd_host):
 
 
 @then(parsers.parse('the TestInfra file {property_name} is {expected_value}'))
+@for_each_host
 def the_file_property_is(property_name, expected_value, testinfra_bdd_host):
     """
     Check the property of a file.
@@ -116,12 +125,39 @@ def the_file_property_is(property_name, expected_value, testinfra_bdd_host):
     (actual_value, exception_message) = get_file_actual_state(
         testinfra_bdd_host.file,
         property_name,
-        expected_value
+        expected_value,
+        testinfra_bdd_host.get_file_properties()
     )
     assert actual_value == expected_value, exception_message
 
 
+@then(parsers.parse('the TestInfra files are\n{table}'))
+@for_each_host
+def the_files_are(table, testinfra_bdd_host):
+    """
+    Check the properties of many files with a single remote command.
+
+    Parameters
+    ----------
+    table : str
+        A data table with a "path" column and a column for each property to
+        be checked (e.g. state, type, mode, owner or group).  Empty cells are
+        not checked.
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+
+    Raises
+    ------
+    AssertError
+        If any of the actual values do not match the expected values.  All
+        of the mismatches are reported together.
+    """
+    mismatches = get_files_mismatches(testinfra_bdd_host.host, parse_table(table))
+    assert not mismatches, '\n'.join(mismatches)
+
+
 @then(parsers.parse('the TestInfra JMESPath expression {expression} returns {expected_value}'))
+@for_each_host
 def the_jmespath_expression_expression_returns_expected_value(expression, expected_value, testinfra_bdd_host):
     """
     Check the contents of a JSON file with JMESPath.
@@ -142,11 +178,58 @@ def the_jmespath_expression_expression_returns_expected_value(expression, expect
         If the file is not valid JSON or if the JMESPath expression returns
         another value other than the expected value.
     """
+    the_jmespath_expressions_return(
+        [{'expression': expression, 'expected_value': expected_value}],
+        testinfra_bdd_host
+    )
+
+
+@then(parsers.parse('the TestInfra JMESPath expressions return\n{table}'))
+@for_each_host
+def the_jmespath_expressions_return_the_expected_values(table, testinfra_bdd_host):
+    """
+    Check the contents of a JSON file with many JMESPath expressions.
+
+    The file is only downloaded and parsed once.
+
+    Parameters
+    ----------
+    table : str
+        A data table with "expression" and "expected_value" columns.
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+
+    Raises
+    ------
+    AssertError
+        If the file is not valid JSON or if any of the JMESPath expressions
+        return a value other than the expected value.  All of the
+        mismatches are reported together.
+    """
+    the_jmespath_expressions_return(parse_table(table), testinfra_bdd_host)
+
+
+def the_jmespath_expressions_return(rows, testinfra_bdd_host):
+    """
+    Check that JMESPath expressions return the expected values from the file.
+
+    Parameters
+    ----------
+    rows : list
+        Dictionaries with an "expression" and an "expected_value".
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+
+    Raises
+    ------
+    AssertError
+        If the file is not valid JSON or if any of the JMESPath expressions
+        return a value other than the expected value.
+    """
     file = testinfra_bdd_host.file
     file_name = f'{testinfra_bdd_host.hostname}:{file.path}'
     the_file_property_is('state', 'present', testinfra_bdd_host)
     the_file_property_is('type', 'file', testinfra_bdd_host)
-    data = json.loads(file.content_string)
-    actual_value = str(jmespath.search(expression, data))
-    message = f'Expected {expression} in {file_name} to be "{expected_value}", but it is "{actual_value}".'
-    assert actual_value == expected_value, message
+    data = get_json_document(testinfra_bdd_host.host, file.path)
+    mismatches = get_jmespath_mismatches(data, file_name, rows)
+    assert not mismatches, '\n'.join(mismatches)
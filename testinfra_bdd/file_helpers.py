@@ -3,8 +3,36 @@
 
 from testinfra_bdd.exception_message import exception_message
 
-
-def get_file_actual_state(file, property_name, expected_state):
+"""SNAPSHOT_COMMAND.
+
+A shell command template that gathers all of the properties of one or more
+files in a single remote execution.  It prints one line per path (in the
+order given), which is "absent" if the file does not exist.  The checks
+mirror the individual ones made by testinfra.File.  Exits with 2 if stat
+fails (e.g. the host does not have GNU stat).
+"""
+SNAPSHOT_COMMAND = (
+    'for p in {paths}; do if test -e "$p"; then '
+    'if test -f "$p"; then t=file; elif test -d "$p"; then t=directory; '
+    'elif test -p "$p"; then t=pipe; elif test -S "$p"; then t=socket; '
+    'elif test -L "$p"; then t=symlink; else t=; fi; '
+    'if test -x "$p"; then x=executable; else x="not executable"; fi; '
+    'printf "%%s|%%s|" "$t" "$x" && stat -Lc "%%a|%%U|%%G" "$p" || exit 2; '
+    'else echo absent; fi; done'
+)
+
+ABSENT_FILE_PROPERTIES = {
+    'executable': None,
+    'group': None,
+    'mode': None,
+    'owner': None,
+    'state': 'absent',
+    'type': None,
+    'user': None
+}
+
+
+def get_file_actual_state(file, property_name, expected_state, properties=None):
     """
     Get the actual state of a file given the package and the expected state.
 
@@ -16,6 +44,9 @@ def get_file_actual_state(file, property_name, expected_state):
         The name of the property to check (e.g. state).
     expected_state : str
         The expected state.
+    properties : dict, optional
+        Previously gathered properties of the file.  If not provided, they
+        are gathered from the host.
 
     Returns
     -------
@@ -25,7 +56,9 @@ def get_file_actual_state(file, property_name, expected_state):
         str
             A suitable message if the actual state doesn't match the actual state.
     """
-    properties = get_file_properties(file)
+    if properties is None:
+        properties = get_file_properties(file)
+
     assert property_name in properties, f'Unknown user property "{property_name}".'
     actual_state = properties[property_name]
     return actual_state, exception_message(f'File {file.path} {property_name}', actual_state, expected_state)
@@ -46,16 +79,12 @@ def get_file_properties(file):
         A dictionary of the properties.
     """
     assert file, 'File not set.  Have you missed a "When file is" step?'
-    properties = {
-        'executable': None,
-        'group': None,
-        'mode': None,
-        'owner': None,
-        'state': 'absent',
-        'type': None,
-        'user': None
-    }
+    properties = get_file_snapshot(file)
 
+    if properties is not None:
+        return properties
+
+    properties = dict(ABSENT_FILE_PROPERTIES)
     executable_states = {
         True: 'executable',
         False: 'not executable'
@@ -75,6 +104,81 @@ def get_file_properties(file):
     return properties
 
 
+def get_file_snapshot(file):
+    """
+    Get the properties of the file with a single remote command.
+
+    Parameters
+    ----------
+    file : testinfra.File
+        The file to be checked.
+
+    Returns
+    -------
+    dict or None
+        A dictionary of the properties or None if the snapshot command could
+        not be run on the host (e.g. the host does not have GNU stat).
+    """
+    snapshot = get_files_snapshot(file, [file.path])
+    return snapshot[file.path] if snapshot else None
+
+
+def get_files_snapshot(host, paths):
+    """
+    Get the properties of many files with a single remote command.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host (or any Testinfra module of the host) to run the command on.
+    paths : list
+        The paths of the files to be checked.
+
+    Returns
+    -------
+    dict or None
+        A dictionary of the properties of each file, keyed by path.  None if
+        the snapshot command could not be run on the host.
+    """
+    command = SNAPSHOT_COMMAND.format(paths=' '.join(['%s'] * len(paths)))
+    cmd = host.run(command, *paths)
+    lines = cmd.stdout.splitlines()
+
+    if cmd.rc != 0 or len(lines) != len(paths):
+        return None
+
+    return dict(zip(paths, [parse_snapshot_line(line) for line in lines]))
+
+
+def parse_snapshot_line(line):
+    """
+    Parse a line of output from the snapshot command.
+
+    Parameters
+    ----------
+    line : str
+        The line of output for a single file.
+
+    Returns
+    -------
+    dict
+        A dictionary of the properties.
+    """
+    if line == 'absent':
+        return dict(ABSENT_FILE_PROPERTIES)
+
+    (file_type, executable, mode, user, group) = line.split('|')
+    return {
+        'executable': executable,
+        'group': group,
+        'mode': '0o%o' % int(mode, 8),
+        'owner': user,
+        'state': 'present',
+        'type': file_type or None,
+        'user': user
+    }
+
+
 def get_file_type(file):
     """
     Get the file type.
@@ -89,19 +193,16 @@ def get_file_type(file):
     str
         The type of file.
     """
-    file_type = None
-
     type_lookup = {
-        'file': file.is_file,
-        'directory': file.is_directory,
-        'pipe': file.is_pipe,
-        'socket': file.is_socket,
-        'symlink': file.is_symlink
+        'file': 'is_file',
+        'directory': 'is_directory',
+        'pipe': 'is_pipe',
+        'socket': 'is_socket',
+        'symlink': 'is_symlink'
     }
 
     for key in type_lookup:
-        if type_lookup[key]:
-            file_type = key
-            break
+        if getattr(file, type_lookup[key]):
+            return key
 
-    return file_type
+    return None
@@ -0,0 +1,99 @@
+"""Helper functions for checking an inventory of many files at once."""
+from testinfra_bdd.exception_message import exception_message
+from testinfra_bdd.file_helpers import (ABSENT_FILE_PROPERTIES,
+                                        get_file_properties,
+                                        get_files_snapshot)
+
+
+def get_file_mismatches(path, properties, row):
+    """
+    Compare the actual properties of a file against the expected properties.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+    properties : dict
+        The actual properties of the file.
+    row : dict
+        The expected properties of the file.  Empty values and the "path"
+        key are ignored.
+
+    Returns
+    -------
+    list
+        A message for each property that does not match the expectation.
+    """
+    mismatches = []
+
+    for property_name, expected_value in row.items():
+        actual_value = properties.get(property_name)
+
+        if property_name != 'path' and expected_value and actual_value != expected_value:
+            mismatches.append(exception_message(f'File {path} {property_name}', actual_value, expected_value))
+
+    return mismatches
+
+
+def get_files_mismatches(host, rows):
+    """
+    Compare the actual properties of many files against their expected properties.
+
+    The properties of all of the files are gathered with a single remote
+    command where the host supports it.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host the files are on.
+    rows : list
+        A list of dictionaries.  Each must have a "path" key and any other
+        non-empty values are the expected file properties (e.g. "mode").
+
+    Returns
+    -------
+    list
+        A message for each property that does not match the expectation.
+
+    Raises
+    ------
+    ValueError
+        If the rows contain an unknown file property.
+    """
+    unknown_properties = set(rows[0]) - set(ABSENT_FILE_PROPERTIES) - {'path'} if rows else set()
+
+    if unknown_properties:
+        raise ValueError(f'Unknown file properties {sorted(unknown_properties)}.')
+
+    paths = [row['path'] for row in rows]
+    properties = get_files_properties(host, paths)
+    mismatches = []
+
+    for row in rows:
+        mismatches += get_file_mismatches(row['path'], properties[row['path']], row)
+
+    return mismatches
+
+
+def get_files_properties(host, paths):
+    """
+    Get the properties of many files.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host the files are on.
+    paths : list
+        The paths of the files.
+
+    Returns
+    -------
+    dict
+        The properties of each file, keyed by path.
+    """
+    properties = get_files_snapshot(host, paths)
+
+    if properties is None:
+        properties = {path: get_file_properties(host.file(path)) for path in paths}
+
+    return properties
@@ -1,23 +1,30 @@
 """The main fixture for the testinfra-bdd tests."""
-import time
-
-import testinfra
+from testinfra_bdd import cassette
+from testinfra_bdd.backoff import wait_until
+from testinfra_bdd.file_helpers import get_file_properties
+from testinfra_bdd.host_facts import HOST_FACT_NAMES, get_host_facts
+from testinfra_bdd.instrumentation import get_instrumented_host
+from testinfra_bdd.process_snapshot import ProcessSnapshot
+from testinfra_bdd.socket_inventory import SocketInventory
 
 
 class TestinfraBDD:
     """A class that is used as the fixture in the given/when/then steps."""
 
-    def __init__(self, url):
+    def __init__(self, url, host=None):
         """
         Create a TestinfraBDD object.
 
-        Initialises the host attribute.
+        Initialises the host attribute, which is instrumented (see testinfra_bdd.instrumentation).
 
         Parameters
         ----------
         url : str
             The URL of the System Under Test (SUT).  Must comply to the Testinfra
             URL patterns.  See https://testinfra.readthedocs.io/en/latest/backends.html
+        host : testinfra.host.Host, optional
+            An existing backend for the URL (e.g. from a pool of ready hosts).
+            If not provided, one is obtained from testinfra.get_host.
         """
         self.address = None
         self.arch = None
@@ -25,18 +32,21 @@ class TestinfraBDD:
         self.command = None
         self.distribution = None
         self.file = None
+        self.file_properties = None
         self.group = None
-        self.host = testinfra.get_host(url)
+        self.host = get_instrumented_host(host if host is not None else cassette.get_host(url), url)
         self.hostname = None
         self.package = None
         self.pip_package = None
         self.port = None
         self.port_number = None
+        self.process_snapshot = None
         self.process_specification = None
         self.processes = None
         self.release = None
         self.service = None
         self.socket = None
+        self.socket_inventory = None
         self.socket_url = None
         self.type = None
         self.url = url
@@ -46,6 +56,9 @@ class TestinfraBDD:
         """
         Get a named host property.
 
+        Each property is only resolved from the host the first time that it
+        is requested for the backend.
+
         Parameters
         ----------
         property_name : str
@@ -61,18 +74,59 @@ class TestinfraBDD:
         str
             The value of the property.
         """
-        properties = {
-            'type': self.host.system_info.type,
-            'distribution': self.host.system_info.distribution,
-            'release': self.host.system_info.release,
-            'codename': self.host.system_info.codename,
-            'arch': self.host.system_info.arch,
-            'hostname': self.host.backend.get_hostname(),
-            'connection_type': self.host.backend.NAME
-        }
+        assert property_name in HOST_FACT_NAMES, f'Invalid host property name "{property_name}".'
+        return getattr(get_host_facts(self.host), property_name)
+
+    def get_file_properties(self):
+        """
+        Get the properties of the file.
+
+        The properties are gathered from the host once and then reused until
+        the next "When file is" step.
+
+        Returns
+        -------
+        dict
+            A dictionary of the properties.
+        """
+        if self.file_properties is None:
+            self.file_properties = get_file_properties(self.file)
+
+        return self.file_properties
+
+    def get_process_snapshot(self):
+        """
+        Get a snapshot of the processes of the host.
+
+        The processes are listed from the host once and then reused for the
+        rest of the scenario.
+
+        Returns
+        -------
+        testinfra_bdd.process_snapshot.ProcessSnapshot
+            The processes of the host.
+        """
+        if self.process_snapshot is None:
+            self.process_snapshot = ProcessSnapshot(self.host)
+
+        return self.process_snapshot
+
+    def get_socket_inventory(self):
+        """
+        Get an inventory of the listening sockets of the host.
+
+        The sockets are listed from the host once and then reused for the
+        rest of the scenario.
+
+        Returns
+        -------
+        testinfra_bdd.socket_inventory.SocketInventory
+            The listening sockets of the host.
+        """
+        if self.socket_inventory is None:
+            self.socket_inventory = SocketInventory(self.host)
 
-        assert property_name in properties, f'Invalid host property name "{property_name}".'
-        return properties[property_name]
+        return self.socket_inventory
 
     def get_stream_from_command(self, stream_name):
         """
@@ -108,9 +162,9 @@ class TestinfraBDD:
         """
         Check if a host is ready within a specified time.
 
-        Will poll the host every second until timeout number of seconds have
-        expired.  If this host has not responded within that time, the host
-        is assumed to not be ready.
+        If a timeout is given, the host is polled until it becomes ready (see
+        wait_until_is_host_ready).  If this host has not responded within
+        that time, the host is assumed to not be ready.
 
         Parameters
         ----------
@@ -125,29 +179,61 @@ class TestinfraBDD:
             False if it doesn't.
         """
         if timeout:
-            self.wait_until_is_host_ready(timeout)
+            return self.wait_until_is_host_ready(timeout)
 
         try:
-            self.host.system_info.type
-            self.arch = self.host.system_info.arch
-            self.codename = self.host.system_info.codename
-            self.distribution = self.host.system_info.distribution
-            self.hostname = self.host.backend.hostname
-            self.release = self.host.system_info.release
-            self.type = self.host.system_info.type
+            self.load_host_facts()
             is_ready = True
         except AssertionError:
             is_ready = False
 
         return is_ready
 
+    def is_host_alive(self):
+        """
+        Check that the host can still run a trivial command.
+
+        This is a cheap liveness probe.  Unlike is_host_ready, it does not
+        rely on any system information that Testinfra may have cached.  The
+        command (echo) is understood by POSIX and Windows shells alike.
+
+        Returns
+        -------
+        bool
+            True if the host ran the command successfully, False otherwise.
+        """
+        try:
+            return 'ok' in self.host.run('echo ok').stdout
+        except Exception:
+            return False
+
+    def load_host_facts(self):
+        """
+        Populate the host facts (e.g. arch and hostname) from the host.
+
+        Raises
+        ------
+        AssertError
+            If the host does not respond.
+        """
+        facts = get_host_facts(self.host)
+        self.type = facts.type
+        self.arch = facts.arch
+        self.codename = facts.codename
+        self.distribution = facts.distribution
+        self.hostname = self.host.backend.hostname
+        self.release = facts.release
+
     def wait_until_is_host_ready(self, timeout=0):
         """
         Check if a host is ready within a specified time.
 
-        Will poll the host every second until timeout number of seconds have
-        expired.  If this host has not responded within that time, the host
-        is assumed to not be ready.
+        Will poll the host with a jittered exponential backoff (starting at
+        a fraction of a second) until timeout number of seconds have
+        expired.  Each poll is a cheap liveness probe, followed by the full
+        system information request once the host is alive.  If this host
+        has not responded within that time, the host is assumed to not be
+        ready.
 
         Parameters
         ----------
@@ -161,16 +247,4 @@ class TestinfraBDD:
             True if the host is responding to the host.system_info.type request.
             False if it doesn't.
         """
-        is_ready = False
-        now = time.time()
-        deadline = now + timeout
-
-        while now <= deadline and not is_ready:
-            is_ready = self.is_host_ready()
-
-            if now < deadline and not is_ready:
-                time.sleep(1)
-
-            now = time.time()
-
-        return is_ready
+        return wait_until(lambda: self.is_host_alive() and self.is_host_ready(), timeout)
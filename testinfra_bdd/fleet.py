@@ -0,0 +1,209 @@
+"""
+Run the testinfra-bdd steps against a fleet of hosts concurrently.
+
+Please avoid already-imported warning: PYTEST_DONT_REWRITE.
+"""
+import concurrent.futures
+import functools
+import inspect
+import os
+
+import pytest
+
+from testinfra_bdd.async_engine import TestinfraBDDAsync
+from testinfra_bdd.host_pool import HOST_POOL
+
+"""MAX_WORKERS.
+
+The maximum number of hosts that a step is run against concurrently.  Can be
+configured with the TESTINFRA_BDD_MAX_WORKERS environment variable.
+"""
+MAX_WORKERS = int(os.environ.get('TESTINFRA_BDD_MAX_WORKERS', '16'))
+
+
+class TestinfraBDDFleet:
+    """A fixture that runs each step against many hosts."""
+
+    def __init__(self, hosts, max_workers=MAX_WORKERS):
+        """
+        Create a TestinfraBDDFleet object.
+
+        Parameters
+        ----------
+        hosts : list
+            The testinfra_bdd.fixture.TestinfraBDD objects of the hosts.
+        max_workers : int, optional
+            The maximum number of hosts that a step is run against
+            concurrently.
+        """
+        self.hosts = hosts
+        self.max_workers = max_workers
+
+    def map(self, function, items):
+        """
+        Call a function for each item concurrently with a bounded thread pool.
+
+        Parameters
+        ----------
+        function : callable
+            The function to call with each item.
+        items : list
+            The items.
+
+        Returns
+        -------
+        list
+            A concurrent.futures.Future for each item (in the same order).
+        """
+        workers = max(1, min(self.max_workers, len(items)))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            return [executor.submit(function, item) for item in items]
+
+    def run_step(self, step_function, kwargs):
+        """
+        Run a step against each host in the fleet.
+
+        Hosts that skip the step are removed from the fleet.  Assertion
+        failures are collected from every host and reported together.
+
+        Parameters
+        ----------
+        step_function : callable
+            The step to run.
+        kwargs : dict
+            The arguments for the step.  The testinfra_bdd_host argument is
+            replaced with each host in turn.
+
+        Raises
+        ------
+        AssertError
+            If the step fails for any of the hosts.
+        """
+        futures = self.map(lambda host: step_function(**dict(kwargs, testinfra_bdd_host=host)), self.hosts)
+        failures = self._collect_failures(futures)
+
+        if not self.hosts:
+            pytest.skip('The step was skipped for every host.')
+
+        assert not failures, 'The step failed on {} host(s):\n{}'.format(len(failures), '\n'.join(failures))
+
+    def _collect_failures(self, futures):
+        """
+        Collect the failures of a step from each host.
+
+        Hosts that skipped the step are removed from the fleet.
+
+        Parameters
+        ----------
+        futures : list
+            The concurrent.futures.Future of the step for each host.
+
+        Returns
+        -------
+        list
+            A message for each host that the step failed on.
+        """
+        failures = []
+
+        for host, future in zip(list(self.hosts), futures):
+            exception = future.exception()
+
+            if isinstance(exception, pytest.skip.Exception):
+                self.hosts.remove(host)
+            elif exception is not None:
+                failures.append(f'{host.url}: {type(exception).__name__}: {exception}')
+
+        return failures
+
+
+def for_each_host(step_function):
+    """
+    Decorate a step so that it is run against every host of a fleet.
+
+    If the testinfra_bdd_host argument is a TestinfraBDDAsync, the step is
+    run (or deferred) by the fixture.  Otherwise, if it is not a
+    TestinfraBDDFleet, the step is called as normal.
+
+    Parameters
+    ----------
+    step_function : callable
+        The step function to be decorated.
+
+    Returns
+    -------
+    callable
+        The decorated step function.
+    """
+    signature = inspect.signature(step_function)
+
+    @functools.wraps(step_function)
+    def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs).arguments
+
+        if isinstance(arguments.get('testinfra_bdd_host'), (TestinfraBDDAsync, TestinfraBDDFleet)):
+            return arguments['testinfra_bdd_host'].run_step(step_function, arguments)
+
+        return step_function(*args, **kwargs)
+
+    return wrapper
+
+
+def get_fleet_fixture(hostspecs, timeout=0):
+    """
+    Return a fleet of hosts that are all confirmed as ready.
+
+    The readiness of each host is checked concurrently (see
+    iter_ready_hosts).
+
+    Parameters
+    ----------
+    hostspecs : list
+        The URLs of the Systems Under Test (SUT).
+    timeout : int, optional
+        The number of seconds that the hosts are expected to become ready in.
+
+    Returns
+    -------
+    TestinfraBDDFleet
+        The object to return as a fixture.
+
+    Raises
+    ------
+    AssertError
+        When any of the hosts are not ready.
+    """
+    hosts = dict(iter_ready_hosts(hostspecs, timeout))
+    not_ready = [hostspec for hostspec in hostspecs if hosts[hostspec] is None]
+    assert not not_ready, f'The hosts {", ".join(not_ready)} are not ready.'
+    return TestinfraBDDFleet([hosts[hostspec] for hostspec in hostspecs])
+
+
+def iter_ready_hosts(hostspecs, timeout=0, max_workers=MAX_WORKERS):
+    """
+    Wait for many hosts concurrently, yielding each one as soon as it is ready.
+
+    Parameters
+    ----------
+    hostspecs : list
+        The URLs of the Systems Under Test (SUT).
+    timeout : int, optional
+        The number of seconds that the hosts are expected to become ready in.
+    max_workers : int, optional
+        The maximum number of hosts to wait for concurrently.
+
+    Yields
+    ------
+    tuple
+        str
+            The hostspec.
+        testinfra_bdd.fixture.TestinfraBDD or None
+            The ready host, or None if it did not become ready in time.
+    """
+    workers = max(1, min(max_workers, len(hostspecs)))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(HOST_POOL.get_host, hostspec, timeout): hostspec for hostspec in hostspecs}
+
+        for future in concurrent.futures.as_completed(futures):
+            yield futures[future], future.result()
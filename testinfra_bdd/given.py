@@ -1,7 +1,10 @@
 """The given steps of testinfra-bdd."""
-from pytest_bdd import given, parsers
+from pytest_bdd import given
 
 import testinfra_bdd.fixture
+from testinfra_bdd import parsers
+from testinfra_bdd.fleet import get_fleet_fixture
+from testinfra_bdd.parsers import parse_hostspec_pattern
 
 
 @given(parsers.parse('the TestInfra host with URL "{hostspec}" is ready'), target_fixture='testinfra_bdd_host')
@@ -51,3 +54,52 @@ def the_host_is_ready_with_a_number_of_seconds(hostspec, seconds):
         The object to return as a fixture.
     """
     return testinfra_bdd.get_host_fixture(hostspec, seconds)
+
+
+@given(parsers.parse('the TestInfra hosts matching "{pattern}" are ready'), target_fixture='testinfra_bdd_host')
+def the_hosts_are_ready(pattern):
+    """
+    Ensure that all of the hosts matching a pattern are ready.
+
+    The following When and Then steps are run against all of the hosts
+    concurrently and any failures are reported for each host.
+
+    Parameters
+    ----------
+    pattern : str
+        A Testinfra URL that may contain ranges in square brackets (e.g.
+        "ssh://web-[01-40]").  See
+        testinfra_bdd.parsers.parse_hostspec_pattern.
+
+    Returns
+    -------
+    testinfra_bdd.fleet.TestinfraBDDFleet
+        The object to return as a fixture.
+    """
+    return get_fleet_fixture(parse_hostspec_pattern(pattern))
+
+
+@given(parsers.parse('the TestInfra hosts matching "{pattern}" are ready within {seconds:d} seconds'),
+       target_fixture='testinfra_bdd_host')
+def the_hosts_are_ready_with_a_number_of_seconds(pattern, seconds):
+    """
+    Ensure that all of the hosts matching a pattern are ready within the specified number of seconds.
+
+    The following When and Then steps are run against all of the hosts
+    concurrently and any failures are reported for each host.
+
+    Parameters
+    ----------
+    pattern : str
+        A Testinfra URL that may contain ranges in square brackets (e.g.
+        "ssh://web-[01-40]").  See
+        testinfra_bdd.parsers.parse_hostspec_pattern.
+    seconds : int
+        The number of seconds that the hosts are expected to become ready in.
+
+    Returns
+    -------
+    testinfra_bdd.fleet.TestinfraBDDFleet
+        The object to return as a fixture.
+    """
+    return get_fleet_fixture(parse_hostspec_pattern(pattern), seconds)
@@ -1,8 +1,13 @@
 """Then file fixtures for testinfra-bdd."""
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
+
+from testinfra_bdd import parsers
+from testinfra_bdd.account_database import get_group, get_group_membership
+from testinfra_bdd.fleet import for_each_host
 
 
 @when(parsers.parse('the TestInfra group is {groupname}'))
+@for_each_host
 def the_group_is(groupname: str, testinfra_bdd_host):
     """
     Check the status of a group.
@@ -18,6 +23,7 @@ def the_group_is(groupname: str, testinfra_bdd_host):
 
 
 @then(parsers.parse('the TestInfra group contains the user "{expected_user}"'))
+@for_each_host
 def _(expected_user: str, testinfra_bdd_host):
     """
     Check that the expected user is contained within a group.
@@ -36,17 +42,22 @@ def _(expected_user: str, testinfra_bdd_host):
     """
     group = testinfra_bdd_host.group
     assert group, 'Group not set.  Have you missed a "When group is" step?'
-    message = 'Expected group "{group.name}" to exist.'
-    assert group.exists, message
+    (state, is_member) = get_group_membership(testinfra_bdd_host.host, group.name, expected_user)
+    message = f'Expected group "{group.name}" to exist.'
+    assert state == 'present', message
     message = f'Expected the group "{group.name}" to contain the user "{expected_user}".'
-    assert expected_user in group.members, message
+    assert is_member, message
 
 
 @then(parsers.parse('the TestInfra group {property_name} is {expected_value}'))
+@for_each_host
 def the_group_property_is(property_name, expected_value, testinfra_bdd_host):
     """
     Check the property of a group.
 
+    The properties are looked up in a snapshot of the user and group
+    databases of the host.
+
     Parameters
     ----------
     property_name : str
@@ -63,25 +74,14 @@ def the_group_property_is(property_name, expected_value, testinfra_bdd_host):
     """
     group = testinfra_bdd_host.group
     assert group, 'Group not set.  Have you missed a "When group is" step?'
-
-    properties = {
-        'gid': None,
-        'state': 'absent'
-    }
-
-    if group.exists:
-        properties = {
-            'gid': str(group.gid),
-            'state': 'present'
-        }
-
-    assert property_name in properties, f'Unknown group property ({property_name}).'
-    actual_value = properties[property_name]
+    assert property_name in ('gid', 'state'), f'Unknown group property ({property_name}).'
+    actual_value = get_group(testinfra_bdd_host.host, group.name)[property_name]
     message = f'Expected group property to be {expected_value} but it was {actual_value}.'
     assert actual_value == expected_value, message
 
 
 @then(parsers.parse('the TestInfra group is {expected_state}'))
+@for_each_host
 def check_the_group_state(expected_state, testinfra_bdd_host):
     """
     Check that the actual state of a group matches the expected state.
@@ -0,0 +1,128 @@
+"""A thread safe cache of values fetched from hosts that expire after a TTL."""
+import threading
+import time
+import weakref
+
+"""HOST_CACHES.
+
+Every HostCache that exists, so that all of the values of a host can be
+removed at once (see clear_host_caches).
+"""
+HOST_CACHES = weakref.WeakSet()
+
+
+class HostCache:
+    """A cache of values fetched from hosts (e.g. a list of installed packages)."""
+
+    def __init__(self, ttl, snapshot=True):
+        """
+        Create a HostCache object.
+
+        Parameters
+        ----------
+        ttl : float
+            The number of seconds that a value is cached for.
+        snapshot : bool, optional
+            True if the values are snapshots of the state of the host (e.g.
+            its installed packages), which a command may change.  False if
+            they are derived from the host object itself (e.g. an
+            instrumented host).
+        """
+        self.snapshot = snapshot
+        self.ttl = ttl
+        self._entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        HOST_CACHES.add(self)
+
+    def clear(self, host=None):
+        """
+        Remove the cached values.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host, optional
+            Only remove the values of this host (the first item of their
+            keys).  Defaults to removing all of the values.
+
+        Returns
+        -------
+        list
+            The values that were removed.
+        """
+        with self._lock:
+            # The key locks are dropped too, as they would keep the host alive.
+            for key in get_host_keys(self._key_locks, host):
+                del self._key_locks[key]
+
+            return [self._entries.pop(key)[1] for key in get_host_keys(self._entries, host)]
+
+    def get(self, key, fetch, version=None):
+        """
+        Get a cached value, fetching it if it is not cached, has expired or is out of date.
+
+        Only one thread at a time fetches the value for a key, but values for
+        different keys can be fetched concurrently.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the value.  The first item should be the host.
+        fetch : callable
+            A function that takes no arguments and returns the value.
+        version : object, optional
+            The current version of the value (e.g. the modification time of
+            a file).  A value cached for another version is fetched again.
+
+        Returns
+        -------
+        object
+            The cached value.
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            entry = self._entries.get(key)
+
+            if entry is None or time.monotonic() - entry[0] > self.ttl or entry[2] != version:
+                entry = self._entries[key] = (time.monotonic(), fetch(), version)
+
+        return entry[1]
+
+
+def clear_host_caches(host, snapshots_only=False):
+    """
+    Remove the values of a host from every HostCache.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+    snapshots_only : bool, optional
+        Only remove the snapshots of the state of the host (e.g. after a
+        command that may have changed it), keeping the hosts derived from
+        it.
+    """
+    for cache in list(HOST_CACHES):
+        if cache.snapshot or not snapshots_only:
+            cache.clear(host)
+
+
+def get_host_keys(mapping, host=None):
+    """
+    Get the keys of the values of a host.
+
+    Parameters
+    ----------
+    mapping : dict
+        The values, keyed by tuples whose first item is the host.
+    host : testinfra.host.Host, optional
+        The host.  Defaults to all hosts.
+
+    Returns
+    -------
+    list
+        The keys.
+    """
+    return [key for key in mapping if host is None or key[0] is host]
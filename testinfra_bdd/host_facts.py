@@ -0,0 +1,101 @@
+"""Lazily resolved facts about a host that are cached for the life of the backend."""
+import functools
+import weakref
+
+"""HOST_FACT_NAMES.
+
+The names of the facts that can be requested for a host.
+"""
+HOST_FACT_NAMES = (
+    'arch',
+    'codename',
+    'connection_type',
+    'distribution',
+    'hostname',
+    'release',
+    'type'
+)
+
+_host_facts = weakref.WeakKeyDictionary()
+
+
+class HostFacts:
+    """Facts about a host, each of which is resolved on first access."""
+
+    def __init__(self, host):
+        """
+        Create a HostFacts object.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host
+            The host the facts are to be resolved from.  Only a weak
+            reference is held, as the host is the key of the facts in
+            _host_facts.
+        """
+        self._host_reference = weakref.ref(host)
+
+    @property
+    def _host(self):
+        """testinfra.host.Host: The host the facts are resolved from."""
+        return self._host_reference()
+
+    @functools.cached_property
+    def arch(self):
+        """The host architecture (e.g. x86_64)."""
+        return self._host.system_info.arch
+
+    @functools.cached_property
+    def codename(self):
+        """The OS codename if relevant (e.g. bullseye)."""
+        return self._host.system_info.codename
+
+    @functools.cached_property
+    def connection_type(self):
+        """The type of connection to the host (e.g. docker or ssh)."""
+        return self._host.backend.NAME
+
+    @functools.cached_property
+    def distribution(self):
+        """The distribution name (e.g. debian)."""
+        return self._host.system_info.distribution
+
+    @functools.cached_property
+    def hostname(self):
+        """The hostname (e.g. sut)."""
+        return self._host.backend.get_hostname()
+
+    @functools.cached_property
+    def release(self):
+        """The OS release (e.g. 11)."""
+        return self._host.system_info.release
+
+    @functools.cached_property
+    def type(self):
+        """The OS type (e.g. linux)."""
+        return self._host.system_info.type
+
+
+def get_host_facts(host):
+    """
+    Get the facts for a host, creating them on the first request.
+
+    The facts are held for as long as the host (and therefore the backend
+    connection) exists.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host to get the facts for.
+
+    Returns
+    -------
+    HostFacts
+        The facts for the host.
+    """
+    facts = _host_facts.get(host)
+
+    if facts is None:
+        facts = _host_facts[host] = HostFacts(host)
+
+    return facts
@@ -0,0 +1,249 @@
+"""
+A process-wide pool of hosts that have been confirmed as ready.
+
+Please avoid already-imported warning: PYTEST_DONT_REWRITE.
+"""
+import os
+import threading
+import time
+
+import testinfra.backend
+import testinfra.host
+
+from testinfra_bdd import cassette
+from testinfra_bdd.async_backend import ASYNC_HOSTS
+from testinfra_bdd.fixture import TestinfraBDD
+from testinfra_bdd.host_cache import clear_host_caches
+
+
+def connect(hostspec):
+    """
+    Get a new host, with its own backend connection, for a hostspec.
+
+    Unlike testinfra.get_host, the host is not cached by Testinfra, so a
+    host that has been evicted from the pool is never handed out again.
+
+    Parameters
+    ----------
+    hostspec : str
+        The URL of the host.
+
+    Returns
+    -------
+    testinfra.host.Host
+        The host (or the replayed host if a cassette is being replayed).
+    """
+    if cassette.CASSETTE is not None and not cassette.CASSETTE.is_recording:
+        return cassette.get_host(hostspec)
+
+    backend = testinfra.backend.get_backend(hostspec)
+    host = testinfra.host.Host(backend)
+    backend.set_host(host)
+    return host
+
+
+class PooledHost:
+    """A backend that has been confirmed as ready and the time it was last checked and used."""
+
+    def __init__(self, host, connection, now):
+        """
+        Create a PooledHost object.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host
+            The (instrumented) backend that has been confirmed as ready.
+        connection : testinfra.host.Host
+            The Testinfra host that the backend was instrumented from.
+        now : float
+            The monotonic time that the host was confirmed as ready.
+        """
+        self.connection = connection
+        self.host = host
+        self.last_checked = now
+        self.last_used = now
+
+
+class HostPool:
+    """A pool of ready hosts, keyed by hostspec."""
+
+    def __init__(self, ttl=60.0, idle_timeout=300.0):
+        """
+        Create a HostPool object.
+
+        Parameters
+        ----------
+        ttl : float, optional
+            The number of seconds after which a pooled host will have its
+            health re-checked before it is used again.
+        idle_timeout : float, optional
+            The number of seconds a pooled host can be unused before it is
+            evicted from the pool.
+        """
+        self.ttl = ttl
+        self.idle_timeout = idle_timeout
+        self._host_locks = {}
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """
+        Get the number of hosts in the pool.
+
+        Returns
+        -------
+        int
+            The number of pooled hosts.
+        """
+        return len(self._hosts)
+
+    def clear(self):
+        """Evict all hosts from the pool."""
+        with self._lock:
+            for hostspec in list(self._hosts):
+                self._evict(hostspec)
+
+    def evict_idle_hosts(self, now=None):
+        """
+        Evict any hosts that have not been used within the idle timeout.
+
+        Parameters
+        ----------
+        now : float, optional
+            The current monotonic time.  Defaults to time.monotonic().
+        """
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            for hostspec, pooled_host in list(self._hosts.items()):
+                if now - pooled_host.last_used > self.idle_timeout:
+                    self._evict(hostspec)
+
+    def get_host(self, hostspec, timeout=0):
+        """
+        Get a fresh TestinfraBDD object bound to a ready backend.
+
+        Parameters
+        ----------
+        hostspec : str
+            The URL of the System Under Test (SUT).
+        timeout : int, optional
+            The number of seconds that the host is expected to become ready in.
+
+        Returns
+        -------
+        testinfra_bdd.fixture.TestinfraBDD or None
+            A new fixture bound to the pooled backend or None if the host is
+            not ready.
+        """
+        self.evict_idle_hosts()
+
+        # Only one thread at a time checks the readiness of a hostspec, but
+        # different hostspecs can be checked concurrently.
+        with self._lock:
+            host_lock = self._host_locks.setdefault(hostspec, threading.Lock())
+
+        with host_lock:
+            pooled_host = self._get_ready_host(hostspec, timeout)
+
+        if pooled_host is None:
+            return None
+
+        host = TestinfraBDD(hostspec, pooled_host.host)
+        host.load_host_facts()
+        return host
+
+    def _evict(self, hostspec):
+        """
+        Remove a host from the pool and its values from every host cache.
+
+        The values of the hosts derived from it (the instrumented and
+        asyncio hosts) are removed too, so nothing keeps the backend
+        connection alive.  A new one is made (see connect) the next time the
+        host is requested.
+
+        Parameters
+        ----------
+        hostspec : str
+            The URL of the host to be evicted.
+        """
+        pooled_host = self._hosts.pop(hostspec, None)
+
+        if pooled_host is None:
+            return
+
+        for host in (pooled_host.connection, pooled_host.host, *ASYNC_HOSTS.clear(pooled_host.host)):
+            clear_host_caches(host)
+
+    def _recheck_host(self, hostspec, now):
+        """
+        Get a pooled host, re-checking its health if the TTL has expired.
+
+        Parameters
+        ----------
+        hostspec : str
+            The URL of the System Under Test (SUT).
+        now : float
+            The current monotonic time.
+
+        Returns
+        -------
+        PooledHost or None
+            The pooled host or None if it is not pooled or is no longer alive.
+        """
+        pooled_host = self._hosts.get(hostspec)
+
+        if pooled_host is None or now - pooled_host.last_checked <= self.ttl:
+            return pooled_host
+
+        if TestinfraBDD(hostspec, pooled_host.host).is_host_alive():
+            pooled_host.last_checked = now
+            return pooled_host
+
+        self._evict(hostspec)
+        return None
+
+    def _get_ready_host(self, hostspec, timeout):
+        """
+        Get a pooled host, adding or health checking it as required.
+
+        Parameters
+        ----------
+        hostspec : str
+            The URL of the System Under Test (SUT).
+        timeout : int
+            The number of seconds that the host is expected to become ready in.
+
+        Returns
+        -------
+        PooledHost or None
+            The pooled host or None if the host is not ready.
+        """
+        now = time.monotonic()
+        pooled_host = self._recheck_host(hostspec, now)
+
+        if pooled_host is None:
+            connection = connect(hostspec)
+            host = TestinfraBDD(hostspec, connection)
+
+            if not host.is_host_ready(timeout):
+                clear_host_caches(connection)
+                return None
+
+            pooled_host = self._hosts[hostspec] = PooledHost(host.host, connection, time.monotonic())
+
+        pooled_host.last_used = now
+        return pooled_host
+
+
+"""HOST_POOL.
+
+The process-wide pool used by testinfra_bdd.get_host_fixture.  The health
+re-check interval and idle timeout (both in seconds) can be configured with
+the TESTINFRA_BDD_POOL_TTL and TESTINFRA_BDD_POOL_IDLE_TIMEOUT environment
+variables.
+"""
+HOST_POOL = HostPool(
+    ttl=float(os.environ.get('TESTINFRA_BDD_POOL_TTL', '60')),
+    idle_timeout=float(os.environ.get('TESTINFRA_BDD_POOL_IDLE_TIMEOUT', '300'))
+)
@@ -0,0 +1,163 @@
+"""
+Count and time the commands that each step runs on the hosts.
+
+Every command that is run on a host by a TestinfraBDD object (including
+the commands run by the Testinfra modules of the host) is timed and
+attributed to the Gherkin step and scenario that is running.  At the end of
+the session, the slowest steps, the calls per step and the total backend
+time per host are shown in the terminal summary and can be written to a
+JSON report.
+
+Please avoid already-imported warning: PYTEST_DONT_REWRITE.
+"""
+import json
+import math
+import os
+import time
+
+import testinfra.host
+
+from testinfra_bdd.call_recorder import (TIMING_TOP, BackendCallRecorder,
+                                         get_summary_lines)
+from testinfra_bdd.cassette import CASSETTE
+from testinfra_bdd.host_cache import HostCache
+
+"""TIMING_REPORT.
+
+The path of the JSON report that is written at the end of the session.  Can
+be configured with the TESTINFRA_BDD_TIMING_REPORT environment variable.  No
+report is written if it is empty (the default).
+"""
+TIMING_REPORT = os.environ.get('TESTINFRA_BDD_TIMING_REPORT', '')
+
+
+class InstrumentedHost(testinfra.host.Host):
+    """A host, sharing the backend of a Testinfra host, that records each command that it runs."""
+
+    def __init__(self, host, recorder, hostspec=None, cassette=None):
+        """
+        Create an InstrumentedHost object.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host
+            The Testinfra host.
+        recorder : BackendCallRecorder
+            Where the calls are recorded.
+        hostspec : str, optional
+            The URL of the host.  Defaults to the pytest ID of the backend.
+        cassette : testinfra_bdd.cassette.Cassette, optional
+            Where the commands and their results are recorded, if anywhere.
+        """
+        super().__init__(host.backend)
+        self.cassette = cassette
+        self.hostspec = hostspec if hostspec is not None else host.backend.get_pytest_id()
+        self.recorder = recorder
+
+    def run(self, command, *args, **kwargs):
+        """
+        Run a command on the host, recording the time it took (and the result in the cassette).
+
+        The Testinfra modules, run_expect, run_test and check_output of the
+        host all run commands with this method.
+
+        Parameters
+        ----------
+        command : str
+            The command.
+        *args : tuple
+            Arguments that are quoted into the command.
+        **kwargs : dict
+            Any other keyword arguments for the backend.
+
+        Returns
+        -------
+        testinfra.backend.base.CommandResult
+            The result of the command.
+        """
+        started = time.perf_counter()
+
+        try:
+            result = super().run(command, *args, **kwargs)
+        finally:
+            self.recorder.record(self.hostspec, time.perf_counter() - started)
+
+        if self.cassette is not None:
+            self.cassette.record(self.hostspec, self.backend.quote(command, *args), result)
+
+        return result
+
+
+"""BACKEND_CALLS.
+
+The process-wide record of the backend calls of each step and host.
+"""
+BACKEND_CALLS = BackendCallRecorder()
+
+"""INSTRUMENTED_HOSTS.
+
+The instrumented host of each Testinfra host.  Hosts are only instrumented
+once so that they can still be used as the keys of the other host caches.
+"""
+INSTRUMENTED_HOSTS = HostCache(ttl=math.inf, snapshot=False)
+
+
+def get_instrumented_host(host, hostspec=None):
+    """
+    Get a host that records its backend calls in BACKEND_CALLS.
+
+    If a cassette is being recorded (see testinfra_bdd.cassette), the
+    commands of the host and their results are also recorded in it.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The Testinfra host.
+    hostspec : str, optional
+        The URL of the host.  Defaults to the pytest ID of the backend.
+
+    Returns
+    -------
+    InstrumentedHost
+        The instrumented host.  The same object is returned each time for
+        the same host.
+    """
+    if isinstance(host, InstrumentedHost):
+        return host
+
+    cassette = CASSETTE if CASSETTE is not None and CASSETTE.is_recording else None
+    return INSTRUMENTED_HOSTS.get(
+        (host, 'instrumented'),
+        lambda: InstrumentedHost(host, BACKEND_CALLS, hostspec, cassette)
+    )
+
+
+def pytest_bdd_before_step(request, feature, scenario, step, step_func):
+    """Start attributing the backend calls to the step."""
+    BACKEND_CALLS.start_step(feature.name, scenario.name, f'{step.keyword} {step.name}')
+
+
+def pytest_bdd_after_step(request, feature, scenario, step, step_func, step_func_args):
+    """Finish the step."""
+    BACKEND_CALLS.finish_step()
+
+
+def pytest_bdd_step_error(request, feature, scenario, step, step_func, step_func_args, exception):
+    """Finish the failed step."""
+    BACKEND_CALLS.finish_step(failed=True)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write the JSON report of the backend calls."""
+    if TIMING_REPORT:
+        with open(TIMING_REPORT, 'w') as stream:
+            json.dump(BACKEND_CALLS.get_report(), stream, indent=2)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Show the slowest steps and the backend time per host."""
+    if TIMING_TOP and BACKEND_CALLS.steps:
+        terminalreporter.write_sep('=', 'testinfra-bdd backend calls')
+
+        for line in get_summary_lines(BACKEND_CALLS.get_report()):
+            terminalreporter.write_line(line)
@@ -0,0 +1,144 @@
+"""Helper functions for checking the contents of JSON files with JMESPath."""
+import functools
+import json
+import math
+
+import jmespath
+
+from testinfra_bdd.host_cache import HostCache
+
+"""JMESPATH_CACHE_SIZE.
+
+The maximum number of compiled JMESPath expressions to keep.
+"""
+JMESPATH_CACHE_SIZE = 1024
+
+"""JSON_DOCUMENTS.
+
+The parsed JSON document of each host and path, with the version of the
+file that it was parsed from (see get_file_version).
+"""
+JSON_DOCUMENTS = HostCache(ttl=math.inf)
+
+
+@functools.lru_cache(maxsize=JMESPATH_CACHE_SIZE)
+def compile_jmespath(expression):
+    """
+    Compile a JMESPath expression, reusing previously compiled expressions.
+
+    Parameters
+    ----------
+    expression : str
+        The JMESPath expression (e.g. "address.state").
+
+    Returns
+    -------
+    jmespath.parser.ParsedResult
+        The compiled expression.
+    """
+    return jmespath.compile(expression)
+
+
+def get_file_version(host, path):
+    """
+    Get a string that changes whenever the content of a file changes.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host that the file is on.
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    str or None
+        The modification time (to the nanosecond) and size of the file.  None
+        if they can't be found (e.g. the host does not have GNU stat).
+    """
+    cmd = host.run('stat -Lc %%y:%%s %s', path)
+    return cmd.stdout.strip() if cmd.rc == 0 else None
+
+
+def get_jmespath_mismatches(data, file_name, rows):
+    """
+    Evaluate many JMESPath expressions against a JSON document.
+
+    Parameters
+    ----------
+    data : object
+        The parsed JSON document.
+    file_name : str
+        The name of the file for the messages (e.g. "sut:/tmp/john-smith.json").
+    rows : list
+        Dictionaries with an "expression" and an "expected_value".  All
+        values returned by JMESPath are converted to a string before
+        comparison.
+
+    Returns
+    -------
+    list
+        A message for each expression that does not return the expected value.
+    """
+    mismatches = []
+
+    for row in rows:
+        (expression, expected_value) = (row['expression'], row['expected_value'])
+        actual_value = str(compile_jmespath(expression).search(data))
+
+        if actual_value != expected_value:
+            mismatches.append(
+                f'Expected {expression} in {file_name} to be "{expected_value}", but it is "{actual_value}".'
+            )
+
+    return mismatches
+
+
+def get_json_document(host, path):
+    """
+    Get the parsed content of a JSON file.
+
+    The parsed document is reused for as long as the file is unchanged.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host that the file is on.
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    object
+        The parsed JSON document.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the file is not valid JSON.
+    """
+    version = get_file_version(host, path)
+
+    if version is None:
+        return load_json_document(host, path)
+
+    return JSON_DOCUMENTS.get((host, path), lambda: load_json_document(host, path), version)
+
+
+def load_json_document(host, path):
+    """
+    Download and parse a JSON file.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host that the file is on.
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    object
+        The parsed JSON document.
+    """
+    return json.loads(host.file(path).content_string)
@@ -1,14 +1,20 @@
 """Then system package fixtures for testinfra-bdd."""
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
 
-from testinfra_bdd import TestinfraBDD
+from testinfra_bdd import TestinfraBDD, parsers
+from testinfra_bdd.fleet import for_each_host
+from testinfra_bdd.package_inventory import get_system_package
 
 
 @when(parsers.parse('the TestInfra package is {package_name}'))
+@for_each_host
 def the_package_is(package_name: str, testinfra_bdd_host):
     """
     Check the status of a package.
 
+    The package is looked up in a snapshot of all of the installed packages
+    of the host (see testinfra_bdd.package_inventory).
+
     Parameters
     ----------
     package_name : str
@@ -16,10 +22,11 @@ def the_package_is(package_name: str, testinfra_bdd_host):
     testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
         The test fixture.
     """
-    testinfra_bdd_host.package = testinfra_bdd_host.host.package(package_name.strip('"'))
+    testinfra_bdd_host.package = get_system_package(testinfra_bdd_host.host, package_name.strip('"'))
 
 
 @then(parsers.parse('the TestInfra package version will be greater than or equal to {expected_version}'))
+@for_each_host
 def _(expected_version: str, testinfra_bdd_host: TestinfraBDD):
     """
     Check that a system package is higher than the specified version.
@@ -44,6 +51,7 @@ def _(expected_version: str, testinfra_bdd_host: TestinfraBDD):
 
 @then(parsers.parse('the TestInfra package state is {expected_status}'))
 @then(parsers.parse('the TestInfra package is {expected_status}'))
+@for_each_host
 def the_package_status_is(expected_status, testinfra_bdd_host):
     """
     Check the status of a package (installed/absent).
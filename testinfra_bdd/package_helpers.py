@@ -0,0 +1,205 @@
+"""Helper functions for listing all of the installed packages of a host."""
+import json
+import re
+
+from testinfra.modules.package import DebianPackage, RpmPackage
+
+
+class PackageInventory:
+    """The installed packages of a host and their versions."""
+
+    def __init__(self, versions, authoritative_pattern=None, normalise=str):
+        """
+        Create a PackageInventory object.
+
+        Parameters
+        ----------
+        versions : dict
+            The version of each installed package keyed by (normalised) name.
+        authoritative_pattern : str, optional
+            A regular expression for package names which, if not in the
+            inventory, are definitely not installed.  Other names that are
+            not in the inventory are checked on the host.
+        normalise : callable, optional
+            A function that normalises a package name.
+        """
+        self.authoritative_pattern = authoritative_pattern
+        self.normalise = normalise
+        self.versions = versions
+
+    def get_version(self, name):
+        """
+        Get the version of an installed package.
+
+        Parameters
+        ----------
+        name : str
+            The package name.
+
+        Returns
+        -------
+        str or None
+            The version or None if the package is not in the inventory.
+        """
+        return self.versions.get(self.normalise(name))
+
+    def is_authoritative(self, name):
+        """
+        Check if the absence of a package from the inventory means it is not installed.
+
+        Parameters
+        ----------
+        name : str
+            The package name.
+
+        Returns
+        -------
+        bool
+            True if the inventory is authoritative for the package name.
+        """
+        return bool(self.authoritative_pattern and re.fullmatch(self.authoritative_pattern, name))
+
+
+def list_pip_packages(host, pip_path):
+    """
+    List the installed pip packages with a single remote command.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+    pip_path : str
+        The pip executable.
+
+    Returns
+    -------
+    PackageInventory or None
+        The installed packages or None if they could not be listed.
+    """
+    cmd = host.run('%s list --no-index --format=json', pip_path)
+
+    if cmd.rc != 0:
+        return None
+
+    versions = {normalise_pip_name(package['name']): package['version'] for package in json.loads(cmd.stdout)}
+    return PackageInventory(versions, '.+', normalise_pip_name)
+
+
+def list_system_packages(host):
+    """
+    List the installed system packages with a single remote command.
+
+    Only dpkg and rpm based hosts are supported.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+
+    Returns
+    -------
+    PackageInventory or None
+        The installed packages or None if they could not be listed.
+    """
+    for (package_class, command, parse, authoritative_pattern) in SYSTEM_PACKAGE_LISTERS:
+        if issubclass(host.package, package_class):
+            cmd = host.run(command)
+            return PackageInventory(parse(cmd.stdout), authoritative_pattern) if cmd.rc == 0 else None
+
+    return None
+
+
+def normalise_pip_name(name):
+    """
+    Normalise the name of a pip package (see PEP 503).
+
+    Parameters
+    ----------
+    name : str
+        The package name (e.g. "Pytest_BDD").
+
+    Returns
+    -------
+    str
+        The normalised name (e.g. "pytest-bdd").
+    """
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def parse_dpkg_packages(output):
+    """
+    Parse the output of the dpkg-query command.
+
+    Parameters
+    ----------
+    output : str
+        Lines of binary package name, package name, status and version.
+
+    Returns
+    -------
+    dict
+        The version of each installed package keyed by both names.
+    """
+    versions = {}
+
+    for line in output.splitlines():
+        (binary_package, package, status, version) = line.split('\t')
+        status = status.split()
+
+        if status[0] in ('install', 'hold') and status[1:3] == ['ok', 'installed']:
+            versions[binary_package] = versions[package] = version
+
+    return versions
+
+
+def parse_rpm_packages(output):
+    """
+    Parse the output of the rpm command.
+
+    Packages that have more than one version installed (e.g. kernel) are left
+    out so that they are checked on the host.
+
+    Parameters
+    ----------
+    output : str
+        Lines of package name and version.
+
+    Returns
+    -------
+    dict
+        The version of each installed package keyed by name.
+    """
+    versions = {}
+    duplicates = set()
+
+    for line in output.splitlines():
+        (name, version) = line.split('\t')
+
+        if name in versions:
+            duplicates.add(name)
+
+        versions[name] = version
+
+    return {name: version for (name, version) in versions.items() if name not in duplicates}
+
+
+"""SYSTEM_PACKAGE_LISTERS.
+
+For each supported Testinfra package class; the command that lists all of
+the installed packages, the function that parses its output and a regular
+expression of the package names that the list is authoritative for.
+"""
+SYSTEM_PACKAGE_LISTERS = (
+    (
+        DebianPackage,
+        "dpkg-query -W -f '${binary:Package}\\t${Package}\\t${Status}\\t${Version}\\n'",
+        parse_dpkg_packages,
+        '[a-z0-9][a-z0-9+.-]+'
+    ),
+    (
+        RpmPackage,
+        "rpm -qa --queryformat '%{NAME}\\t%{VERSION}\\n'",
+        parse_rpm_packages,
+        None
+    )
+)
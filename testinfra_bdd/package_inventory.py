@@ -0,0 +1,128 @@
+"""
+A snapshot of all of the installed system and pip packages of a host.
+
+Rather than querying the package manager for each package, all of the
+installed packages are listed with a single remote command and then looked
+up locally.
+"""
+import os
+
+from testinfra_bdd.host_cache import HostCache
+from testinfra_bdd.package_helpers import (list_pip_packages,
+                                           list_system_packages)
+
+"""PACKAGE_INVENTORY.
+
+The process-wide cache of installed packages.  The number of seconds that
+the packages of a host are cached for can be configured with the
+TESTINFRA_BDD_PACKAGE_INVENTORY_TTL environment variable.
+"""
+PACKAGE_INVENTORY = HostCache(ttl=float(os.environ.get('TESTINFRA_BDD_PACKAGE_INVENTORY_TTL', '300')))
+
+
+class InventoriedPackage:
+    """A package that is looked up in the inventory, falling back to a Testinfra package."""
+
+    def __init__(self, package, inventory):
+        """
+        Create an InventoriedPackage object.
+
+        Parameters
+        ----------
+        package : testinfra.modules.package.Package or testinfra.modules.pip.Pip
+            The Testinfra package.  Only used if the inventory can't answer
+            the question.  Any other attributes (e.g. pip_path) are also
+            taken from this package.
+        inventory : PackageInventory
+            The installed packages of the host.
+        """
+        self._inventory = inventory
+        self._package = package
+
+    def __getattr__(self, name):
+        """
+        Get any other attributes from the Testinfra package.
+
+        Parameters
+        ----------
+        name : str
+            The name of the attribute.
+
+        Returns
+        -------
+        object
+            The value of the attribute.
+        """
+        return getattr(self._package, name)
+
+    def __repr__(self):
+        """
+        Represent the package.
+
+        Returns
+        -------
+        str
+            The representation of the Testinfra package.
+        """
+        return repr(self._package)
+
+    @property
+    def is_installed(self):
+        """bool: True if the package is installed."""
+        if self._inventory.get_version(self.name) is not None:
+            return True
+        elif self._inventory.is_authoritative(self.name):
+            return False
+
+        return self._package.is_installed
+
+    @property
+    def version(self):
+        """str: The version of the package."""
+        version = self._inventory.get_version(self.name)
+        return self._package.version if version is None else version
+
+
+def get_pip_package(host, name, pip_path='pip'):
+    """
+    Get a pip package that is looked up in the inventory of the host.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+    name : str
+        The name of the pip package.
+    pip_path : str, optional
+        The pip executable.
+
+    Returns
+    -------
+    InventoriedPackage or testinfra.modules.pip.Pip
+        The package.  A Testinfra package if the pip packages could not be listed.
+    """
+    package = host.pip(name, pip_path)
+    inventory = PACKAGE_INVENTORY.get((host, 'pip', pip_path), lambda: list_pip_packages(host, pip_path))
+    return package if inventory is None else InventoriedPackage(package, inventory)
+
+
+def get_system_package(host, name):
+    """
+    Get a system package that is looked up in the inventory of the host.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+    name : str
+        The name of the system package.
+
+    Returns
+    -------
+    InventoriedPackage or testinfra.modules.package.Package
+        The package.  A Testinfra package if the package manager of the host
+        is not supported.
+    """
+    package = host.package(name)
+    inventory = PACKAGE_INVENTORY.get((host, 'package'), lambda: list_system_packages(host))
+    return package if inventory is None else InventoriedPackage(package, inventory)
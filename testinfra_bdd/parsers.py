@@ -1,4 +1,29 @@
 """Basic string parsers for Testinfra BDD."""
+import re
+
+from testinfra_bdd.step_parser import parse  # noqa: F401
+
+
+def check_table_columns(rows, columns):
+    """
+    Check that each row of a parsed data table has exactly the expected columns.
+
+    Parameters
+    ----------
+    rows : list
+        The rows of the table (see parse_table).
+    columns : tuple
+        The names of the expected columns.
+
+    Raises
+    ------
+    ValueError
+        If a row has any other columns or is missing a column.
+    """
+    for row in rows:
+        if set(row) != set(columns):
+            expected_columns = ' and '.join(f'"{column}"' for column in columns)
+            raise ValueError(f'Expected the columns {expected_columns} but got {sorted(row)}.')
 
 
 def parse_addr_and_port(addr_and_port, host):
@@ -72,3 +97,116 @@ def parse_process_filters(specification):
         filters[key] = value
 
     return filters
+
+
+def parse_table(table):
+    """
+    Parse a Gherkin data table into a list of dictionaries.
+
+    Parameters
+    ----------
+    table : str
+        The data table.  The first row contains the headings.
+
+    Returns
+    -------
+    list
+        A dictionary for each row (excluding the headings) keyed by heading.
+
+    Raises
+    ------
+    ValueError
+        If the table can't be parsed.
+    """
+    rows = [parse_table_row(line) for line in table.strip().splitlines()]
+
+    if len({len(row) for row in rows}) != 1:
+        raise ValueError('Unable to parse table, the rows are of different lengths.')
+
+    return [dict(zip(rows[0], row)) for row in rows[1:]]
+
+
+def parse_table_row(line):
+    """
+    Parse a row of a Gherkin data table into a list of cells.
+
+    Parameters
+    ----------
+    line : str
+        The row (e.g. "| /etc/motd | present |").  A pipe within a cell
+        can be escaped with a backslash.
+
+    Returns
+    -------
+    list
+        The stripped contents of each cell.
+
+    Raises
+    ------
+    ValueError
+        If the row can't be parsed.
+    """
+    line = line.strip()
+
+    if not (line.startswith('|') and line.endswith('|')):
+        raise ValueError(f'Unable to parse table row "{line}".')
+
+    return [cell.strip().replace('\\|', '|') for cell in re.split(r'(?<!\\)\|', line[1:-1])]
+
+
+def parse_hostspec_pattern(pattern):
+    """
+    Expand a hostspec pattern into a list of hostspecs.
+
+    Parameters
+    ----------
+    pattern : str
+        A hostspec that may contain one or more ranges in square brackets.
+        A range is a comma separated list of values and/or numeric ranges
+        (e.g. "ssh://web-[01-40]" or "ssh://[web,db]-[1-3,7]").  Leading
+        zeros are preserved.
+
+    Returns
+    -------
+    list
+        The expanded hostspecs.
+    """
+    match = re.search(r'\[([\w,-]+)\]', pattern)
+
+    if not match:
+        return [pattern]
+
+    hostspecs = []
+
+    for value in parse_hostspec_range(match.group(1)):
+        hostspecs += parse_hostspec_pattern(pattern[:match.start()] + value + pattern[match.end():])
+
+    return hostspecs
+
+
+def parse_hostspec_range(specification):
+    """
+    Expand a range from a hostspec pattern.
+
+    Parameters
+    ----------
+    specification : str
+        The contents of the square brackets (e.g. "01-40" or "web,db").
+
+    Returns
+    -------
+    list
+        The values of the range.
+    """
+    values = []
+
+    for item in specification.split(','):
+        match = re.fullmatch(r'(\d+)-(\d+)', item)
+
+        if match:
+            (start, end) = match.groups()
+            values += [str(number).zfill(len(start)) for number in range(int(start), int(end) + 1)]
+        else:
+            values.append(item)
+
+    return values
@@ -3,17 +3,24 @@ Then pip package fixtures for testinfra-bdd.
 
 Please avoid already-imported warning: PYTEST_DONT_REWRITE.
 """
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
 
-from testinfra_bdd import TestinfraBDD
+from testinfra_bdd import TestinfraBDD, parsers
 from testinfra_bdd.exception_message import exception_message
+from testinfra_bdd.fleet import for_each_host
+from testinfra_bdd.package_inventory import get_pip_package
+from testinfra_bdd.pip_helpers import OUTDATED_PACKAGES
 
 
 @when(parsers.parse('the TestInfra pip package is {package_name}'))
+@for_each_host
 def the_pip_package_is(package_name: str, testinfra_bdd_host: TestinfraBDD):
     """
     Check the status of a pip package.
 
+    The package is looked up in a snapshot of all of the installed pip
+    packages of the host (see testinfra_bdd.package_inventory).
+
     Parameters
     ----------
     package_name : str
@@ -21,7 +28,7 @@ def the_pip_package_is(package_name: str, testinfra_bdd_host: TestinfraBDD):
     testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
         The test fixture.
     """
-    testinfra_bdd_host.pip_package = testinfra_bdd_host.host.pip(package_name.strip('"'))
+    testinfra_bdd_host.pip_package = get_pip_package(testinfra_bdd_host.host, package_name.strip('"'))
 
 
 def check_entry_requirements(pip_package, expected_state):
@@ -59,6 +66,10 @@ def get_pip_package_actual_state(pip_package, expected_state, host):
     """
     Get the actual state of a Pip package given the package and the expected state.
 
+    The outdated packages of the host are cached (see
+    testinfra_bdd.pip_helpers.OUTDATED_PACKAGES) so that checking many
+    packages only queries the package index once.
+
     Parameters
     ----------
     pip_package : testinfra.Pip
@@ -95,7 +106,7 @@ def get_pip_package_actual_state(pip_package, expected_state, host):
             expected_state
         )
 
-    outdated_packages = host.pip.get_outdated_packages()
+    outdated_packages = OUTDATED_PACKAGES.get_outdated_packages(host, pip_package.pip_path)
 
     if pip_package.name in outdated_packages:
         actual_state = 'superseded'
@@ -106,6 +117,7 @@ def get_pip_package_actual_state(pip_package, expected_state, host):
 
 
 @then(parsers.parse('the TestInfra pip package version will be greater than or equal to {expected_version}'))
+@for_each_host
 def _(expected_version: str, testinfra_bdd_host: TestinfraBDD):
     """
     Check that a pip package is higher than the specified version.
@@ -129,6 +141,7 @@ def _(expected_version: str, testinfra_bdd_host: TestinfraBDD):
 
 
 @then('the TestInfra pip check is OK')
+@for_each_host
 def the_pip_check_is_ok(testinfra_bdd_host):
     """
     Verify installed packages have compatible dependencies.
@@ -151,6 +164,7 @@ def the_pip_check_is_ok(testinfra_bdd_host):
 
 @then(parsers.parse('the TestInfra pip package state is {expected_state}'))
 @then(parsers.parse('the TestInfra pip package is {expected_state}'))
+@for_each_host
 def the_pip_package_state_is(expected_state, testinfra_bdd_host):
     """
     Check the state of a Pip package.
@@ -176,6 +190,7 @@ def the_pip_package_state_is(expected_state, testinfra_bdd_host):
 
 
 @then(parsers.parse('the TestInfra pip package version is {expected_version}'))
+@for_each_host
 def the_pip_package_version_is(expected_version, testinfra_bdd_host):
     """
     Check the version of a Pip package.
@@ -0,0 +1,188 @@
+"""Helper functions for the pip fixtures for testinfra-bdd."""
+import json
+import os
+
+from testinfra_bdd.host_cache import HostCache
+
+
+class OutdatedPackagesCache(HostCache):
+    """A cache of the outdated pip packages for each host and pip executable."""
+
+    def __init__(self, ttl=3600.0, index_url=None, outdated_json=None):
+        """
+        Create an OutdatedPackagesCache object.
+
+        Parameters
+        ----------
+        ttl : float, optional
+            The number of seconds that the outdated packages of a host are
+            cached for.
+        index_url : str, optional
+            The URL of a package index (e.g. a local mirror) to compare the
+            installed packages against instead of the default index.
+        outdated_json : str, optional
+            The path to a local file containing the pre-captured output of
+            "pip list --outdated --format=json" (see
+            get_offline_outdated_packages).  If set, the hosts are not
+            queried at all.
+        """
+        super().__init__(ttl)
+        self.index_url = index_url
+        self.outdated_json = outdated_json
+
+    def get_outdated_packages(self, host, pip_path='pip'):
+        """
+        Get the outdated packages of a host, querying the host if they are not cached.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host
+            The host to be checked.
+        pip_path : str, optional
+            The pip executable (and therefore interpreter) to be checked.
+
+        Returns
+        -------
+        dict
+            The current and latest version of each outdated package, keyed by
+            package name.
+        """
+        return self.get((host, pip_path), lambda: self._fetch_outdated_packages(host, pip_path))
+
+    def _fetch_outdated_packages(self, host, pip_path):
+        """
+        Get the outdated packages from the pre-captured JSON, the package index or the host.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host
+            The host to be checked.
+        pip_path : str
+            The pip executable to be checked.
+
+        Returns
+        -------
+        dict
+            The current and latest version of each outdated package, keyed by
+            package name.
+        """
+        if self.outdated_json:
+            with open(self.outdated_json, encoding='utf-8') as stream:
+                outdated = json.load(stream)
+
+            return get_outdated_versions(get_offline_outdated_packages(outdated, host, pip_path, self.outdated_json))
+        elif self.index_url:
+            cmd = host.run_expect([0], '%s list -o --format=json --index-url %s', pip_path, self.index_url)
+            return parse_outdated_packages(cmd.stdout)
+
+        return host.pip.get_outdated_packages(pip_path)
+
+
+def get_offline_outdated_packages(outdated, host, pip_path, path):
+    """
+    Get the pre-captured outdated packages of a host and pip executable.
+
+    The pre-captured JSON is either the output of a single
+    "pip list --outdated --format=json" (used for all hosts and pip
+    executables) or an object keyed by the ID of each host as shown in the
+    pytest test IDs (e.g. "docker://sut").  The value for a host is either
+    the output for all of its pip executables or an object keyed by pip
+    executable.
+
+    Parameters
+    ----------
+    outdated : list or dict
+        The pre-captured JSON.
+    host : testinfra.host.Host
+        The host to be checked.
+    pip_path : str
+        The pip executable to be checked.
+    path : str
+        The path of the pre-captured JSON (for error messages).
+
+    Returns
+    -------
+    list
+        The outdated packages in the format of
+        "pip list --outdated --format=json".
+
+    Raises
+    ------
+    KeyError
+        If the host (or pip executable) was not captured.
+    """
+    if isinstance(outdated, list):
+        return outdated
+
+    host_id = host.backend.get_pytest_id()
+    packages = outdated.get(host_id, {})
+
+    if isinstance(packages, dict):
+        packages = packages.get(pip_path)
+
+    if packages is None:
+        raise KeyError(f'The outdated packages of {pip_path} on {host_id} were not captured in {path}.')
+
+    return packages
+
+
+def get_outdated_versions(packages):
+    """
+    Get the current and latest version of each outdated package.
+
+    Parameters
+    ----------
+    packages : list
+        The outdated packages in the format of
+        "pip list --outdated --format=json".
+
+    Returns
+    -------
+    dict
+        The current and latest version of each outdated package, keyed by
+        package name (in the same format as testinfra's
+        host.pip.get_outdated_packages).
+    """
+    return {
+        package['name']: {
+            'current': package['version'],
+            'latest': package['latest_version']
+        } for package in packages
+    }
+
+
+def parse_outdated_packages(output):
+    """
+    Parse the output of "pip list --outdated --format=json".
+
+    Parameters
+    ----------
+    output : str
+        The JSON output.
+
+    Returns
+    -------
+    dict
+        The current and latest version of each outdated package, keyed by
+        package name (in the same format as testinfra's
+        host.pip.get_outdated_packages).
+    """
+    return get_outdated_versions(json.loads(output))
+
+
+"""OUTDATED_PACKAGES.
+
+The process-wide cache of outdated pip packages.  Can be configured with the
+following environment variables:
+
+- TESTINFRA_BDD_PIP_OUTDATED_TTL: The number of seconds to cache for.
+- TESTINFRA_BDD_PIP_INDEX_URL: A package index (e.g. a local mirror) to use.
+- TESTINFRA_BDD_PIP_OUTDATED_JSON: A file of pre-captured output from
+  "pip list --outdated --format=json" (for a single host or keyed by host,
+  see get_offline_outdated_packages) to use instead of querying the hosts.
+"""
+OUTDATED_PACKAGES = OutdatedPackagesCache(
+    ttl=float(os.environ.get('TESTINFRA_BDD_PIP_OUTDATED_TTL', '3600')),
+    index_url=os.environ.get('TESTINFRA_BDD_PIP_INDEX_URL'),
+    outdated_json=os.environ.get('TESTINFRA_BDD_PIP_OUTDATED_JSON')
+)
@@ -3,16 +3,23 @@ Then process fixtures for testinfra-bdd.
 
 Please avoid already-imported warning: PYTEST_DONT_REWRITE.
 """
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
 
-from testinfra_bdd.parsers import parse_process_filters
+from testinfra_bdd import parsers
+from testinfra_bdd.fleet import for_each_host
+from testinfra_bdd.parsers import parse_table
+from testinfra_bdd.process_snapshot import get_process_count_mismatches
 
 
 @when(parsers.parse('the TestInfra process filter is {process_specification}'))
+@for_each_host
 def the_process_filter_is(process_specification, testinfra_bdd_host):
     """
     Check the status of processes.
 
+    The processes are taken from a snapshot of the process table that is
+    listed once per scenario.
+
     Parameters
     ----------
     process_specification : str
@@ -22,11 +29,11 @@ def the_process_filter_is(process_specification, testinfra_bdd_host):
     """
     process_specification = process_specification.strip('"')
     testinfra_bdd_host.process_specification = process_specification
-    host = testinfra_bdd_host.host
-    testinfra_bdd_host.processes = host.process.filter(**parse_process_filters(process_specification))
+    testinfra_bdd_host.processes = testinfra_bdd_host.get_process_snapshot().filter(process_specification)
 
 
 @then(parsers.parse('the TestInfra process count is {expected_count:d}'))
+@for_each_host
 def the_process_count_is(expected_count, testinfra_bdd_host):
     """
     Check that the process count matches the expected count.
@@ -50,3 +57,27 @@ def the_process_count_is(expected_count, testinfra_bdd_host):
     message = f'Expected process specification "{specification}" to return {expected_count} '
     message += f'but found {actual_process_count} "{processes}".'
     assert actual_process_count == expected_count, message
+
+
+@then(parsers.parse('the TestInfra process counts are\n{table}'))
+@for_each_host
+def the_process_counts_are(table, testinfra_bdd_host):
+    """
+    Check the number of processes that match many specifications.
+
+    Parameters
+    ----------
+    table : str
+        A data table with a "specification" (e.g. "user=root,comm=ntpd") and
+        a "count" column.
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+
+    Raises
+    ------
+    AssertError
+        If any of the actual process counts do not match the expected counts.
+        All of the mismatches are reported together.
+    """
+    mismatches = get_process_count_mismatches(testinfra_bdd_host.get_process_snapshot(), parse_table(table))
+    assert not mismatches, '\n'.join(mismatches)
@@ -0,0 +1,127 @@
+"""
+A snapshot of the process table of a host.
+
+Rather than listing the processes of the host for each process filter, the
+process table is listed once per scenario and the filters are resolved
+locally with an index on each of the INDEXED_ATTRIBUTES.
+"""
+from testinfra.modules.process import _Process
+
+from testinfra_bdd.exception_message import exception_message
+from testinfra_bdd.parsers import check_table_columns, parse_process_filters
+
+"""INDEXED_ATTRIBUTES.
+
+The process attributes (see the ps(1) man page) that are included in the
+snapshot.  Filters on any other attribute are run on the host.
+"""
+INDEXED_ATTRIBUTES = ('comm', 'pid', 'ppid', 'user')
+
+
+class ProcessSnapshot:
+    """The processes of a host at a point in time, indexed by attribute."""
+
+    def __init__(self, host):
+        """
+        Create a ProcessSnapshot object, listing the processes of the host.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host
+            The host.
+        """
+        self._host = host
+        self._matches = {}
+        self._processes = []
+        self._indexes = {attribute: {} for attribute in INDEXED_ATTRIBUTES}
+        process = host.process
+
+        for attrs in process._get_processes(**dict.fromkeys(INDEXED_ATTRIBUTES)):
+            attrs['_get_process_attribute_by_pid'] = process._get_process_attribute_by_pid
+            self._processes.append(_Process(attrs))
+
+            for attribute in INDEXED_ATTRIBUTES:
+                self._indexes[attribute].setdefault(str(attrs[attribute]), []).append(self._processes[-1])
+
+    def filter(self, specification):
+        """
+        Get the processes that match a process specification.
+
+        Parameters
+        ----------
+        specification : str
+            The process specification (e.g. "user=root,comm=ntpd").
+
+        Returns
+        -------
+        list
+            The matching processes.
+
+        Raises
+        ------
+        ValueError
+            If the specification can't be parsed.
+        """
+        if specification not in self._matches:
+            filters = parse_process_filters(specification)
+
+            if set(filters) - set(INDEXED_ATTRIBUTES):
+                self._matches[specification] = self._host.process.filter(**filters)
+            else:
+                self._matches[specification] = self._filter(filters)
+
+        return self._matches[specification]
+
+    def _filter(self, filters):
+        """
+        Get the processes that match all of the filters from the indexes.
+
+        Parameters
+        ----------
+        filters : dict
+            The expected value of each indexed attribute.
+
+        Returns
+        -------
+        list
+            The matching processes.
+        """
+        candidates = [self._indexes[key].get(str(value), []) for (key, value) in filters.items()]
+        return [
+            process for process in min(candidates, key=len, default=self._processes)
+            if all(str(process[key]) == str(value) for (key, value) in filters.items())
+        ]
+
+
+def get_process_count_mismatches(snapshot, rows):
+    """
+    Compare the number of processes that match each specification against the expected count.
+
+    Parameters
+    ----------
+    snapshot : ProcessSnapshot
+        The processes of the host.
+    rows : list
+        A list of dictionaries, each with a "specification" and a "count" key.
+
+    Returns
+    -------
+    list
+        A message for each specification that does not match the expected count.
+
+    Raises
+    ------
+    ValueError
+        If a specification can't be parsed or a row has no specification or count.
+    """
+    check_table_columns(rows, ('specification', 'count'))
+    mismatches = []
+
+    for row in rows:
+        actual_count = len(snapshot.filter(row['specification']))
+
+        if str(actual_count) != row['count']:
+            resource_name = f'the process count of "{row["specification"]}"'
+            mismatches.append(exception_message(resource_name, actual_count, row['count']))
+
+    return mismatches
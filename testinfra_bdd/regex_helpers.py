@@ -0,0 +1,37 @@
+"""
+Prepare the regex patterns of the steps, compiling each pattern only once.
+
+Feature files (especially Scenario Outlines) tend to repeat the same
+patterns many times, so the compiled patterns are cached, keyed by the
+pattern text as it appears in the Gherkin.  The effectiveness of the cache
+can be checked with prepare_pattern.cache_info().
+"""
+import functools
+import os
+import re
+
+"""REGEX_CACHE_SIZE.
+
+The maximum number of compiled patterns to keep.  Can be configured with the
+TESTINFRA_BDD_REGEX_CACHE_SIZE environment variable.
+"""
+REGEX_CACHE_SIZE = int(os.environ.get('TESTINFRA_BDD_REGEX_CACHE_SIZE', '1024'))
+
+
+@functools.lru_cache(maxsize=REGEX_CACHE_SIZE)
+def prepare_pattern(pattern):
+    """
+    Compile a regex pattern that has been parsed from a step.
+
+    Parameters
+    ----------
+    pattern : str
+        The pattern as parsed from the step text.  The parsers.parse function
+        escapes the parsed string, so it is cleaned up before it is compiled.
+
+    Returns
+    -------
+    re.Pattern
+        The compiled pattern.
+    """
+    return re.compile(pattern.encode('utf-8').decode('unicode_escape'))
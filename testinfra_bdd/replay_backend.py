@@ -0,0 +1,78 @@
+"""
+A Testinfra backend that replays the commands recorded in a cassette.
+
+See testinfra_bdd.cassette.
+"""
+import testinfra.backend.base
+
+
+class ReplayBackend(testinfra.backend.base.BaseBackend):
+    """A backend that answers each command from a cassette instead of a host."""
+
+    NAME = 'replay'
+
+    def __init__(self, hostspec, cassette, **kwargs):
+        """
+        Create a ReplayBackend object.
+
+        Parameters
+        ----------
+        hostspec : str
+            The URL of the recorded host.
+        cassette : testinfra_bdd.cassette.Cassette
+            The cassette to replay.
+        **kwargs : dict
+            Any other keyword arguments for the backend.
+        """
+        super().__init__(hostspec, **kwargs)
+        self.cassette = cassette
+        self.hostspec = hostspec
+
+    def get_encoding(self):
+        """
+        Get the encoding of the recorded host.
+
+        Returns
+        -------
+        str
+            The encoding of the output of the commands.
+        """
+        return self.cassette.get_encoding(self.hostspec)
+
+    def get_pytest_id(self):
+        """
+        Get the ID of the host in test reports.
+
+        Returns
+        -------
+        str
+            The URL of the recorded host.
+        """
+        return self.hostspec
+
+    def run(self, command, *args, **kwargs):
+        """
+        Play the recorded result of a command.
+
+        Parameters
+        ----------
+        command : str
+            The command.
+        *args : tuple
+            Arguments that are quoted into the command.
+        **kwargs : dict
+            Any other keyword arguments (ignored).
+
+        Returns
+        -------
+        testinfra.backend.base.CommandResult
+            The recorded result of the command.
+
+        Raises
+        ------
+        RuntimeError
+            If the command was not recorded for the host.
+        """
+        command = self.quote(command, *args)
+        (rc, stdout, stderr) = self.cassette.play(self.hostspec, command)
+        return self.result(rc, self.encode(command), stdout, stderr)
@@ -0,0 +1,159 @@
+"""
+Search the content of remote files without holding large files in memory.
+
+Text is searched on the host with "grep -F", which stops reading at the
+first match, so a file that contains the text costs a single remote command.
+Patterns use the Python syntax, so the start of the file (up to
+FILE_SEARCH_THRESHOLD bytes) is downloaded with a single remote command and
+searched locally.  Larger files are searched on the host with "grep -P" or,
+where grep does not support it (e.g. BusyBox and BSD grep), streamed
+through a local temporary file (see testinfra_bdd.command_stream).  Only
+when a search fails is an excerpt of the file fetched for the message.
+"""
+import os
+
+from testinfra_bdd.command_stream import StreamedCommand
+from testinfra_bdd.stream_search import EXCERPT_LENGTH, search_text
+
+"""FILE_SEARCH_THRESHOLD.
+
+The size (in bytes) above which a file is searched on the host rather than
+being downloaded.  Can be configured with the TESTINFRA_BDD_FILE_SEARCH_THRESHOLD
+environment variable.
+"""
+FILE_SEARCH_THRESHOLD = int(os.environ.get('TESTINFRA_BDD_FILE_SEARCH_THRESHOLD', '1048576'))
+
+"""GREP_OPTIONS.
+
+The grep option for each type of search.  PCRE (-P) is the closest to the
+Python regex syntax.
+"""
+GREP_OPTIONS = {
+    'regex': '-P',
+    'text': '-F'
+}
+
+
+def get_file_excerpt(file):
+    """
+    Get the start of the content of a file, truncated for use in a message.
+
+    Parameters
+    ----------
+    file : testinfra.modules.file.File
+        The file.
+
+    Returns
+    -------
+    str
+        The excerpt (e.g. '"foo" (the first 3 of 1024 bytes)').
+    """
+    cmd = file.run_expect([0], 'head -c %s -- %s', str(EXCERPT_LENGTH), file.path)
+    # The excerpt may end part way through a multibyte character.
+    content = cmd.stdout_bytes.decode(cmd.backend.encoding, errors='replace')
+    size = file.size
+
+    if size <= len(cmd.stdout_bytes):
+        return f'"{content}"'
+
+    return f'"{content}" (the first {len(cmd.stdout_bytes)} of {size} bytes)'
+
+
+def grep_file(file, search_type, needle):
+    """
+    Search a file on the host with grep.
+
+    Parameters
+    ----------
+    file : testinfra.modules.file.File
+        The file to be searched.
+    search_type : str
+        Either "regex" or "text".
+    needle : str or re.Pattern
+        The text or compiled pattern to search for.
+
+    Returns
+    -------
+    bool or None
+        True if the file contains the needle or False if it doesn't.  None
+        if the file can't be searched (e.g. it is missing or grep does not
+        support the option).
+    """
+    cmd = file.run('grep -q %s -e %s -- %s', GREP_OPTIONS[search_type], getattr(needle, 'pattern', needle), file.path)
+    return {0: True, 1: False}.get(cmd.rc)
+
+
+def search_file(file, search_type, needle):
+    """
+    Search the content of a file for a regex pattern or some text.
+
+    Parameters
+    ----------
+    file : testinfra.modules.file.File
+        The file to be searched.
+    search_type : str
+        Either "regex" or "text".
+    needle : str or re.Pattern
+        The text or compiled pattern to search for.  Patterns use the Python
+        syntax for files up to FILE_SEARCH_THRESHOLD bytes.  Larger files are
+        searched line by line on the host with "grep -P" where possible.
+
+    Returns
+    -------
+    tuple
+        bool
+            True if the file contains the needle.
+        str
+            A bounded excerpt of the file content.
+
+    Raises
+    ------
+    AssertError
+        If the file can't be searched (e.g. it is missing).
+    """
+    if search_type == 'regex':
+        return search_file_pattern(file, needle)
+
+    found = grep_file(file, search_type, needle)
+    assert found is not None, f'Unable to search {file.path} on the host.'
+    return found, '' if found else get_file_excerpt(file)
+
+
+def search_file_pattern(file, pattern):
+    """
+    Search the content of a file for a regex pattern.
+
+    Parameters
+    ----------
+    file : testinfra.modules.file.File
+        The file to be searched.
+    pattern : re.Pattern
+        The compiled pattern.
+
+    Returns
+    -------
+    tuple
+        bool
+            True if the file matches the pattern.
+        str
+            A bounded excerpt of the file content.
+
+    Raises
+    ------
+    RuntimeError
+        If the file can't be read.
+    """
+    cmd = file.run('head -c %s -- %s', str(FILE_SEARCH_THRESHOLD + 1), file.path)
+
+    if cmd.rc != 0:
+        raise RuntimeError(f'Unexpected output {cmd}')
+    elif len(cmd.stdout_bytes) <= FILE_SEARCH_THRESHOLD:
+        return search_text(cmd.stdout, pattern)
+
+    found = grep_file(file, 'regex', pattern)
+
+    if found is None:
+        # The grep of the host has no -P, so the file is searched locally a chunk at a time.
+        return StreamedCommand(file._host, file._host.backend.quote('cat -- %s', file.path)).search('stdout', pattern)
+
+    return found, '' if found else get_file_excerpt(file)
@@ -1,12 +1,21 @@
 """Then service fixtures for testinfra-bdd."""
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
+
+from testinfra_bdd import parsers
+from testinfra_bdd.fleet import for_each_host
+from testinfra_bdd.parsers import parse_table
+from testinfra_bdd.service_inventory import get_service, get_service_mismatches
 
 
 @when(parsers.parse('the TestInfra service is {service}'))
+@for_each_host
 def the_service_is(service: str, testinfra_bdd_host):
     """
     Check the status of a service.
 
+    The state of the service is looked up in a snapshot of all of the
+    services of the host (see testinfra_bdd.service_inventory).
+
     Parameters
     ----------
     service : str
@@ -14,10 +23,11 @@ def the_service_is(service: str, testinfra_bdd_host):
     testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
         The test fixture.
     """
-    testinfra_bdd_host.service = testinfra_bdd_host.host.service(service.strip('"'))
+    testinfra_bdd_host.service = get_service(testinfra_bdd_host.host, service.strip('"'))
 
 
 @then('the TestInfra service is not enabled')
+@for_each_host
 def the_service_is_not_enabled(testinfra_bdd_host):
     """
     Check that the service is not enabled.
@@ -38,6 +48,7 @@ def the_service_is_not_enabled(testinfra_bdd_host):
 
 
 @then('the TestInfra service is enabled')
+@for_each_host
 def the_service_is_enabled(testinfra_bdd_host):
     """
     Check that the service is enabled.
@@ -58,6 +69,7 @@ def the_service_is_enabled(testinfra_bdd_host):
 
 
 @then('the TestInfra service is not running')
+@for_each_host
 def the_service_is_not_running(testinfra_bdd_host):
     """
     Check that the service is not running.
@@ -78,6 +90,7 @@ def the_service_is_not_running(testinfra_bdd_host):
 
 
 @then('the TestInfra service is running')
+@for_each_host
 def the_service_is_running(testinfra_bdd_host):
     """
     Check that the service is running.
@@ -95,3 +108,28 @@ def the_service_is_running(testinfra_bdd_host):
     service = testinfra_bdd_host.service
     message = f'Expected {service.name} on host {testinfra_bdd_host.hostname} to be running.'
     assert service.is_running, message
+
+
+@then(parsers.parse('the TestInfra services are\n{table}'))
+@for_each_host
+def the_services_are(table, testinfra_bdd_host):
+    """
+    Check the state of many services against a single snapshot of the services.
+
+    Parameters
+    ----------
+    table : str
+        A data table with a "service" column and a "running" (running or not
+        running) and/or an "enabled" (enabled or not enabled) column.  Empty
+        cells are not checked.
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+
+    Raises
+    ------
+    AssertError
+        If any of the actual states do not match the expected states.  All of
+        the mismatches are reported together.
+    """
+    mismatches = get_service_mismatches(testinfra_bdd_host.host, parse_table(table))
+    assert not mismatches, '\n'.join(mismatches)
@@ -0,0 +1,224 @@
+"""
+A snapshot of the state of all of the services of a host.
+
+Rather than asking the init system about each service one property at a
+time, the running and enabled state of all of the services is listed with a
+couple of remote commands and then looked up locally.  Services that are not
+in the snapshot are checked on the host as normal.
+"""
+import os
+
+from testinfra_bdd.exception_message import exception_message
+from testinfra_bdd.host_cache import HostCache
+from testinfra_bdd.service_listers import list_services
+
+"""SERVICE_INVENTORY.
+
+The process-wide cache of service states.  The number of seconds that the
+services of a host are cached for can be configured with the
+TESTINFRA_BDD_SERVICE_INVENTORY_TTL environment variable.
+"""
+SERVICE_INVENTORY = HostCache(ttl=float(os.environ.get('TESTINFRA_BDD_SERVICE_INVENTORY_TTL', '60')))
+
+
+class ServiceInventory:
+    """The running and enabled state of the services of a host."""
+
+    def __init__(self, running, enabled, enabled_is_authoritative=False):
+        """
+        Create a ServiceInventory object.
+
+        Parameters
+        ----------
+        running : dict
+            True for each service that is running, keyed by name.
+        enabled : dict
+            True for each service that is enabled, keyed by name.
+        enabled_is_authoritative : bool, optional
+            True if services that are not in the enabled dictionary are
+            definitely not enabled.
+        """
+        self.enabled = enabled
+        self.enabled_is_authoritative = enabled_is_authoritative
+        self.running = running
+
+    def is_enabled(self, name):
+        """
+        Check if a service is enabled.
+
+        Parameters
+        ----------
+        name : str
+            The name of the service.
+
+        Returns
+        -------
+        bool or None
+            None if the inventory can't tell.
+        """
+        return self.enabled.get(name, False if self.enabled_is_authoritative else None)
+
+    def is_running(self, name):
+        """
+        Check if a service is running.
+
+        Parameters
+        ----------
+        name : str
+            The name of the service.
+
+        Returns
+        -------
+        bool or None
+            None if the inventory can't tell.
+        """
+        return self.running.get(name)
+
+
+class InventoriedService:
+    """A service that is looked up in the inventory, falling back to a Testinfra service."""
+
+    def __init__(self, service, inventory):
+        """
+        Create an InventoriedService object.
+
+        Parameters
+        ----------
+        service : testinfra.modules.service.Service
+            The Testinfra service.  Only used if the inventory can't answer
+            the question.  Any other attributes are also taken from this
+            service.
+        inventory : ServiceInventory
+            The services of the host.
+        """
+        self._inventory = inventory
+        self._service = service
+
+    def __getattr__(self, name):
+        """
+        Get any other attributes from the Testinfra service.
+
+        Parameters
+        ----------
+        name : str
+            The name of the attribute.
+
+        Returns
+        -------
+        object
+            The value of the attribute.
+        """
+        return getattr(self._service, name)
+
+    def __repr__(self):
+        """
+        Represent the service.
+
+        Returns
+        -------
+        str
+            The representation of the Testinfra service.
+        """
+        return repr(self._service)
+
+    @property
+    def is_enabled(self):
+        """bool: True if the service is enabled."""
+        enabled = self._inventory.is_enabled(self.name)
+        return self._service.is_enabled if enabled is None else enabled
+
+    @property
+    def is_running(self):
+        """bool: True if the service is running."""
+        running = self._inventory.is_running(self.name)
+        return self._service.is_running if running is None else running
+
+
+def get_service(host, name):
+    """
+    Get a service that is looked up in the inventory of the host.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+    name : str
+        The name of the service.
+
+    Returns
+    -------
+    InventoriedService or testinfra.modules.service.Service
+        The service.  A Testinfra service if the init system of the host is
+        not supported.
+    """
+    service = host.service(name)
+    states = SERVICE_INVENTORY.get((host, 'service'), lambda: list_services(host))
+    return service if states is None else InventoriedService(service, ServiceInventory(*states))
+
+
+def get_service_mismatches(host, rows):
+    """
+    Compare the actual state of many services against their expected state.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+    rows : list
+        A list of dictionaries.  Each must have a "service" key and may have
+        a "running" ("running" or "not running") and an "enabled" ("enabled"
+        or "not enabled") key.  Empty values are not checked.
+
+    Returns
+    -------
+    list
+        A message for each state that does not match the expectation.
+
+    Raises
+    ------
+    ValueError
+        If the rows contain an unknown column.
+    """
+    unknown_columns = set(rows[0]) - {'enabled', 'running', 'service'} if rows else set()
+
+    if unknown_columns:
+        raise ValueError(f'Unknown service columns {sorted(unknown_columns)}.')
+
+    mismatches = []
+
+    for row in rows:
+        mismatches.extend(get_service_state_mismatches(get_service(host, row['service']), row))
+
+    return mismatches
+
+
+def get_service_state_mismatches(service, row):
+    """
+    Compare the actual state of a service against its expected state.
+
+    Parameters
+    ----------
+    service : InventoriedService or testinfra.modules.service.Service
+        The service.
+    row : dict
+        The expected state of the service (see get_service_mismatches).
+
+    Returns
+    -------
+    list
+        A message for each state that does not match the expectation.
+    """
+    mismatches = []
+
+    for state in ('running', 'enabled'):
+        expected_state = row.get(state)
+
+        if not expected_state:
+            continue
+
+        actual_state = state if getattr(service, f'is_{state}') else f'not {state}'
+
+        if actual_state != expected_state:
+            mismatches.append(exception_message(f'service {row["service"]}', actual_state, expected_state))
+
+    return mismatches
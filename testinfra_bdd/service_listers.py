@@ -0,0 +1,221 @@
+"""
+List the running and enabled state of all of the services of a host.
+
+Each init system that Testinfra supports (apart from Upstart) is listed with
+a couple of remote commands, rather than asking about each service one
+property at a time.
+"""
+import re
+
+from testinfra.modules.service import (OpenRCService, SystemdService,
+                                       SysvService, UpstartService)
+
+"""SYSV_STATUS_COMMAND.
+
+Runs the status action of every init script and prints its return code and
+name.
+"""
+SYSV_STATUS_COMMAND = (
+    'for script in /etc/init.d/*; do '
+    'if [ -x "$script" ]; then "$script" status </dev/null >/dev/null 2>&1; echo "$? ${script##*/}"; fi; '
+    'done'
+)
+
+"""SYSV_STATUS_CODES.
+
+Whether a service is running for each return code of its status action that
+Testinfra understands (see /lib/lsb/init-functions).  Services with any other
+return code are checked on the host.
+"""
+SYSV_STATUS_CODES = {'0': True, '1': False, '3': False, '8': False}
+
+"""SYSTEMD_ENABLED_STATES.
+
+The unit file states for which "systemctl is-enabled" succeeds.
+"""
+SYSTEMD_ENABLED_STATES = ('alias', 'enabled', 'enabled-runtime', 'generated', 'indirect', 'static', 'transient')
+
+
+def list_openrc_services(host):
+    """
+    List the state of the services of an OpenRC host.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+
+    Returns
+    -------
+    tuple or None
+        The running and enabled state of each service (keyed by name) and
+        True if services that are not enabled are listed (see
+        testinfra_bdd.service_inventory.ServiceInventory).  None if the
+        services could not be listed.
+    """
+    status = host.run('rc-status --all')
+    runlevels = host.run('find /etc/runlevels/')
+
+    if status.rc != 0 or runlevels.rc != 0:
+        return None
+
+    running = {}
+
+    for match in re.finditer(r'^\s*(\S+)\s+\[\s*(\w+)', status.stdout, re.MULTILINE):
+        running[match.group(1)] = match.group(2) == 'started'
+
+    enabled = {path.rsplit('/', 1)[-1]: True for path in runlevels.stdout.splitlines()}
+    return running, enabled, True
+
+
+def list_services(host):
+    """
+    List the state of the services of a host with the commands of its init system.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+
+    Returns
+    -------
+    tuple or None
+        The running and enabled state of each service (keyed by name) and
+        True if services that are not enabled are listed (see
+        testinfra_bdd.service_inventory.ServiceInventory).  None if the
+        services could not be listed.
+    """
+    for (service_class, lister) in SERVICE_LISTERS:
+        if issubclass(host.service, service_class):
+            return lister(host)
+
+    return None
+
+
+def list_systemd_services(host):
+    """
+    List the state of the units of a systemd host.
+
+    Like Testinfra, this falls back to SysV if systemd is not running (e.g.
+    in a container).
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+
+    Returns
+    -------
+    tuple or None
+        The running and enabled state of each service (keyed by name) and
+        True if services that are not enabled are listed (see
+        testinfra_bdd.service_inventory.ServiceInventory).  None if the
+        services could not be listed.
+    """
+    units = host.run('systemctl list-units --all --no-legend --no-pager --plain')
+    unit_files = host.run('systemctl list-unit-files --no-legend --no-pager')
+
+    if units.rc != 0 or unit_files.rc != 0:
+        return list_sysv_services(host)
+
+    running = parse_systemd_states(units.stdout, 2, ('active',))
+    enabled = parse_systemd_states(unit_files.stdout, 1, SYSTEMD_ENABLED_STATES)
+    return running, enabled, False
+
+
+def list_sysv_services(host):
+    """
+    List the state of the services of a SysV host.
+
+    Parameters
+    ----------
+    host : testinfra.host.Host
+        The host.
+
+    Returns
+    -------
+    tuple or None
+        The running and enabled state of each service (keyed by name) and
+        True if services that are not enabled are listed (see
+        testinfra_bdd.service_inventory.ServiceInventory).  None if the
+        services could not be listed.
+    """
+    status = host.run(SYSV_STATUS_COMMAND)
+    links = host.run("find -L /etc/rc?.d/ -name 'S??*'")
+
+    if status.rc != 0 or links.rc != 0:
+        return None
+
+    enabled = {path.rsplit('/', 1)[-1][3:]: True for path in links.stdout.splitlines()}
+    return parse_sysv_status(status.stdout), enabled, True
+
+
+def parse_systemd_states(output, column, true_values):
+    """
+    Parse a state of each unit from a listing of systemd units.
+
+    Each unit of a service is also included without its ".service" suffix.
+
+    Parameters
+    ----------
+    output : str
+        The output of "systemctl list-units" or "systemctl list-unit-files".
+    column : int
+        The index of the column with the state.
+    true_values : tuple
+        The states for which the unit is True.
+
+    Returns
+    -------
+    dict
+        True or False for each unit, keyed by name.
+    """
+    states = {}
+
+    for line in output.splitlines():
+        fields = line.split()
+
+        if len(fields) > column:
+            states[fields[0]] = fields[column] in true_values
+
+    states.update({unit[:-len('.service')]: state for (unit, state) in states.items() if unit.endswith('.service')})
+    return states
+
+
+def parse_sysv_status(output):
+    """
+    Parse whether each service is running from the output of SYSV_STATUS_COMMAND.
+
+    Parameters
+    ----------
+    output : str
+        The return code and name of each service.
+
+    Returns
+    -------
+    dict
+        True for each service that is running, keyed by name.  Services with
+        a return code that is not in SYSV_STATUS_CODES are not included.
+    """
+    running = {}
+
+    for line in output.splitlines():
+        (rc, name) = line.split(' ', 1)
+
+        if rc in SYSV_STATUS_CODES:
+            running[name] = SYSV_STATUS_CODES[rc]
+
+    return running
+
+
+"""SERVICE_LISTERS.
+
+The Testinfra service class of each supported init system (most specific
+first) and the function that lists its services.  Upstart is not supported.
+"""
+SERVICE_LISTERS = (
+    (SystemdService, list_systemd_services),
+    (OpenRCService, list_openrc_services),
+    (UpstartService, lambda host: None),
+    (SysvService, list_sysv_services)
+)
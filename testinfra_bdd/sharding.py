@@ -0,0 +1,104 @@
+"""
+Run the scenarios of each host on the same pytest-xdist worker.
+
+Each scenario is marked with an xdist_group of the hostspec in its "the
+TestInfra host with URL" (or "the TestInfra hosts matching") Given step.
+With "--dist loadgroup", pytest-xdist sends all of the scenarios of a group
+to the same worker, so each worker only connects to its own hosts and reuses
+those connections (see testinfra_bdd.host_pool) for all of their scenarios.
+
+The marks are added by every worker that has the testinfra-bdd fixtures.
+The pytest-xdist controller doesn't collect the tests, so this module must
+also be loaded on the command line (e.g. "pytest -n 16 -p
+testinfra_bdd.sharding") to replace the default "--dist load" with "--dist
+loadgroup".
+
+Please avoid already-imported warning: PYTEST_DONT_REWRITE.
+"""
+import re
+
+import pytest
+
+"""HOSTSPEC_STEP.
+
+A regular expression that matches the Given steps that name the hosts of a
+scenario.
+"""
+HOSTSPEC_STEP = re.compile(r'^the TestInfra hosts? (?:with URL|matching) "(?P<hostspec>[^"]+)" (?:is|are) ready')
+
+
+def get_hostspec(item):
+    """
+    Get the hostspec of a scenario.
+
+    Parameters
+    ----------
+    item : pytest.Item
+        The test item of the scenario (or of any other test).
+
+    Returns
+    -------
+    str or None
+        The hostspec (or hostspec pattern) in the first Given step that names
+        the hosts of the scenario or None if there isn't one.
+    """
+    for step in get_scenario_steps(item):
+        match = HOSTSPEC_STEP.match(step.name)
+
+        if step.type == 'given' and match:
+            return match.group('hostspec')
+
+    return None
+
+
+def get_scenario_steps(item):
+    """
+    Get the steps of a scenario, including the values of its example.
+
+    Parameters
+    ----------
+    item : pytest.Item
+        The test item of the scenario (or of any other test).
+
+    Returns
+    -------
+    list
+        The pytest_bdd.parser.Step objects of the scenario.  Empty if the item
+        is not a scenario.
+    """
+    scenario = getattr(getattr(item, 'obj', None), '__scenario__', None)
+
+    if scenario is None:
+        return []
+
+    callspec = getattr(item, 'callspec', None)
+    example = callspec.params.get('_pytest_bdd_example', {}) if callspec is not None else {}
+    return scenario.render(example).steps
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(session, config, items):
+    """Mark each scenario with an xdist_group of its hostspec, before pytest-xdist reads the marks."""
+    for item in items:
+        hostspec = get_hostspec(item)
+
+        if hostspec is not None and item.get_closest_marker('xdist_group') is None:
+            item.add_marker(pytest.mark.xdist_group(hostspec))
+
+
+def pytest_configure(config):
+    """Distribute the scenarios by host instead of one at a time."""
+    config.addinivalue_line('markers', 'xdist_group(name): Runs the tests of a group on the same pytest-xdist worker.')
+
+    if config.getoption('dist', 'no') == 'load':
+        config.option.dist = 'loadgroup'
+
+    # The workers parse the original command line, so the controller tells them.
+    if getattr(config, 'workerinput', {}).get('testinfra_bdd_loadgroup'):
+        config.option.loadgroup = True
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Tell a pytest-xdist worker if the scenarios are distributed by host."""
+    node.workerinput['testinfra_bdd_loadgroup'] = node.config.getoption('dist') == 'loadgroup'
@@ -1,8 +1,14 @@
 """Then socket fixtures for testinfra-bdd."""
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
+
+from testinfra_bdd import parsers
+from testinfra_bdd.fleet import for_each_host
+from testinfra_bdd.parsers import parse_table
+from testinfra_bdd.socket_inventory import get_socket_mismatches
 
 
 @when(parsers.parse('the TestInfra socket is {socket}'))
+@for_each_host
 def when_the_socket_is(socket, testinfra_bdd_host):
     """
     Check the status of a socket.
@@ -14,14 +20,19 @@ def when_the_socket_is(socket, testinfra_bdd_host):
     testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
         The test fixture.
     """
-    testinfra_bdd_host.socket = testinfra_bdd_host.host.socket(socket.strip('"'))
+    testinfra_bdd_host.socket_url = socket.strip('"')
+    testinfra_bdd_host.socket = testinfra_bdd_host.host.socket(testinfra_bdd_host.socket_url)
 
 
 @then(parsers.parse('the TestInfra socket is {expected_state}'))
+@for_each_host
 def the_socket_is(expected_state, testinfra_bdd_host):
     """
     Check the state of a socket.
 
+    The socket is checked against the listening sockets of the host, which
+    are listed once per scenario.
+
     Parameters
     ----------
     expected_state : str
@@ -36,11 +47,31 @@ def the_socket_is(expected_state, testinfra_bdd_host):
     """
     socket = testinfra_bdd_host.socket
     socket_url = testinfra_bdd_host.socket_url
-    actual_state = 'not listening'
     assert socket, 'Socket is not set.  Have you missed a "When socket is" step?'
-
-    if socket.is_listening:
-        actual_state = 'listening'
-
+    actual_state = testinfra_bdd_host.get_socket_inventory().get_state(socket_url)
     message = f'Expected socket {socket_url} to be {expected_state} but it is {actual_state}.'
     assert actual_state == expected_state, message
+
+
+@then(parsers.parse('the TestInfra sockets are\n{table}'))
+@for_each_host
+def the_sockets_are(table, testinfra_bdd_host):
+    """
+    Check the state of many sockets against a single listing of the listening sockets.
+
+    Parameters
+    ----------
+    table : str
+        A data table with a "url" (e.g. "tcp://22") and a "state" (either
+        "listening" or "not listening") column.
+    testinfra_bdd_host : testinfra_bdd.fixture.TestinfraBDD
+        The test fixture.
+
+    Raises
+    ------
+    AssertError
+        If any of the actual states do not match the expected states.  All of
+        the mismatches are reported together.
+    """
+    mismatches = get_socket_mismatches(testinfra_bdd_host.get_socket_inventory(), parse_table(table))
+    assert not mismatches, '\n'.join(mismatches)
@@ -0,0 +1,142 @@
+"""
+An inventory of the listening sockets of a host.
+
+Rather than dumping the socket table of the host for each socket, the
+listening sockets are listed once per scenario and each socket is then
+checked against a set of them.
+"""
+import re
+
+from testinfra.modules.socket import parse_socketspec
+
+from testinfra_bdd.exception_message import exception_message
+from testinfra_bdd.parsers import check_table_columns
+
+"""SCOPE_PATTERN.
+
+The interface of an address with a scope (e.g. "%lo" in "127.0.0.53%lo:53"
+or "%eth0" in "[fe80::1]%eth0:22"), which testinfra can't parse.
+"""
+SCOPE_PATTERN = re.compile(r'%[^:\]]*')
+
+
+def parse_listening_socket(socketspec):
+    """
+    Parse a listening socket of a host, ignoring the scope of its address.
+
+    Parameters
+    ----------
+    socketspec : str
+        The URL of the socket (e.g. "udp://127.0.0.53%lo:53").
+
+    Returns
+    -------
+    tuple or None
+        The protocol, address and port of the socket (e.g. ("udp",
+        "127.0.0.53", 53)).  None if the socket can't be parsed.
+    """
+    (protocol, address) = socketspec.split('://', 1)
+
+    if protocol != 'unix':
+        address = SCOPE_PATTERN.sub('', address).replace('[', '').replace(']', '')
+
+    try:
+        return parse_socketspec(f'{protocol}://{address}')
+    except RuntimeError:
+        return None
+
+
+class SocketInventory:
+    """The listening sockets of a host at a point in time."""
+
+    def __init__(self, host):
+        """
+        Create a SocketInventory object, listing the listening sockets of the host.
+
+        Sockets on an address with a scope are listed without it, and any
+        socket that can't be parsed is left out.
+
+        Parameters
+        ----------
+        host : testinfra.host.Host
+            The host.
+        """
+        self.sockets = {parse_listening_socket(socketspec) for socketspec in host.socket.get_listening_sockets()}
+        self.sockets.discard(None)
+
+    def get_state(self, socketspec):
+        """
+        Get the state of a socket.
+
+        Parameters
+        ----------
+        socketspec : str
+            The URL of the socket (e.g. "tcp://22" or "udp://127.0.0.1:69").
+
+        Returns
+        -------
+        str
+            Either "listening" or "not listening".
+        """
+        return 'listening' if self.is_listening(*parse_socketspec(socketspec)) else 'not listening'
+
+    def is_listening(self, protocol, host, port):
+        """
+        Check if a socket is listening, with the same rules as testinfra.modules.socket.Socket.
+
+        A TCP or UDP socket is listening if the port is listening on all IPv6
+        addresses (which usually includes IPv4) or on the exact address.
+
+        Parameters
+        ----------
+        protocol : str
+            Either "tcp", "udp" or "unix".
+        host : str or None
+            The address (or the path of a unix socket).
+        port : int or None
+            The port number.
+
+        Returns
+        -------
+        bool
+            True if the socket is listening.
+        """
+        if protocol == 'unix':
+            return (protocol, host, None) in self.sockets
+
+        all_ipv6 = (protocol, '::', port) in self.sockets
+        return all_ipv6 or (host is not None and (protocol, host, port) in self.sockets)
+
+
+def get_socket_mismatches(inventory, rows):
+    """
+    Compare the actual state of many sockets against their expected state.
+
+    Parameters
+    ----------
+    inventory : SocketInventory
+        The listening sockets of the host.
+    rows : list
+        A list of dictionaries, each with a "url" and a "state" key (e.g.
+        "tcp://22" and "not listening").
+
+    Returns
+    -------
+    list
+        A message for each socket that is not in the expected state.
+
+    Raises
+    ------
+    ValueError
+        If a row has no url or state.
+    """
+    check_table_columns(rows, ('url', 'state'))
+    mismatches = []
+
+    for row in rows:
+        actual_state = inventory.get_state(row['url'])
+
+        if actual_state != row['state']:
+            mismatches.append(exception_message(f'socket {row["url"]}', actual_state, row['state']))
+
+    return mismatches
@@ -0,0 +1,76 @@
+"""
+A step parser that rejects most steps with a string comparison.
+
+It is re-exported as testinfra_bdd.parsers.parse.
+"""
+import pytest_bdd.parsers
+
+
+class parse(pytest_bdd.parsers.parse):  # noqa: N801
+    """
+    A pytest-bdd parse step parser that checks the literal prefix of a step first.
+
+    pytest-bdd checks every step definition against every step, so most
+    checks are for steps that don't match.  Those are rejected with a string
+    comparison of the text before the first field rather than a regex match.
+    The result of the last successful match is kept for parse_arguments.
+    """
+
+    def __init__(self, name, *args, **kwargs):
+        """
+        Compile the parse expression.
+
+        Parameters
+        ----------
+        name : str
+            The step format (e.g. "the TestInfra file is {file_name}").
+        *args : tuple
+            Any other positional arguments for parse.compile.
+        **kwargs : dict
+            Any other keyword arguments for parse.compile.
+        """
+        super().__init__(name, *args, **kwargs)
+        self.prefix = name.split('{', 1)[0].lower()
+        self._last_match = (None, None)
+
+    def is_matching(self, name):
+        """
+        Match a step name against the step format.
+
+        Parameters
+        ----------
+        name : str
+            The step name.
+
+        Returns
+        -------
+        bool
+            True if the step name matches the format.
+        """
+        if name[:len(self.prefix)].lower() != self.prefix:
+            return False
+
+        try:
+            result = self.parser.parse(name)
+        except ValueError:
+            return False
+
+        self._last_match = (name, result)
+        return result is not None
+
+    def parse_arguments(self, name):
+        """
+        Get the step arguments, reusing the result of the last match.
+
+        Parameters
+        ----------
+        name : str
+            The step name.
+
+        Returns
+        -------
+        dict
+            The step arguments.
+        """
+        (last_name, result) = self._last_match
+        return (result if name == last_name else self.parser.parse(name)).named
@@ -0,0 +1,239 @@
+"""
+Search text, or a stream of text a chunk at a time rather than holding all of it.
+
+Each chunk is searched together with the end of the chunks before it, so
+the outcome does not depend on where the stream is split:
+
+- Text is searched with an overlap of one character less than its length,
+  so it is always found.
+- Patterns are searched with an overlap of twice MAX_MATCH_LENGTH
+  characters, and a match is only accepted once the stream continues for
+  MAX_MATCH_LENGTH characters beyond it (or ends).
+  The flags of the pattern are not changed, so "^" and "$" (without the
+  MULTILINE flag) only match at the start and end of the whole stream, as
+  they do when all of the output is searched.  Only a match (including any
+  look-arounds) that is longer than MAX_MATCH_LENGTH may be missed.
+"""
+import codecs
+import os
+
+"""CHUNK_SIZE.
+
+The number of bytes to read from a stream at a time.
+"""
+CHUNK_SIZE = 65536
+
+"""EXCERPT_LENGTH.
+
+The maximum number of characters of text (or bytes of a file) to show in a
+failure message.  Can be configured with the TESTINFRA_BDD_EXCERPT_LENGTH environment
+variable.
+"""
+EXCERPT_LENGTH = int(os.environ.get('TESTINFRA_BDD_EXCERPT_LENGTH', '512'))
+
+"""MAX_MATCH_LENGTH.
+
+The length of the longest pattern match (including any look-arounds) that
+is always found in a stream.  Can be configured with the
+TESTINFRA_BDD_MAX_MATCH_LENGTH environment variable.
+"""
+MAX_MATCH_LENGTH = int(os.environ.get('TESTINFRA_BDD_MAX_MATCH_LENGTH', '4096'))
+
+"""TAIL_LENGTH.
+
+The number of characters at the end of a stream to keep for failure
+messages.  Can be configured with the TESTINFRA_BDD_COMMAND_TAIL_LENGTH
+environment variable.
+"""
+TAIL_LENGTH = int(os.environ.get('TESTINFRA_BDD_COMMAND_TAIL_LENGTH', '512'))
+
+
+def get_excerpt(content, size=None):
+    """
+    Get the start of the content of a file, truncated for use in a message.
+
+    Parameters
+    ----------
+    content : str
+        The content (or the start of the content) of the file.
+    size : int, optional
+        The full size of the file.  Defaults to the length of the content.
+
+    Returns
+    -------
+    str
+        The excerpt (e.g. '"foo" (the first 3 of 1024 characters)').
+    """
+    size = len(content) if size is None else size
+
+    if size <= EXCERPT_LENGTH:
+        return f'"{content}"'
+
+    return f'"{content[:EXCERPT_LENGTH]}" (the first {EXCERPT_LENGTH} of {size} characters)'
+
+
+def get_tail_excerpt(tail, length):
+    """
+    Get the end of a stream, truncated for use in a message.
+
+    Parameters
+    ----------
+    tail : str
+        The end of the stream (up to TAIL_LENGTH characters).
+    length : int
+        The number of characters in the whole stream.
+
+    Returns
+    -------
+    str
+        The excerpt (e.g. '"foo" (the last 3 of 1024 characters)').
+    """
+    if length <= len(tail):
+        return f'"{tail}"'
+
+    return f'"{tail}" (the last {len(tail)} of {length} characters)'
+
+
+def read_text(stream, encoding, tail):
+    """
+    Read and decode a stream a chunk at a time, keeping the end of it.
+
+    Parameters
+    ----------
+    stream : io.BufferedIOBase
+        The stream.
+    encoding : str
+        The encoding of the stream.
+    tail : dict
+        Updated with the end ("text") and the number of characters
+        ("length") of the stream that has been read.
+
+    Yields
+    ------
+    str
+        The text of each chunk.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+        text = decoder.decode(chunk)
+        tail['text'] = (tail['text'] + text[-TAIL_LENGTH:])[-TAIL_LENGTH:]
+        tail['length'] += len(text)
+        yield text
+
+    yield decoder.decode(b'', final=True)
+
+
+def search_pattern(texts, pattern):
+    """
+    Search the chunks of a stream for a compiled pattern.
+
+    Parameters
+    ----------
+    texts : iterable
+        The text of each chunk.
+    pattern : re.Pattern
+        The pattern.
+
+    Returns
+    -------
+    bool
+        True if the stream matches the pattern.
+    """
+    # Once the start of the stream is dropped, the search starts after the first character of the window.
+    (window, start) = ('', 0)
+
+    for text in texts:
+        window += text
+        match = pattern.search(window, start)
+        overlap = len(window) - 2 * MAX_MATCH_LENGTH
+
+        if match is not None and match.end() <= overlap + MAX_MATCH_LENGTH:
+            return True
+        elif overlap > start:
+            (window, start) = (window[overlap:], 1)
+
+    return pattern.search(window, start) is not None
+
+
+def search_stream(stream, encoding, needle):
+    """
+    Search a stream for a string or a compiled pattern.
+
+    Parameters
+    ----------
+    stream : io.BufferedIOBase
+        The stream, which is read from its current position.
+    encoding : str
+        The encoding of the stream.
+    needle : str or re.Pattern
+        The text or compiled pattern to search for.
+
+    Returns
+    -------
+    tuple
+        bool
+            True if the stream contains the needle.
+        str
+            The end of the stream that has been read (see get_tail_excerpt).
+    """
+    tail = {'text': '', 'length': 0}
+    texts = read_text(stream, encoding, tail)
+    found = search_substring(texts, needle) if isinstance(needle, str) else search_pattern(texts, needle)
+    return found, get_tail_excerpt(tail['text'], tail['length'])
+
+
+def search_substring(texts, needle):
+    """
+    Search the chunks of a stream for some text.
+
+    Parameters
+    ----------
+    texts : iterable
+        The text of each chunk.
+    needle : str
+        The text.
+
+    Returns
+    -------
+    bool
+        True if the stream contains the text.
+    """
+    overlap = ''
+
+    for text in texts:
+        window = overlap + text
+
+        if needle in window:
+            return True
+
+        overlap = window[max(0, len(window) - len(needle) + 1):]
+
+    return False
+
+
+def search_text(text, needle):
+    """
+    Search some text for a string or a compiled pattern.
+
+    Parameters
+    ----------
+    text : str
+        The text to be searched.
+    needle : str or re.Pattern
+        The text or compiled pattern to search for.
+
+    Returns
+    -------
+    tuple
+        bool
+            True if the text contains the needle.
+        str
+            A bounded excerpt of the text (see get_excerpt).
+    """
+    if isinstance(needle, str):
+        found = needle in text
+    else:
+        found = needle.search(text) is not None
+
+    return found, get_excerpt(text)
@@ -1,8 +1,14 @@
 """Then user fixtures for testinfra-bdd."""
-from pytest_bdd import parsers, then, when
+from pytest_bdd import then, when
+
+from testinfra_bdd import parsers
+from testinfra_bdd.account_database import (get_group_membership,
+                                            get_user_properties)
+from testinfra_bdd.fleet import for_each_host
 
 
 @when(parsers.parse('the TestInfra user is {username}'))
+@for_each_host
 def the_user_is(username: str, testinfra_bdd_host):
     """
     Check the status of a user.
@@ -18,10 +24,14 @@ def the_user_is(username: str, testinfra_bdd_host):
 
 
 @then(parsers.parse('the TestInfra user {property_name} is {expected_value}'))
+@for_each_host
 def the_user_property_is(property_name, expected_value, testinfra_bdd_host):
     """
     Check the property of a user.
 
+    The properties are looked up in a snapshot of the user and group
+    databases of the host.
+
     Parameters
     ----------
     property_name : str
@@ -38,23 +48,7 @@ def the_user_property_is(property_name, expected_value, testinfra_bdd_host):
     """
     user = testinfra_bdd_host.user
     assert user, 'User not set.  Have you missed a "When user is" step?'
-
-    if testinfra_bdd_host.user.exists:
-        actual_state = 'present'
-        properties = {
-            'gid': str(user.gid),
-            'group': user.group,
-            'home': user.home,
-            'shell': user.shell,
-            'state': actual_state,
-            'uid': str(user.uid)
-        }
-    else:
-        actual_state = 'absent'
-        properties = {
-            'state': actual_state
-        }
-
+    properties = get_user_properties(testinfra_bdd_host.host, user.name)
     assert property_name in properties, f'Unknown user property "{property_name}".'
     actual_value = properties[property_name]
     message = f'Expected {property_name} for user {user.name} to be "{expected_value}" '
@@ -63,6 +57,7 @@ def the_user_property_is(property_name, expected_value, testinfra_bdd_host):
 
 
 @then(parsers.parse('the TestInfra user is {expected_state}'))
+@for_each_host
 def check_the_user_state(expected_state, testinfra_bdd_host):
     """
     Check that the actual state of a user matches the expected state.
@@ -78,6 +73,7 @@ def check_the_user_state(expected_state, testinfra_bdd_host):
 
 
 @then(parsers.parse('the TestInfra user groups include "{expected_group}"'))
+@for_each_host
 def check_the_user_included_groups(expected_group: str, testinfra_bdd_host: object):
     """
     Check that the user is a member of the specified group.
@@ -96,8 +92,8 @@ def check_the_user_included_groups(expected_group: str, testinfra_bdd_host: obje
     """
     user = testinfra_bdd_host.user
     assert user, 'User not set.  Have you missed a "When user is" step?'
-    group = testinfra_bdd_host.host.group(expected_group)
+    (state, is_member) = get_group_membership(testinfra_bdd_host.host, expected_group, user.name)
     message = f'Expected group "{expected_group}" to exist.'
-    assert group.exists, message
-    message = f'Expected user "{user}" to be a member of group "{group.name}".'
-    assert user.name in group.members, message
+    assert state == 'present', message
+    message = f'Expected user "{user}" to be a member of group "{expected_group}".'
+    assert is_member, message
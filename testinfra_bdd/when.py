@@ -2,11 +2,15 @@
 import os
 
 import pytest
-from pytest_bdd import parsers, when
+from pytest_bdd import when
+
+from testinfra_bdd import parsers
+from testinfra_bdd.fleet import for_each_host
 
 
 @when(parsers.parse('the TestInfra system property {property_name} is not "{expected_value}" skip tests'))
 @when(parsers.parse('the TestInfra system property {property_name} is not {expected_value} skip tests'))
+@for_each_host
 def skip_tests_if_system_info_does_not_match(property_name, expected_value, testinfra_bdd_host):
     """
     Skip tests if a system property does not patch the expected value.
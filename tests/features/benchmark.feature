@@ -0,0 +1,98 @@
+@benchmark
+Feature: Benchmark of Testinfra BDD
+  Measure the throughput of the steps of every step module against the
+  local host, standing in for a remote host with an injected latency.
+
+  The expectations only depend on resources that every Linux host has, so
+  the benchmark can run without the docker-compose SUT.
+
+  Scenario: Benchmark Host Properties
+    Given the TestInfra benchmark host is ready
+    When the TestInfra system property type is not linux skip tests
+
+  Scenario Outline: Benchmark Absent Resources
+    Given the TestInfra benchmark host is ready
+    When the TestInfra <resource_type> is "testinfra-bdd-benchmark-foo"
+    Then the TestInfra <resource_type> is absent
+    Examples:
+      | resource_type |
+      | user          |
+      | group         |
+      | package       |
+      | file          |
+      | pip package   |
+
+  Scenario: Benchmark User and Group Checks
+    Given the TestInfra benchmark host is ready
+    When the TestInfra user is "root"
+    And the TestInfra group is "root"
+    Then the TestInfra user is present
+    And the TestInfra user uid is 0
+    And the TestInfra user gid is 0
+    And the TestInfra user home is /root
+    And the TestInfra group is present
+    And the TestInfra group gid is 0
+
+  Scenario: Benchmark File Checks
+    Given the TestInfra benchmark host is ready
+    When the TestInfra file is /etc/passwd
+    Then the TestInfra file is present
+    And the TestInfra file type is file
+    And the TestInfra file owner is root
+    And the TestInfra file contents contains "root:"
+    And the TestInfra file contents contains the regex "^root:.*:0:0:"
+    And the TestInfra files are
+      | path                             | state   | type      | owner |
+      | /etc/passwd                      | present | file      | root  |
+      | /etc                             | present | directory | root  |
+      | /etc/testinfra-bdd-benchmark.foo | absent  |           |       |
+
+  Scenario: Benchmark Commands
+    Given the TestInfra benchmark host is ready
+    When the TestInfra command is "echo steps"
+    Then the TestInfra command return code is 0
+    And the TestInfra command "echo" exists in path
+    And the TestInfra command stdout contains "steps"
+    And the TestInfra command stdout does not contain "foo"
+    And the TestInfra command stderr is empty
+    And the TestInfra commands are
+      | command         | rc | stdout contains | stderr regex |
+      | echo foo        | 0  | foo             |              |
+      | ls /etc/foo.bar | 2  |                 | No such file |
+
+  Scenario: Benchmark Streamed and Cached Commands
+    Given the TestInfra benchmark host is ready
+    When the TestInfra streamed command is "seq 1 10000"
+    Then the TestInfra command stdout contains the regex "(?m)^5000$"
+    And the TestInfra command return code is 0
+    When the TestInfra cached command is "uname -s"
+    Then the TestInfra command stdout contains "Linux"
+    When the TestInfra command cache is cleared
+
+  Scenario: Benchmark Process Checks
+    Given the TestInfra benchmark host is ready
+    When the TestInfra process filter is "pid=1"
+    Then the TestInfra process count is 1
+    And the TestInfra process counts are
+      | specification                     | count |
+      | pid=1                             | 1     |
+      | comm=testinfra-bdd-benchmark-foo  | 0     |
+
+  Scenario: Benchmark Service Checks
+    Given the TestInfra benchmark host is ready
+    When the TestInfra service is testinfra-bdd-benchmark-foo
+    Then the TestInfra service is not running
+    And the TestInfra service is not enabled
+    And the TestInfra services are
+      | service                     | running     | enabled     |
+      | testinfra-bdd-benchmark-foo | not running | not enabled |
+
+  Scenario: Benchmark Socket and Address Checks
+    Given the TestInfra benchmark host is ready
+    When the TestInfra socket is tcp://127.0.0.1:1
+    Then the TestInfra socket is not listening
+    And the TestInfra sockets are
+      | url                | state         |
+      | tcp://127.0.0.1:1  | not listening |
+    When the TestInfra address is localhost
+    Then the TestInfra address is resolvable
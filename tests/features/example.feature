@@ -76,6 +76,18 @@ Feature: Example of Testinfra BDD
     Then the TestInfra file is present
     And the TestInfra file is executable
 
+  Scenario: File Inventory
+    # Check many files with a single remote command.  Each column other than
+    # path is a file property to check and empty cells are not checked.  All
+    # mismatches are reported together.
+    Given the TestInfra host with URL "docker://sut" is ready
+    Then the TestInfra files are
+      | path           | state   | type      | mode  | owner | group |
+      | /etc/ntp.conf  | present | file      | 0o544 | ntp   | ntp   |
+      | /bin/ls        | present | file      | 0o755 | root  | root  |
+      | /etc           | present | directory |       |       |       |
+      | /etc/foo.conf  | absent  |           |       |       |       |
+
   Scenario: Group Checks
     Given the TestInfra host with URL "docker://sut" is ready
     When the TestInfra group is "ntp"
@@ -100,6 +112,27 @@ Feature: Example of Testinfra BDD
     And the TestInfra command stdout contains "remote"
     And the TestInfra command stdout does not contain "foo"
 
+  Scenario: Command Batch
+    # Run many commands with a single remote command.  Each column other than
+    # command is a check and empty cells are not checked.  All mismatches are
+    # reported together.
+    Given the TestInfra host with URL "docker://sut" is ready
+    Then the TestInfra commands are
+      | command                  | rc | stdout contains | stderr regex |
+      | ntpq -np                 | 0  | remote          |              |
+      | cat /etc/passwd \| wc -l | 0  |                 |              |
+      | ls /etc/foo.conf         | 2  |                 | No such file |
+
+  Scenario: Streaming Commands
+    Given the TestInfra host with URL "docker://sut" is ready
+    # The command is run once and its output is not held in memory.
+    When the TestInfra streamed command is "find / -xdev"
+    Then the TestInfra command stdout contains "/etc/ntp.conf"
+    And the TestInfra command stdout contains the regex "(?m)^/usr/bin/ntpq$"
+    And the TestInfra command stdout does not contain "/etc/nosuchfile.conf"
+    And the TestInfra command stderr is empty
+    And the TestInfra command return code is 0
+
   Scenario: System Package
     Given the TestInfra host with URL "docker://sut" is ready
     When the TestInfra package is ntp
@@ -127,12 +160,26 @@ Feature: Example of Testinfra BDD
       | ntp     | running       | enabled       |
       | named   | not running   | not enabled   |
 
+  Scenario: Check Many Services
+    # The state of all of the services is listed once and every row is
+    # checked against it.  Empty cells are not checked.
+    Given the TestInfra host with URL "docker://sut" is ready
+    Then the TestInfra services are
+      | service | running     | enabled     |
+      | ntp     | running     | enabled     |
+      | named   | not running | not enabled |
+
   Scenario: Test Running Processes
     Given the TestInfra host with URL "docker://sut" is ready
     # Processes are selected using filter() attributes names are
     # described in the ps man page.
     When the TestInfra process filter is "user=root,comm=ntpd"
     Then the TestInfra process count is 1
+    # Check many process specifications at once.
+    And the TestInfra process counts are
+      | specification       | count |
+      | user=root,comm=ntpd | 1     |
+      | comm=named          | 0     |
 
   Scenario Outline: Test Pip Packages are Latest Versions
     Given the TestInfra host with URL "docker://sut" is ready
@@ -156,6 +203,14 @@ Feature: Example of Testinfra BDD
       | udp://123 | listening      |
       | tcp://22  | not listening  |
 
+  Scenario: Check Many Sockets
+    # The listening sockets are listed once and every row is checked against them.
+    Given the TestInfra host with URL "docker://sut" is ready
+    Then the TestInfra sockets are
+      | url       | state         |
+      | udp://123 | listening     |
+      | tcp://22  | not listening |
+
   Scenario: Skip Tests Due to Environment Variable
     Given the TestInfra host with URL "docker://java11" is ready
     When the TestInfra environment variable PYTHONPATH is .:.. skip tests
@@ -175,6 +230,15 @@ Feature: Example of Testinfra BDD
     And the TestInfra address is reachable
     And the TestInfra port is reachable
 
+  Scenario: Sweep Addresses and Ports
+    # All of the ports are probed from the host at the same time.
+    Given the TestInfra host with URL "docker://sut" is ready within 10 seconds
+    When the TestInfra environment variable GITHUB_ACTIONS is true skip tests
+    Then the TestInfra addresses and ports are
+      | url                | state       |
+      | www.google.com:443 | reachable   |
+      | localhost:22       | unreachable |
+
   Scenario: Check Java is Installed in the Path
     Given the TestInfra host with URL "docker://java11" is ready within 10 seconds
     Then the TestInfra command "java" exists in path
@@ -189,6 +253,13 @@ Feature: Example of Testinfra BDD
     And the TestInfra command return code is 0
     And the TestInfra package is installed
 
+  Scenario: Check a Fleet of Hosts
+    # Each When and Then step is run against all of the hosts concurrently.
+    Given the TestInfra hosts matching "docker://[sut,java11]" are ready within 10 seconds
+    When the TestInfra file is /etc/passwd
+    Then the TestInfra file is present
+    And the TestInfra file owner is root
+
   Scenario: Check for an Expected Value
    # In this example we set the expected_value to "foo"
    Given the TestInfra host with URL "docker://sut" is ready
@@ -207,3 +278,11 @@ Feature: Example of Testinfra BDD
       | age           | 27             |
       | address.state | NY             |
       | spouse        | None           |
+
+  Scenario: Check Many Expressions Against a JSON File
+    Given the TestInfra host with URL "docker://sut" is ready
+    When the TestInfra file is /tmp/john-smith.json
+    Then the TestInfra JMESPath expressions return
+      | expression    | expected_value |
+      | firstName     | John           |
+      | address.state | NY             |
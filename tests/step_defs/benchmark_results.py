@@ -0,0 +1,162 @@
+"""
+Summarise the measurements of the benchmark scenarios (see conftest).
+
+Tracing the memory slows every step down, so the peak memory is measured in
+a separate pass (see BENCHMARK_MODE) from the steps per second.
+"""
+import os
+import statistics
+import timeit
+import tracemalloc
+
+import pytest_bdd.parsers
+
+from testinfra_bdd import parsers
+
+"""BENCHMARK_MODE.
+
+What the benchmark pass measures.  Either "speed" (the steps per second
+and the step parser speedup) or "memory" (the peak memory of each scenario,
+traced with tracemalloc).  The backend calls per step are measured in both.
+Can be configured with the TESTINFRA_BDD_BENCHMARK_MODE environment
+variable (default speed).
+"""
+BENCHMARK_MODE = os.environ.get('TESTINFRA_BDD_BENCHMARK_MODE', 'speed')
+
+"""BENCHMARK_THRESHOLDS.
+
+The name, direction (1 for a maximum and -1 for a minimum) and threshold of
+each measurement.  Each threshold can be configured with an environment
+variable (e.g. TESTINFRA_BDD_BENCHMARK_MIN_STEPS_PER_SECOND).
+"""
+BENCHMARK_THRESHOLDS = {
+    'steps_per_second': (-1, float(os.environ.get('TESTINFRA_BDD_BENCHMARK_MIN_STEPS_PER_SECOND', '10'))),
+    'calls_per_step': (1, float(os.environ.get('TESTINFRA_BDD_BENCHMARK_MAX_CALLS_PER_STEP', '1'))),
+    'max_scenario_kib': (1, float(os.environ.get('TESTINFRA_BDD_BENCHMARK_MAX_SCENARIO_KIB', '4096'))),
+    'parser_speedup': (-1, float(os.environ.get('TESTINFRA_BDD_BENCHMARK_MIN_PARSER_SPEEDUP', '1')))
+}
+
+"""BENCHMARK_TOTALS.
+
+The totals of the measurements of the benchmark scenarios that have been
+run.
+"""
+BENCHMARK_TOTALS = {'scenarios': 0, 'steps': 0, 'seconds': 0.0, 'calls': 0, 'peak_memory': 0, 'parser_speedup': 0.0}
+
+
+def add_scenario_totals(steps):
+    """
+    Add the measurements of a benchmark scenario to the totals.
+
+    Parameters
+    ----------
+    steps : list
+        The records of the steps of the scenario in BACKEND_CALLS.
+    """
+    BENCHMARK_TOTALS['scenarios'] += 1
+    BENCHMARK_TOTALS['steps'] += len(steps)
+    BENCHMARK_TOTALS['seconds'] += sum(step['seconds'] for step in steps)
+    BENCHMARK_TOTALS['calls'] += sum(step['calls'] for step in steps)
+
+    if tracemalloc.is_tracing():
+        BENCHMARK_TOTALS['peak_memory'] = max(BENCHMARK_TOTALS['peak_memory'], tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+
+def get_benchmark_results():
+    """
+    Summarise the measurements of the benchmark scenarios.
+
+    Returns
+    -------
+    dict
+        The backend calls per step and either the steps per second and step
+        parser speedup (see get_parser_speedup) or, in the memory pass, the
+        maximum peak memory of a scenario (in KiB).  Empty if no benchmark
+        steps were run.
+    """
+    if not BENCHMARK_TOTALS['steps']:
+        return {}
+    elif BENCHMARK_MODE == 'memory':
+        return {
+            'calls_per_step': BENCHMARK_TOTALS['calls'] / BENCHMARK_TOTALS['steps'],
+            'max_scenario_kib': BENCHMARK_TOTALS['peak_memory'] / 1024
+        }
+
+    return {
+        'steps_per_second': BENCHMARK_TOTALS['steps'] / BENCHMARK_TOTALS['seconds'],
+        'calls_per_step': BENCHMARK_TOTALS['calls'] / BENCHMARK_TOTALS['steps'],
+        'parser_speedup': BENCHMARK_TOTALS['parser_speedup']
+    }
+
+
+def time_step_parser(parser_class):
+    """
+    Time matching steps against many step definitions with a step parser.
+
+    Parameters
+    ----------
+    parser_class : type
+        The step parser (e.g. pytest_bdd.parsers.parse).
+
+    Returns
+    -------
+    float
+        The fastest of several timings, in seconds.
+    """
+    names = ['the TestInfra user is "ntp"', 'the TestInfra resource 7 is present', 'the file is absent']
+    step_parsers = [parser_class(f'the TestInfra resource {index} is {{state}}') for index in range(50)]
+    return min(timeit.repeat(
+        lambda: [step_parser.is_matching(name) for name in names for step_parser in step_parsers],
+        number=20,
+        repeat=3
+    ))
+
+
+def get_parser_speedup(rounds=9):
+    """
+    Compare the speed of the step parser with the pytest-bdd parse step parser.
+
+    Both parsers are timed in each round, so that both are equally affected
+    by any other load on the machine (e.g. concurrent checks), and the
+    median of the rounds is taken so that a few slow rounds don't count.
+
+    Parameters
+    ----------
+    rounds : int, optional
+        The number of times to time each parser.
+
+    Returns
+    -------
+    float
+        How many times faster testinfra_bdd.parsers.parse is than the
+        pytest-bdd parse step parser.
+    """
+    return statistics.median(
+        time_step_parser(pytest_bdd.parsers.parse) / time_step_parser(parsers.parse) for _ in range(rounds)
+    )
+
+
+def get_regressions(results):
+    """
+    Compare the benchmark results against their thresholds.
+
+    Parameters
+    ----------
+    results : dict
+        The benchmark results (see get_benchmark_results).
+
+    Returns
+    -------
+    list
+        A message for each result that is past its threshold.
+    """
+    regressions = []
+
+    for (name, value) in results.items():
+        (direction, threshold) = BENCHMARK_THRESHOLDS[name]
+
+        if (value - threshold) * direction > 0:
+            regressions.append(f'The benchmark {name} of {value:.2f} is past the threshold of {threshold:.2f}.')
+
+    return regressions
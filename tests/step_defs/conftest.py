@@ -0,0 +1,163 @@
+"""
+Measure the throughput of the benchmark feature.
+
+The scenarios of features that are tagged with @benchmark are run against
+the local host through a backend that injects a latency before each command
+(standing in for the local and docker backends of a remote host).  The steps
+per second, the backend calls per step and the peak memory per scenario are
+shown in the terminal summary and the session fails if any of them regress
+past their threshold (see benchmark_results).
+"""
+import os
+import time
+import tracemalloc
+
+import pytest
+import testinfra.backend.local
+import testinfra.host
+from benchmark_results import (BENCHMARK_MODE, BENCHMARK_TOTALS,
+                               add_scenario_totals, get_benchmark_results,
+                               get_parser_speedup, get_regressions)
+from pytest_bdd import given
+
+import testinfra_bdd
+from testinfra_bdd.async_engine import MAX_CONCURRENT_CHECKS, get_async_fixture
+from testinfra_bdd.instrumentation import BACKEND_CALLS
+
+"""BENCHMARK_LATENCY.
+
+The number of seconds that the benchmark backend waits before running each
+command.  Can be configured with the TESTINFRA_BDD_BENCHMARK_LATENCY
+environment variable.
+"""
+BENCHMARK_LATENCY = float(os.environ.get('TESTINFRA_BDD_BENCHMARK_LATENCY', '0'))
+
+"""FIRST_STEP.
+
+The key of the index of the first step of a benchmark scenario (in
+BACKEND_CALLS.steps) in the stash of its test item.
+"""
+FIRST_STEP = pytest.StashKey[int]()
+
+
+class LatencyBackend(testinfra.backend.local.LocalBackend):
+    """A local backend that waits before running each command, as if the host were remote."""
+
+    def __init__(self, latency, *args, **kwargs):
+        """
+        Create a LatencyBackend object.
+
+        Parameters
+        ----------
+        latency : float
+            The number of seconds to wait before running each command.
+        *args : tuple
+            Any other positional arguments for the local backend.
+        **kwargs : dict
+            Any other keyword arguments for the local backend.
+        """
+        super().__init__(*args, **kwargs)
+        self.latency = latency
+
+    def run(self, command, *args, **kwargs):
+        """
+        Wait for the latency and then run the command locally.
+
+        Parameters
+        ----------
+        command : str
+            The command.
+        *args : tuple
+            Arguments that are quoted into the command.
+        **kwargs : dict
+            Any other keyword arguments for the backend.
+
+        Returns
+        -------
+        testinfra.backend.base.CommandResult
+            The result of the command.
+        """
+        time.sleep(self.latency)
+        return super().run(command, *args, **kwargs)
+
+
+"""BENCHMARK_HOST.
+
+The host that the benchmark scenarios are run against.  Like a pooled host,
+it is shared by all of the scenarios.
+"""
+BENCHMARK_HOST = testinfra.host.Host(LatencyBackend(BENCHMARK_LATENCY))
+
+
+@given('the TestInfra benchmark host is ready', target_fixture='testinfra_bdd_host')
+def the_benchmark_host_is_ready():
+    """
+    The benchmark host is ready.
+
+    Like testinfra_bdd.get_host_fixture, each scenario gets a new fixture
+    bound to the shared host (which runs consecutive Then steps concurrently
+    if TESTINFRA_BDD_MAX_CONCURRENT_CHECKS is set).
+    """
+    host = testinfra_bdd.TestinfraBDD('local://', BENCHMARK_HOST)
+    assert host.is_host_ready(), 'The benchmark host is not ready.'
+    return get_async_fixture(host) if MAX_CONCURRENT_CHECKS else host
+
+
+def is_benchmark(feature, scenario):
+    """
+    Check if a scenario is part of the benchmark.
+
+    Parameters
+    ----------
+    feature : pytest_bdd.parser.Feature
+        The feature.
+    scenario : pytest_bdd.parser.ScenarioTemplate
+        The scenario.
+
+    Returns
+    -------
+    bool
+        True if the feature or the scenario is tagged with @benchmark.
+    """
+    return 'benchmark' in feature.tags | scenario.tags
+
+
+def pytest_bdd_before_scenario(request, feature, scenario):
+    """Start measuring a benchmark scenario (tracing its memory in the memory pass)."""
+    if is_benchmark(feature, scenario):
+        if BENCHMARK_MODE == 'memory':
+            tracemalloc.start()
+
+        request.node.stash[FIRST_STEP] = len(BACKEND_CALLS.steps)
+
+
+def pytest_bdd_after_scenario(request, feature, scenario):
+    """Add the steps (and the peak memory) of a benchmark scenario to the totals."""
+    if is_benchmark(feature, scenario) and FIRST_STEP in request.node.stash:
+        add_scenario_totals(BACKEND_CALLS.steps[request.node.stash[FIRST_STEP]:])
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Time the step parsers and fail the session if the benchmark has regressed."""
+    if BENCHMARK_TOTALS['steps'] and BENCHMARK_MODE != 'memory':
+        BENCHMARK_TOTALS['parser_speedup'] = get_parser_speedup()
+
+    if get_regressions(get_benchmark_results()) and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Show the benchmark results and any regressions."""
+    results = get_benchmark_results()
+
+    if results:
+        terminalreporter.write_sep('=', 'testinfra-bdd benchmark')
+        terminalreporter.write_line(
+            f'{BENCHMARK_TOTALS["scenarios"]} scenarios ({BENCHMARK_MODE}) with a latency of {BENCHMARK_LATENCY}s'
+        )
+
+        for (name, value) in results.items():
+            terminalreporter.write_line(f'  {name}: {value:.2f}')
+
+        for regression in get_regressions(results):
+            terminalreporter.write_line(regression, red=True)
@@ -0,0 +1,8 @@
+"""Benchmark the Testinfra BDD steps (see conftest.py)."""
+from pytest_bdd import scenarios
+
+import testinfra_bdd
+
+scenarios('../features/benchmark.feature')
+
+pytest_plugins = testinfra_bdd.PYTEST_MODULES
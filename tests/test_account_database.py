@@ -0,0 +1,71 @@
+"""Test looking users and groups up in a snapshot of the account databases."""
+import types
+
+import pytest
+
+from testinfra_bdd.account_database import get_group_membership
+from testinfra_bdd.account_helpers import AccountDatabase
+
+PASSWD = '''root:x:0:0:root:/root:/bin/bash
+ntp:x:101:101::/nonexistent:/usr/sbin/nologin
+bar:x:1000:1000:,,,:/home/bar:/bin/bash
+'''
+
+GROUP = '''root:x:0:
+sudo:x:27:bar
+ntp:x:101:
+adm:x:4:bar,ntp
+sudo:x:1001:ntp
+'''
+
+
+def test_account_database():
+    """Test that the properties of a user are looked up in the database."""
+    database = AccountDatabase(PASSWD, GROUP)
+    assert database.get_user_properties('ntp') == {
+        'gid': '101',
+        'group': 'ntp',
+        'home': '/nonexistent',
+        'shell': '/usr/sbin/nologin',
+        'state': 'present',
+        'uid': '101'
+    }
+    assert database.get_user_properties('bar')['group'] == '1000'
+    assert database.get_user_properties('foo') is None
+
+
+def test_account_database_indexes():
+    """Test that the users and groups are indexed by name and ID."""
+    database = AccountDatabase(PASSWD, GROUP)
+    assert database.groups['sudo']['members'] == ['bar']
+    assert database.groups_by_gid['0']['name'] == 'root'
+    assert database.users_by_uid['1000']['home'] == '/home/bar'
+
+
+class FakeHost:
+    """A host with the canned account databases and a user that was created after them."""
+
+    def group(self, name):
+        """Return a group that has the new user as a member."""
+        return types.SimpleNamespace(exists=True, gid=27, members=['bar', 'new'])
+
+    def run(self, command):
+        """Return the canned output of getent."""
+        return types.SimpleNamespace(rc=0, stdout={'getent passwd': PASSWD, 'getent group': GROUP}[command])
+
+
+def test_account_database_membership_index():
+    """Test that the groups are indexed by member, ignoring duplicate groups."""
+    database = AccountDatabase(PASSWD, GROUP)
+    assert database.groups_by_member == {'bar': {'adm', 'sudo'}, 'ntp': {'adm'}}
+
+
+@pytest.mark.parametrize('group_name,user_name,expected', [
+    ('adm', 'ntp', ('present', True)),
+    ('sudo', 'ntp', ('present', False)),
+    ('root', 'root', ('present', False)),
+    ('sudo', 'new', ('present', True))
+])
+def test_group_membership(group_name, user_name, expected):
+    """Test that membership is looked up in the index unless the user is not in the snapshot."""
+    assert get_group_membership(FakeHost(), group_name, user_name) == expected
@@ -0,0 +1,14 @@
+"""Test probing many address and port pairs at once."""
+import testinfra
+
+from testinfra_bdd.address_sweep import get_sweep_mismatches, sweep_ports
+
+
+def test_sweep_ports():
+    """Test that each port is probed from the host."""
+    host = testinfra.get_host('docker://sut')
+    assert sweep_ports(host, ['localhost:22', 'localhost:23']) == [False, False]
+    rows = [{'url': 'localhost:22', 'state': 'reachable'}]
+    assert get_sweep_mismatches(host, rows) == [
+        'Expected address and port localhost:22 to be reachable but it is unreachable.'
+    ]
@@ -0,0 +1,152 @@
+"""Test running the independent Then steps of a scenario concurrently."""
+import time
+import types
+
+import pytest
+import testinfra
+from pytest_bdd.parser import Step
+
+from testinfra_bdd import async_backend, async_engine
+from testinfra_bdd.cassette_store import Cassette
+from testinfra_bdd.instrumentation import BACKEND_CALLS
+from testinfra_bdd.replay_backend import ReplayBackend
+
+pytest_plugins = ['pytester']
+
+FEATURE = '''Feature: Async Engine
+  Scenario: Users
+    Given the TestInfra async host is ready
+    When the TestInfra user is "root"
+    Then the TestInfra user is present
+    And the TestInfra user uid is 0
+    When the TestInfra user is "testinfra-bdd-foo"
+    Then the TestInfra user is absent
+
+  Scenario: Failures
+    Given the TestInfra async host is ready
+    When the TestInfra user is "root"
+    Then the TestInfra user uid is 1
+    And the TestInfra user home is /foo
+    And the TestInfra user is present
+'''
+
+TEST_MODULE = '''
+from pytest_bdd import given, scenarios
+
+import testinfra_bdd
+from testinfra_bdd.async_engine import TestinfraBDDAsync
+
+scenarios('async_engine.feature')
+
+pytest_plugins = testinfra_bdd.PYTEST_MODULES
+
+
+@given('the TestInfra async host is ready', target_fixture='testinfra_bdd_host')
+def the_async_host_is_ready():
+    return TestinfraBDDAsync('local://', max_concurrent_checks=4)
+'''
+
+
+def get_steps(*names):
+    """Get Then steps and a scenario that ends with them."""
+    steps = [Step(name, 'then', 4, 1, 'Then') for name in names]
+    return steps, types.SimpleNamespace(steps=steps)
+
+
+def fail(testinfra_bdd_host):
+    """Run a command on the host and then fail."""
+    testinfra_bdd_host.host.run('true')
+    pytest.fail('Oops.')
+
+
+def run_recorded_steps(fixture, scenario, step_functions):
+    """Run the steps of a scenario as pytest-bdd would, recording their backend calls."""
+    for (step, step_function) in zip(scenario.steps, step_functions):
+        BACKEND_CALLS.start_step('Feature', 'Scenario', f'{step.keyword} {step.name}')
+
+        try:
+            fixture.start_step(step, scenario)
+            fixture.run_step(step_function, {'testinfra_bdd_host': fixture})
+        except AssertionError:
+            BACKEND_CALLS.finish_step(failed=True)
+            raise
+
+        BACKEND_CALLS.finish_step()
+
+
+def sleep(testinfra_bdd_host):
+    """Sleep on the host for a fifth of a second."""
+    testinfra_bdd_host.host.run('sleep 0.2')
+
+
+def test_async_host():
+    """Test that the commands of an asynchronous host are run with asyncio.subprocess."""
+    host = testinfra.get_host('local://')
+    async_host = async_backend.get_async_host(host)
+    assert async_host is not host
+    assert async_backend.get_async_host(host) is async_host
+    result = async_host.run('echo %s; echo bar >&2; exit 3', 'foo')
+    assert (result.rc, result.stdout, result.stderr) == (3, 'foo\n', 'bar\n')
+
+
+def test_hosts_without_local_processes_are_unchanged(tmp_path):
+    """Test that a host whose backend doesn't run local processes is not changed."""
+    host = testinfra.host.Host(ReplayBackend('local://', Cassette(str(tmp_path / 'cassette.json.gz'), True)))
+    assert async_backend.get_async_host(host) is host
+
+
+def test_then_steps_are_run_concurrently():
+    """Test that consecutive Then steps are run concurrently with the last step."""
+    fixture = async_engine.TestinfraBDDAsync('local://', max_concurrent_checks=4)
+    (steps, scenario) = get_steps('one', 'two', 'three', 'four')
+    started = time.monotonic()
+
+    for step in steps:
+        fixture.start_step(step, scenario)
+        fixture.run_step(sleep, {'testinfra_bdd_host': fixture})
+
+    assert time.monotonic() - started < 0.6
+    assert not fixture.pending_steps
+
+
+def test_deferred_failures_are_reported_together():
+    """Test that the failures of the deferred steps are reported before the next When step."""
+    fixture = async_engine.TestinfraBDDAsync('local://')
+    (steps, scenario) = get_steps('one', 'two', 'three')
+
+    for step in steps[:2]:
+        fixture.start_step(step, scenario)
+        fixture.run_step(lambda: pytest.fail('Oops.'), {})
+
+    with pytest.raises(AssertionError, match=r'failed:\nThen "one": Failed: Oops.\nThen "two": Failed: Oops.$'):
+        fixture.start_step(Step('When', 'when', 4, 1, 'When'), scenario)
+
+
+def test_deferred_calls_are_attributed_to_their_steps():
+    """Test that the backend calls, time and failures of the deferred steps are recorded against them."""
+    fixture = async_engine.TestinfraBDDAsync('local://', max_concurrent_checks=4)
+    (_, scenario) = get_steps('one', 'two')
+    scenario.steps.append(Step('three', 'when', 4, 1, 'When'))
+    recorded = len(BACKEND_CALLS.steps)
+
+    with pytest.raises(AssertionError, match='Then "one": Failed: Oops.'):
+        run_recorded_steps(fixture, scenario, (fail, sleep, sleep))
+
+    steps = BACKEND_CALLS.steps[recorded:]
+    assert [(step['step'], step['calls'], step['failed']) for step in steps] == [
+        ('Then one', 1, True),
+        ('Then two', 1, True)
+    ]
+    assert steps[1]['seconds'] >= 0.2
+
+
+def test_scenarios(pytester):
+    """Test the deferred steps of scenarios."""
+    pytester.makefile('.feature', async_engine=FEATURE)
+    pytester.makepyfile(test_async_feature=TEST_MODULE)
+    result = pytester.runpytest_inprocess('-p', 'no:cacheprovider')
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines([
+        '*Then "the TestInfra user uid is 1": AssertionError: *',
+        '*Then "the TestInfra user home is /foo": AssertionError: *'
+    ])
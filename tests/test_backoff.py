@@ -0,0 +1,29 @@
+"""Test polling with a jittered exponential backoff."""
+import itertools
+import time
+
+from testinfra_bdd.backoff import backoff_delays, wait_until
+
+
+def test_backoff_delays_grow_to_the_maximum():
+    """Test that the delays double until they reach the maximum."""
+    delays = list(itertools.islice(backoff_delays(0.1, 0.4), 5))
+    intervals = [0.1, 0.2, 0.4, 0.4, 0.4]
+
+    for delay, interval in zip(delays, intervals):
+        assert interval / 2 <= delay <= interval
+
+
+def test_wait_until_returns_as_soon_as_the_predicate_is_true():
+    """Test that a predicate that becomes true quickly does not wait for a full second."""
+    deadline = time.monotonic() + 0.1
+    start = time.monotonic()
+    assert wait_until(lambda: time.monotonic() >= deadline, 10)
+    assert time.monotonic() - start < 0.5
+
+
+def test_wait_until_times_out():
+    """Test that a predicate that is never true returns False after the timeout."""
+    start = time.monotonic()
+    assert not wait_until(lambda: False, 0.2)
+    assert 0.2 <= time.monotonic() - start < 0.5
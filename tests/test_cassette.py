@@ -0,0 +1,127 @@
+"""Test recording the commands run on hosts and replaying them without the hosts."""
+import types
+
+import pytest
+import testinfra
+
+import testinfra_bdd.cassette
+from testinfra_bdd.call_recorder import BackendCallRecorder
+from testinfra_bdd.cassette import get_cassette, get_host
+from testinfra_bdd.cassette_store import Cassette
+from testinfra_bdd.command_stream import StreamedCommand
+from testinfra_bdd.instrumentation import InstrumentedHost
+
+
+def record_cassette(path):
+    """Record some commands run on the local host to a cassette."""
+    cassette = get_cassette(str(path), 'once')
+    assert cassette.is_recording
+    host = InstrumentedHost(get_host('local://', cassette), BackendCallRecorder(), 'local://', cassette)
+    host.run('echo %s', 'foo')
+    host.run('echo bar; exit 3')
+    assert host.file('/etc/passwd').exists
+    assert StreamedCommand(host, 'seq 1 3').search('stdout', '2')[0]
+    cassette.save()
+
+
+def test_cassette_is_replayed(tmp_path):
+    """Test that the recorded host is replayed once."""
+    path = tmp_path / 'cassette.json.gz'
+    record_cassette(path)
+    cassette = get_cassette(str(path), 'once')
+    assert not cassette.is_recording
+    host = get_host('local://', cassette)
+    assert host.backend.get_pytest_id() == 'local://'
+    assert get_host('local://', cassette) is host
+
+
+def test_commands_are_replayed(tmp_path):
+    """Test that the recorded commands are replayed without running them."""
+    path = tmp_path / 'cassette.json.gz'
+    record_cassette(path)
+    host = get_host('local://', get_cassette(str(path), 'replay'))
+    assert host.run('echo %s', 'foo').stdout == 'foo\n'
+    result = host.run('echo bar; exit 3')
+    assert (result.rc, result.stdout) == (3, 'bar\n')
+    assert host.file('/etc/passwd').exists
+    assert StreamedCommand(host, 'seq 1 3').search('stdout', '2')[0]
+
+
+def test_replayed_results_are_in_order(tmp_path):
+    """Test that the results of a command are played in order, repeating the last one."""
+    cassette = Cassette(str(tmp_path / 'cassette.json.gz'), True)
+    host = InstrumentedHost(testinfra.get_host('local://'), BackendCallRecorder(), 'local://', cassette)
+    host.run('echo 1')
+    host.run('echo 1 >&2; exit 1')
+    cassette.hosts['local://']['commands']['echo 1'].append([0, '2\n', ''])
+    cassette.save()
+    replayed_host = get_host('local://', Cassette(cassette.path, False))
+    assert [replayed_host.check_output('echo 1') for _ in range(3)] == ['1', '2', '2']
+    assert replayed_host.run('echo 1 >&2; exit 1').stderr == '1\n'
+
+
+def test_unrecorded_command(tmp_path):
+    """Test that an unrecorded command or host can't be replayed."""
+    path = tmp_path / 'cassette.json.gz'
+    record_cassette(path)
+    cassette = get_cassette(str(path), 'replay')
+
+    with pytest.raises(RuntimeError, match='The command "echo baz" was not recorded for local://'):
+        get_host('local://', cassette).run('echo baz')
+
+    with pytest.raises(RuntimeError, match='not recorded for docker://sut'):
+        get_host('docker://sut', cassette).run('echo %s', 'foo')
+
+
+def test_cassette_modes(tmp_path):
+    """Test the modes of the cassette."""
+    path = tmp_path / 'cassette.json.gz'
+    assert get_cassette('', 'replay') is None
+    assert get_cassette(str(path), 'record').is_recording
+
+    with pytest.raises(ValueError, match='Unknown cassette mode "rewind".'):
+        get_cassette(str(path), 'rewind')
+
+    with pytest.raises(FileNotFoundError):
+        get_cassette(str(path), 'replay')
+
+
+def record_on_worker(path, monkeypatch, hostspec, command, stdout):
+    """Record a command on a pytest-xdist worker, returning the worker node as seen by the controller."""
+    worker_cassette = Cassette(str(path), True)
+    worker_cassette.hosts = {hostspec: {'encoding': 'utf-8', 'commands': {command: [[0, stdout, '']]}}}
+    monkeypatch.setattr(testinfra_bdd.cassette, 'CASSETTE', worker_cassette)
+    config = types.SimpleNamespace(workeroutput={})
+    testinfra_bdd.cassette.pytest_sessionfinish(types.SimpleNamespace(config=config), 0)
+    return types.SimpleNamespace(workeroutput=config.workeroutput)
+
+
+def test_workers_send_their_commands_to_the_controller(tmp_path, monkeypatch):
+    """Test that the commands recorded by the pytest-xdist workers are merged into one cassette."""
+    path = tmp_path / 'cassette.json.gz'
+    workers = [
+        record_on_worker(path, monkeypatch, 'local://', 'echo 1', '1\n'),
+        record_on_worker(path, monkeypatch, 'docker://sut', 'echo 2', '2\n'),
+        record_on_worker(path, monkeypatch, 'local://', 'echo 1', '3\n')
+    ]
+    assert not path.exists()
+    monkeypatch.setattr(testinfra_bdd.cassette, 'CASSETTE', Cassette(str(path), True))
+
+    for worker in workers:
+        testinfra_bdd.cassette.pytest_testnodedown(worker, None)
+
+    testinfra_bdd.cassette.pytest_sessionfinish(types.SimpleNamespace(config=types.SimpleNamespace()), 0)
+    replayed = Cassette(str(path), False)
+    assert [replayed.play('local://', 'echo 1')[1] for _ in range(2)] == [b'1\n', b'3\n']
+    assert replayed.play('docker://sut', 'echo 2')[1] == b'2\n'
+
+
+def test_workers_need_the_controller_to_record(tmp_path, monkeypatch):
+    """Test that a pytest-xdist worker only records if the controller merges the recorded commands."""
+    monkeypatch.setattr(testinfra_bdd.cassette, 'CASSETTE', Cassette(str(tmp_path / 'cassette.json.gz'), True))
+    node = types.SimpleNamespace(workerinput={})
+    testinfra_bdd.cassette.pytest_configure_node(node)
+    testinfra_bdd.cassette.pytest_configure(types.SimpleNamespace(workerinput=node.workerinput))
+
+    with pytest.raises(pytest.UsageError, match='-p testinfra_bdd.cassette'):
+        testinfra_bdd.cassette.pytest_configure(types.SimpleNamespace(workerinput={'workerid': 'gw0'}))
@@ -0,0 +1,66 @@
+"""Test running many commands with a single remote command."""
+import types
+
+import pytest
+import testinfra
+
+from testinfra_bdd.command_batch import parse_batch_output, run_commands
+from testinfra_bdd.host_cache import HostCache
+
+
+class FakeHost:
+    """A host that answers the batch script with canned output and runs other commands locally."""
+
+    def __init__(self, rc, stdout):
+        """Create a FakeHost object."""
+        self.backend = testinfra.get_host('local://').backend
+        self.commands = []
+        self._result = types.SimpleNamespace(rc=rc, stdout_bytes=stdout)
+
+    def run(self, command, *args):
+        """Record the command and return the canned result for the batch script."""
+        self.commands.append(command)
+        return self._result if args else self.backend.run(command)
+
+
+def test_run_commands():
+    """Test that the result of each command is separated from the batch output."""
+    commands = ['echo foo', 'echo bar >&2; exit 3', 'printf "a\\n3 0 0\\n"', 'syntax error (']
+    results = run_commands(testinfra.get_host('docker://sut'), commands)
+    assert [(cmd.rc, cmd.stdout) for cmd in results[:3]] == [(0, 'foo\n'), (3, ''), (0, 'a\n3 0 0\n')]
+    assert results[1].stderr == 'bar\n'
+    assert results[3].rc == 2
+
+
+def test_unparsable_batch_output():
+    """Test that output that is not framed as expected is rejected."""
+    backend = testinfra.get_host('docker://sut').backend
+    assert parse_batch_output(backend, ['true'], b'0 0 0\n')[0].rc == 0
+    assert parse_batch_output(backend, ['true'], b'0 0 0\nfoo') is None
+    assert parse_batch_output(backend, ['true'], b'sh: mktemp: not found\n') is None
+
+
+def test_batch_that_never_started():
+    """Test that the commands are run separately if the batch script can't run."""
+    host = FakeHost(1, b'')
+    results = run_commands(host, ['echo foo', 'exit 3'])
+    assert [(cmd.rc, cmd.stdout) for cmd in results] == [(0, 'foo\n'), (3, '')]
+    assert host.commands[1:] == ['echo foo', 'exit 3']
+
+
+def test_batch_that_was_cut_short():
+    """Test that the commands are not run again once the batch has started."""
+    host = FakeHost(255, b'testinfra-bdd batch\n0 4 0\nfoo\n')
+
+    with pytest.raises(RuntimeError, match='Unable to parse the output of the batch'):
+        run_commands(host, ['echo foo', 'touch /tmp/bar'])
+
+    assert len(host.commands) == 1
+
+
+def test_batch_clears_the_host_snapshots():
+    """Test that the snapshots of the host are discarded as the commands may change it."""
+    (host, snapshots) = (FakeHost(0, b'testinfra-bdd batch\n0 0 0\n'), HostCache(ttl=60))
+    snapshot = snapshots.get((host, 'packages'), dict)
+    assert run_commands(host, ['true'])[0].rc == 0
+    assert snapshots.get((host, 'packages'), dict) is not snapshot
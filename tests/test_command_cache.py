@@ -0,0 +1,45 @@
+"""Test reusing the results of read-only commands."""
+import testinfra
+
+from testinfra_bdd.command_cache import CommandCache
+from testinfra_bdd.host_cache import HostCache
+
+
+def test_cacheable_commands():
+    """Test that only commands that fully match the pattern are cacheable."""
+    cache = CommandCache(pattern=r'date \+%N|uname -[rs]')
+    assert cache.is_cacheable('uname -r')
+    assert not cache.is_cacheable('uname -r; reboot')
+
+
+def test_cacheable_commands_are_run_once():
+    """Test that only cacheable commands are reused until the host is cleared."""
+    host = testinfra.get_host('local://')
+    cache = CommandCache(pattern=r'date \+%N|uname -[rs]')
+    first = cache.run(host, 'date +%N')
+    assert cache.run(host, 'date +%N') is first
+    assert cache.run(host, 'echo $RANDOM', cached=True) is cache.run(host, 'echo $RANDOM', cached=True)
+    assert cache.run(host, 'hostname') is not cache.run(host, 'hostname')
+    cache.clear(host)
+    assert cache.run(host, 'date +%N') is not first
+
+
+def test_other_commands_clear_the_host():
+    """Test that a command that may change the host discards its cached results."""
+    (host, other_host) = (testinfra.get_host('local://'), testinfra.get_host('docker://sut'))
+    cache = CommandCache(pattern=r'date \+%N')
+    first = cache.run(host, 'date +%N')
+    other = cache.get((other_host, 'date +%N'), lambda: first)
+    cache.run(host, 'true')
+    assert cache.run(host, 'date +%N') is not first
+    assert cache.get((other_host, 'date +%N'), lambda: None) is other
+
+
+def test_other_commands_clear_the_host_snapshots():
+    """Test that a command that may change the host discards every snapshot of the host."""
+    (host, snapshots, derived_hosts) = (testinfra.get_host('local://'), HostCache(ttl=60), HostCache(60, False))
+    snapshot = snapshots.get((host, 'packages'), lambda: {'bash': '5.1.8'})
+    derived_host = derived_hosts.get((host, 'async'), object)
+    CommandCache(pattern=r'uname -r').run(host, 'true')
+    assert snapshots.get((host, 'packages'), dict) is not snapshot
+    assert derived_hosts.get((host, 'async'), object) is derived_host
@@ -0,0 +1,85 @@
+"""Test checking the output of a command without holding all of it in memory."""
+import io
+import re
+
+import pytest
+import testinfra
+
+from testinfra_bdd import stream_search
+from testinfra_bdd.backend_helpers import get_local_command
+from testinfra_bdd.command_stream import StreamedCommand
+from testinfra_bdd.instrumentation import BACKEND_CALLS
+
+LINES = ''.join(f'{number}\n' for number in range(1, 1001))
+
+
+def test_get_local_command():
+    """Test that the local command of a backend is captured but not run."""
+    host = testinfra.get_host('docker://sut')
+    assert get_local_command(host.backend, 'ls /').startswith(b'docker exec sut /bin/sh -c ')
+
+
+def test_streamed_command():
+    """Test that a stream is searched after the command has been run."""
+    command = StreamedCommand(testinfra.get_host('docker://sut'), 'seq 1 100000')
+    assert command.search('stdout', '\n50000\n')[0]
+    assert command.search('stdout', re.compile('^99999$', re.MULTILINE))[0]
+
+
+def test_streamed_command_tail():
+    """Test that only the end of a stream is kept."""
+    command = StreamedCommand(testinfra.get_host('docker://sut'), 'seq 1 100000')
+    (found, tail) = command.search('stdout', 'foo')
+    assert not found
+    assert tail.endswith(f'100000\n" (the last {stream_search.TAIL_LENGTH} of 588895 characters)')
+    assert command.rc == 0
+
+
+def test_command_is_run_once(tmp_path):
+    """Test that the checks and the return code are all served from a single, recorded run."""
+    runs = tmp_path / 'runs'
+    calls = BACKEND_CALLS.unattributed['calls']
+    command = StreamedCommand(testinfra.get_host('local://'), f'echo run >> {runs}; seq 1 1000; exit 3')
+    assert command.search('stdout', '\n500\n')[0]
+    assert command.rc == 3
+    assert runs.read_text() == 'run\n'
+    assert BACKEND_CALLS.unattributed['calls'] == calls + 1
+
+
+def test_streams_are_searched_separately():
+    """Test that stdout and stderr are searched separately."""
+    command = StreamedCommand(testinfra.get_host('local://'), 'echo foo; echo bar >&2')
+    assert not command.search('stdout', 'bar')[0]
+    assert command.search('stderr', re.compile('^bar$'))[0]
+    assert command.search('stdout', re.compile('^foo$'))[0]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 4096])
+@pytest.mark.parametrize('max_match_length', [10, 4096])
+@pytest.mark.parametrize('needle,expected', [
+    ('\n500\n', True),
+    ('999\n1000\n', True),
+    ('1000\n1', False),
+    (re.compile('^1\n2\n'), True),
+    (re.compile('^2$'), False),
+    (re.compile('^1000$'), False),
+    (re.compile('1000$'), True),
+    (re.compile('^500$', re.MULTILINE), True),
+    (re.compile('(?<=\n)1$', re.MULTILINE), False),
+    (re.compile('(?<!\n)1$', re.MULTILINE), True)
+])
+def test_stream_search_does_not_depend_on_the_chunks(monkeypatch, chunk_size, max_match_length, needle, expected):
+    """Test that a needle is found (or not) however the stream is split into chunks."""
+    monkeypatch.setattr(stream_search, 'CHUNK_SIZE', chunk_size)
+    monkeypatch.setattr(stream_search, 'MAX_MATCH_LENGTH', max_match_length)
+    assert stream_search.search_stream(io.BytesIO(LINES.encode()), 'utf-8', needle)[0] is expected
+    assert (re.search(needle, LINES) is not None) is expected
+
+
+def test_stream_search_tail(monkeypatch):
+    """Test that the failure message only has the end of the stream."""
+    monkeypatch.setattr(stream_search, 'TAIL_LENGTH', 5)
+    assert stream_search.search_stream(io.BytesIO(LINES.encode()), 'utf-8', 'foo') == (
+        False, '"1000\n" (the last 5 of 3893 characters)'
+    )
+    assert stream_search.search_stream(io.BytesIO(b'foo'), 'utf-8', 'bar') == (False, '"foo"')
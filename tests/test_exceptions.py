@@ -4,6 +4,7 @@ import pytest
 from testinfra_bdd import get_host_fixture
 from testinfra_bdd.address import when_the_address_and_port_is
 from testinfra_bdd.command import the_command_is
+from testinfra_bdd.parsers import parse_table
 from testinfra_bdd.pip import the_pip_package_is, the_pip_package_state_is
 from testinfra_bdd.process import the_process_filter_is
 
@@ -110,3 +111,23 @@ def test_invalid_addr_and_port_specifications(specification, exception_expected)
 
     if exception_expected:
         assert exception_raised, 'Expected an exception to be raised.'
+
+
+@pytest.mark.parametrize(
+    'table,expected_message',
+    [
+        ('| path | state |\n| /etc/motd |', 'Unable to parse table, the rows are of different lengths.'),
+        ('| path | state |\n/etc/motd', 'Unable to parse table row "/etc/motd".')
+    ]
+)
+def test_invalid_tables(table, expected_message):
+    """Test that exceptions are raised when a data table is invalid."""
+    exception_raised = False
+
+    try:
+        parse_table(table)
+    except ValueError as ex:
+        exception_raised = True
+        assert str(ex) == expected_message
+
+    assert exception_raised, 'Expected an exception to be raised.'
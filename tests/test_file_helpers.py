@@ -0,0 +1,75 @@
+"""Test gathering the properties of files with a single remote command."""
+import os
+import types
+
+import pytest
+import testinfra
+
+from testinfra_bdd import file_helpers
+
+
+class FakeHost:
+    """A host that answers the snapshot command with canned output."""
+
+    def __init__(self, rc, stdout):
+        """Create a FakeHost object."""
+        self.commands = []
+        self._result = types.SimpleNamespace(rc=rc, stdout=stdout)
+
+    def run(self, command, *args):
+        """Record the command and return the canned result."""
+        self.commands.append((command, args))
+        return self._result
+
+
+@pytest.fixture
+def files(tmp_path):
+    """Create a file, a directory, a symlink and a file with spaces in its name."""
+    (tmp_path / 'file').write_text('foo')
+    os.chmod(tmp_path / 'file', 0o755)
+    (tmp_path / 'directory').mkdir()
+    (tmp_path / 'name with spaces').write_text('foo')
+    os.symlink(tmp_path / 'directory', tmp_path / 'symlink')
+    os.symlink(tmp_path / 'missing', tmp_path / 'broken symlink')
+    names = ('file', 'directory', 'name with spaces', 'symlink', 'broken symlink', 'missing')
+    return [str(tmp_path / name) for name in names]
+
+
+def test_parse_snapshot_line():
+    """Test that the canned output of stat is parsed into the properties of the file."""
+    assert file_helpers.parse_snapshot_line('file|executable|755|root|adm') == {
+        'executable': 'executable',
+        'group': 'adm',
+        'mode': '0o755',
+        'owner': 'root',
+        'state': 'present',
+        'type': 'file',
+        'user': 'root'
+    }
+    assert file_helpers.parse_snapshot_line('|not executable|600|root|root')['type'] is None
+    assert file_helpers.parse_snapshot_line('absent') == file_helpers.ABSENT_FILE_PROPERTIES
+
+
+def test_files_snapshot():
+    """Test that the canned output of many files is parsed in the order of the paths."""
+    host = FakeHost(0, 'absent\ndirectory|executable|1777|root|root\n')
+    snapshot = file_helpers.get_files_snapshot(host, ['/no such file', '/tmp'])
+    assert snapshot['/no such file']['state'] == 'absent'
+    assert snapshot['/tmp']['mode'] == '0o1777'
+    assert host.commands[0][1] == ('/no such file', '/tmp')
+
+
+@pytest.mark.parametrize('rc,stdout', [(2, '|executable|'), (0, 'absent\n')])
+def test_files_snapshot_failure(rc, stdout):
+    """Test that there is no snapshot if stat fails or the output is incomplete."""
+    assert file_helpers.get_files_snapshot(FakeHost(rc, stdout), ['/tmp', '/etc/passwd']) is None
+
+
+def test_snapshot_matches_testinfra(monkeypatch, files):
+    """Test that the snapshot of a host has the same properties as testinfra.File."""
+    host = testinfra.get_host('local://')
+    snapshot = file_helpers.get_files_snapshot(host, files)
+    monkeypatch.setattr(file_helpers, 'get_file_snapshot', lambda file: None)
+    assert snapshot == {path: file_helpers.get_file_properties(host.file(path)) for path in files}
+    assert [snapshot[path]['type'] for path in files] == ['file', 'directory', 'file', 'directory', None, None]
+    assert [snapshot[path]['state'] for path in files[-2:]] == ['absent', 'absent']
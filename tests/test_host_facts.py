@@ -0,0 +1,57 @@
+"""Test the lazily resolved facts about a host."""
+import gc
+import types
+import weakref
+
+from testinfra_bdd import host_facts
+
+
+class FakeHost:
+    """A host that counts how often its system information is requested."""
+
+    def __init__(self):
+        """Create a FakeHost object."""
+        self.backend = types.SimpleNamespace(NAME='docker', get_hostname=lambda: 'sut')
+        self.requests = []
+
+    @property
+    def system_info(self):
+        """Record the request and return the system information."""
+        self.requests.append('system_info')
+        return types.SimpleNamespace(arch='x86_64', distribution='debian', release='12')
+
+
+def test_facts_are_resolved_lazily():
+    """Test that each fact is only resolved on first access."""
+    host = FakeHost()
+    facts = host_facts.get_host_facts(host)
+    assert host.requests == []
+    assert (facts.distribution, facts.distribution) == ('debian', 'debian')
+    assert host.requests == ['system_info']
+
+
+def test_backend_facts_do_not_query_the_host():
+    """Test that the facts known to the backend don't need the system information."""
+    host = FakeHost()
+    facts = host_facts.get_host_facts(host)
+    assert (facts.hostname, facts.connection_type) == ('sut', 'docker')
+    assert host.requests == []
+
+
+def test_facts_are_reused_per_host():
+    """Test that the facts of a host are shared but not with other hosts."""
+    (host, other_host) = (FakeHost(), FakeHost())
+    assert host_facts.get_host_facts(host) is host_facts.get_host_facts(host)
+    assert host_facts.get_host_facts(host) is not host_facts.get_host_facts(other_host)
+    assert host_facts.get_host_facts(host).arch == 'x86_64'
+    assert other_host.requests == []
+
+
+def test_facts_do_not_keep_the_host_alive():
+    """Test that the facts are discarded with their host."""
+    host = FakeHost()
+    host_reference = weakref.ref(host)
+    assert host_facts.get_host_facts(host).release == '12'
+    del host
+    gc.collect()
+    assert host_reference() is None
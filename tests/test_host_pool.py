@@ -0,0 +1,77 @@
+"""Test the pool of ready hosts."""
+import gc
+import weakref
+
+from testinfra_bdd.account_database import get_user_properties
+from testinfra_bdd.async_engine import get_async_fixture
+from testinfra_bdd.command_cache import COMMAND_CACHE
+from testinfra_bdd.host_pool import HostPool
+from testinfra_bdd.json_helpers import get_json_document
+from testinfra_bdd.package_inventory import get_pip_package
+from testinfra_bdd.parsers import parse_hostspec_pattern
+
+
+def test_pooled_hosts_share_a_backend():
+    """Test that each request gets a new fixture bound to the same backend."""
+    pool = HostPool()
+    first = pool.get_host('docker://sut')
+    second = pool.get_host('docker://sut')
+    assert first is not second
+    assert first.host is second.host
+    assert second.hostname == 'sut'
+    assert len(pool) == 1
+
+
+def test_idle_hosts_are_evicted():
+    """Test that hosts that have not been used within the idle timeout are evicted."""
+    pool = HostPool(idle_timeout=0)
+    first = pool.get_host('docker://sut')
+    pool.evict_idle_hosts(float('inf'))
+    assert len(pool) == 0
+    second = pool.get_host('docker://sut')
+    assert first.host.backend is not second.host.backend
+
+
+def test_evicted_hosts_are_released():
+    """Test that an evicted host gets a new backend and the old one is no longer cached."""
+    pool = HostPool()
+    first = pool.get_host('local://')
+    async_backend = weakref.ref(get_async_fixture(first).host.backend)
+    backend = weakref.ref(first.host.backend)
+    pool.clear()
+    second = pool.get_host('local://')
+    assert second.host.backend is not backend()
+    assert get_async_fixture(second).host.backend is not async_backend()
+    del first
+    gc.collect()
+    assert (backend(), async_backend()) == (None, None)
+
+
+def test_evicted_hosts_are_removed_from_the_host_caches(tmp_path):
+    """Test that the snapshots of an evicted host don't keep its backend alive."""
+    (pool, path) = (HostPool(), tmp_path / 'document.json')
+    path.write_text('{"foo": "bar"}')
+    host = pool.get_host('local://').host
+    get_pip_package(host, 'pytest')
+    get_user_properties(host, 'root')
+    COMMAND_CACHE.run(host, 'uname -s', cached=True)
+    assert get_json_document(host, str(path)) == {'foo': 'bar'}
+    backend = weakref.ref(host.backend)
+    pool.clear()
+    del host
+    gc.collect()
+    assert backend() is None
+
+
+def test_unready_host_is_not_pooled():
+    """Test that a host that is not ready is not added to the pool."""
+    pool = HostPool()
+    assert pool.get_host('docker://foo') is None
+    assert len(pool) == 0
+
+
+def test_hostspec_pattern_expansion():
+    """Test that ranges in a hostspec pattern are expanded."""
+    assert parse_hostspec_pattern('ssh://web-[01-03]') == ['ssh://web-01', 'ssh://web-02', 'ssh://web-03']
+    assert parse_hostspec_pattern('docker://[sut,java11]') == ['docker://sut', 'docker://java11']
+    assert parse_hostspec_pattern('ssh://[::1]') == ['ssh://[::1]']
@@ -0,0 +1,61 @@
+"""Test counting and timing the backend calls of each step."""
+import testinfra
+
+import testinfra_bdd.fixture
+from testinfra_bdd.call_recorder import BackendCallRecorder, get_summary_lines
+from testinfra_bdd.instrumentation import (InstrumentedHost,
+                                           get_instrumented_host)
+
+
+def get_recorder():
+    """Get a recorder with an unattributed call and two executions of a step."""
+    recorder = BackendCallRecorder()
+    recorder.record('local', 0.5)
+    recorder.start_step('Feature', 'Scenario', 'When the TestInfra user is ntp')
+    recorder.record('local', 0.25)
+    recorder.record('docker://sut', 0.25)
+    recorder.finish_step()
+    recorder.start_step('Feature', 'Other', 'When the TestInfra user is ntp')
+    recorder.record('local', 1.0)
+    recorder.finish_step(failed=True)
+    return recorder
+
+
+def test_calls_are_attributed_to_hosts():
+    """Test that calls are attributed to their host or are unattributed."""
+    report = get_recorder().get_report()
+    assert report['unattributed'] == {'calls': 1, 'backend_seconds': 0.5}
+    assert report['hosts'] == {
+        'docker://sut': {'calls': 1, 'backend_seconds': 0.25},
+        'local': {'calls': 3, 'backend_seconds': 1.75}
+    }
+
+
+def test_calls_are_attributed_to_steps():
+    """Test that calls are attributed to the running step."""
+    recorder = get_recorder()
+    report = recorder.get_report(top=1)
+    assert report['steps'] == {'When the TestInfra user is ntp': {'executions': 2, 'calls': 3, 'backend_seconds': 1.5}}
+    assert len(report['slowest_steps']) == 1
+    assert recorder.steps[1]['failed']
+    assert len(get_summary_lines(report)) == 5
+
+
+def test_hosts_are_instrumented_once():
+    """Test that each host is only instrumented once."""
+    host = testinfra.get_host('local://')
+    instrumented_host = get_instrumented_host(host)
+    assert isinstance(instrumented_host, InstrumentedHost)
+    assert get_instrumented_host(host) is instrumented_host
+    assert get_instrumented_host(instrumented_host) is instrumented_host
+    assert testinfra_bdd.fixture.TestinfraBDD('local://', host).host is instrumented_host
+
+
+def test_instrumented_host():
+    """Test that the commands of the host and its modules are recorded."""
+    recorder = BackendCallRecorder()
+    instrumented_host = InstrumentedHost(testinfra.get_host('local://'), recorder)
+    assert instrumented_host.check_output('echo foo') == 'foo'
+    assert instrumented_host.file('/etc/passwd').exists
+    assert recorder.unattributed['calls'] > 1
+    assert recorder.hosts == {'local': recorder.unattributed}
@@ -0,0 +1,57 @@
+"""Test reusing compiled JMESPath expressions and parsed JSON documents."""
+import os
+
+import testinfra
+
+from testinfra_bdd import json_helpers
+
+
+class CountingHost:
+    """A local host that counts the files whose content is downloaded."""
+
+    def __init__(self):
+        """Create a CountingHost object."""
+        self.downloads = []
+        self._host = testinfra.get_host('local://')
+
+    def file(self, path):
+        """Record the download of a file and return the file."""
+        self.downloads.append(path)
+        return self._host.file(path)
+
+    def run(self, command, *args):
+        """Run a command on the local host."""
+        return self._host.run(command, *args)
+
+
+def test_compiled_expressions_are_reused():
+    """Test that an expression is only compiled once."""
+    json_helpers.compile_jmespath.cache_clear()
+    expression = json_helpers.compile_jmespath('address.state')
+    assert json_helpers.compile_jmespath('address.state') is expression
+    assert json_helpers.compile_jmespath('address.city') is not expression
+    assert json_helpers.compile_jmespath.cache_info().hits == 1
+    assert expression.search({'address': {'state': 'NY'}}) == 'NY'
+
+
+def test_unchanged_documents_are_reused(tmp_path):
+    """Test that a document is only downloaded again when its file changes."""
+    (host, path) = (CountingHost(), tmp_path / 'document.json')
+    path.write_text('{"age": 27}')
+    document = json_helpers.get_json_document(host, str(path))
+    assert json_helpers.get_json_document(host, str(path)) is document
+    assert host.downloads == [str(path)]
+
+
+def test_changed_documents_are_reloaded(tmp_path):
+    """Test that a document is downloaded again when the modification time or size of its file changes."""
+    (host, path) = (CountingHost(), tmp_path / 'document.json')
+    path.write_text('{"age": 27}')
+    assert json_helpers.get_json_document(host, str(path)) == {'age': 27}
+    path.write_text('{"age": 28}')
+    os.utime(path, ns=(0, 0))
+    assert json_helpers.get_json_document(host, str(path)) == {'age': 28}
+    path.write_text('{"age": 100}')
+    os.utime(path, ns=(0, 0))
+    assert json_helpers.get_json_document(host, str(path)) == {'age': 100}
+    assert len(host.downloads) == 3
@@ -0,0 +1,103 @@
+"""Test looking packages up in a snapshot of the installed packages of a host."""
+import types
+
+import pytest
+from testinfra.modules.package import DebianPackage, RpmPackage
+
+from testinfra_bdd.package_helpers import (PackageInventory, list_pip_packages,
+                                           list_system_packages,
+                                           parse_dpkg_packages,
+                                           parse_rpm_packages)
+from testinfra_bdd.package_inventory import (InventoriedPackage,
+                                             get_system_package)
+
+DPKG_OUTPUT = '''libc6:amd64\tlibc6\tinstall ok installed\t2.36-9+deb12u4
+ntp\tntp\thold ok installed\t1:4.2.8p15+dfsg-2~1.2.2
+nano\tnano\tdeinstall ok config-files\t7.2-1
+vim\tvim\tinstall ok unpacked\t2:9.0.1378-2
+'''
+
+RPM_OUTPUT = '''bash\t5.1.8
+kernel\t5.14.0
+kernel\t5.14.1
+'''
+
+
+class FakeHost:
+    """A host that answers the package listing command with canned output."""
+
+    def __init__(self, package_class, rc, stdout):
+        """Create a FakeHost object."""
+        self.commands = []
+        self.package = type('FakePackage', (FakePackage, package_class), {})
+        self._result = types.SimpleNamespace(rc=rc, stdout=stdout)
+
+    def run(self, command, *args):
+        """Record the command and return the canned result."""
+        self.commands.append(command % args if args else command)
+        return self._result
+
+
+class FakePackage:
+    """A Testinfra package that is not installed, for when the inventory can't answer."""
+
+    is_installed = False
+    version = None
+
+    def __init__(self, name):
+        """Create a FakePackage object."""
+        self.name = name
+
+
+def test_dpkg_packages():
+    """Test that only the installed dpkg packages are listed, by both of their names."""
+    assert parse_dpkg_packages(DPKG_OUTPUT) == {
+        'libc6:amd64': '2.36-9+deb12u4',
+        'libc6': '2.36-9+deb12u4',
+        'ntp': '1:4.2.8p15+dfsg-2~1.2.2'
+    }
+
+
+def test_rpm_packages():
+    """Test that packages with more than one version are left out of the rpm packages."""
+    assert parse_rpm_packages(RPM_OUTPUT) == {'bash': '5.1.8'}
+
+
+@pytest.mark.parametrize('name,is_installed,version', [
+    ('ntp', True, '1:4.2.8p15+dfsg-2~1.2.2'),
+    ('nano', False, None),
+    ('Not-A-Debian-Name', False, None)
+])
+def test_inventoried_system_packages(name, is_installed, version):
+    """Test that system packages are looked up in the inventory with a single remote command."""
+    host = FakeHost(DebianPackage, 0, DPKG_OUTPUT)
+    package = get_system_package(host, name)
+    assert isinstance(package, InventoriedPackage)
+    assert (package.is_installed, package.version) == (is_installed, version)
+    assert len(host.commands) == 1 and host.commands[0].startswith('dpkg-query -W')
+
+
+def test_inventory_fallback():
+    """Test that names the inventory is not authoritative for are checked on the host."""
+    inventory = PackageInventory({'bash': '5.1.8'})
+    assert InventoriedPackage(FakePackage('bash'), inventory).version == '5.1.8'
+    package = InventoriedPackage(FakePackage('kernel'), inventory)
+    package._package.is_installed = True
+    assert package.is_installed
+    assert package.version is None
+
+
+@pytest.mark.parametrize('package_class,rc', [(RpmPackage, 1), (object, 0)])
+def test_unlisted_system_packages(package_class, rc):
+    """Test that there is no inventory if the packages can't be listed."""
+    assert list_system_packages(FakeHost(package_class, rc, RPM_OUTPUT)) is None
+
+
+def test_pip_packages():
+    """Test that pip package names are normalised and the pip list is authoritative."""
+    host = FakeHost(object, 0, '[{"name": "Pytest_BDD", "version": "7.3.0"}]')
+    inventory = list_pip_packages(host, '/usr/bin/pip3')
+    assert host.commands == ['/usr/bin/pip3 list --no-index --format=json']
+    assert inventory.get_version('pytest.bdd') == '7.3.0'
+    assert inventory.is_authoritative('foo')
+    assert list_pip_packages(FakeHost(object, 1, ''), 'pip') is None
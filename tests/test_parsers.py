@@ -0,0 +1,64 @@
+"""Test the step parsers."""
+from unittest import mock
+
+import pytest
+import pytest_bdd.parsers
+
+from testinfra_bdd import parsers
+
+FORMATS = [
+    'the TestInfra command is "{command}"',
+    'the TestInfra command is {command}',
+    'the TestInfra file is {file_name}',
+    'the TestInfra package is {package_name}',
+    'the TestInfra service is {service_name}',
+    'the TestInfra user is "{user_name}"',
+    'the TestInfra {resource_type} is {state}',
+    'the TestInfra file is {expected_state:w}',
+    '{resource} is absent'
+]
+
+NAMES = [
+    'the TestInfra command is "ntpq -np"',
+    'the TestInfra command is ntpq -np',
+    'The TestInfra file is /etc/ntp.conf',
+    'the TestInfra file is present',
+    'the TestInfra package is ntp',
+    'the TestInfra user is "ntp"',
+    'the TestInfra host with URL "docker://sut" is ready',
+    'the TestInfra user is ntp',
+    'the file is absent',
+    'the TestInfra file'
+]
+
+
+@pytest.mark.parametrize('step_format', FORMATS)
+def test_matches_like_pytest_bdd(step_format):
+    """Test that the step parser matches and parses steps exactly like the pytest-bdd parser."""
+    expected_parser = pytest_bdd.parsers.parse(step_format)
+    actual_parser = parsers.parse(step_format)
+
+    for name in NAMES:
+        is_matching = expected_parser.is_matching(name)
+        assert actual_parser.is_matching(name) == is_matching, name
+
+        if is_matching:
+            assert actual_parser.parse_arguments(name) == expected_parser.parse_arguments(name)
+
+
+def test_parse_arguments_without_match():
+    """Test that the arguments can be parsed without a preceding match."""
+    parser = parsers.parse('the TestInfra file is {file_name}')
+    parser.is_matching('the TestInfra file is /etc/passwd')
+    assert parser.parse_arguments('the TestInfra file is /etc/hosts') == {'file_name': '/etc/hosts'}
+
+
+def test_steps_with_another_prefix_are_not_parsed():
+    """Test that a step with a different literal prefix is rejected without parsing it."""
+    parser = parsers.parse('the TestInfra file is {file_name}')
+    parser.parser = mock.Mock(wraps=parser.parser)
+    assert not parser.is_matching('the TestInfra user is ntp')
+    assert not parser.is_matching('the file is /etc/hosts')
+    parser.parser.parse.assert_not_called()
+    assert parser.is_matching('The TestInfra file is /etc/hosts')
+    parser.parser.parse.assert_called_once_with('The TestInfra file is /etc/hosts')
@@ -0,0 +1,82 @@
+"""Test the cache of the outdated pip packages of each host."""
+import json
+import types
+
+import pytest
+
+from testinfra_bdd.pip_helpers import (OutdatedPackagesCache,
+                                       parse_outdated_packages)
+
+OUTDATED = [{'name': 'pip', 'version': '23.0.1', 'latest_version': '24.2', 'latest_filetype': 'wheel'}]
+
+VERSIONS = {'pip': {'current': '23.0.1', 'latest': '24.2'}}
+
+
+class FakeHost:
+    """A host that counts how often its outdated packages are fetched."""
+
+    def __init__(self, host_id='docker://sut'):
+        """Create a FakeHost object."""
+        self.backend = types.SimpleNamespace(get_pytest_id=lambda: host_id)
+        self.commands = []
+        self.pip = types.SimpleNamespace(get_outdated_packages=self.get_outdated_packages)
+
+    def get_outdated_packages(self, pip_path):
+        """Record the pip executable and return the outdated packages."""
+        self.commands.append(pip_path)
+        return VERSIONS
+
+    def run_expect(self, expected, command, *args):
+        """Record the command and return the outdated packages as JSON."""
+        self.commands.append(command % args)
+        return types.SimpleNamespace(stdout=json.dumps(OUTDATED))
+
+
+def write_outdated_json(tmp_path, outdated):
+    """Write pre-captured outdated packages to a file and return its path."""
+    path = tmp_path / 'outdated.json'
+    path.write_text(json.dumps(outdated))
+    return str(path)
+
+
+def test_parse_outdated_packages():
+    """Test that the pip output is in the same format as testinfra."""
+    assert parse_outdated_packages(json.dumps(OUTDATED)) == VERSIONS
+    assert parse_outdated_packages('[]') == {}
+
+
+def test_outdated_packages_are_cached_per_pip():
+    """Test that the host is only queried once for each pip executable."""
+    (cache, host) = (OutdatedPackagesCache(), FakeHost())
+    assert cache.get_outdated_packages(host) == VERSIONS
+    assert cache.get_outdated_packages(host) == VERSIONS
+    assert cache.get_outdated_packages(host, 'pip3') == VERSIONS
+    assert host.commands == ['pip', 'pip3']
+
+
+def test_outdated_packages_from_an_index():
+    """Test that the installed packages can be compared with another package index."""
+    (cache, host) = (OutdatedPackagesCache(index_url='http://mirror/simple'), FakeHost())
+    assert cache.get_outdated_packages(host, 'pip3') == VERSIONS
+    assert host.commands == ['pip3 list -o --format=json --index-url http://mirror/simple']
+
+
+@pytest.mark.parametrize('outdated', [
+    OUTDATED,
+    {'docker://sut': OUTDATED, 'local': []},
+    {'docker://sut': {'pip3': OUTDATED, 'pip': []}}
+])
+def test_offline_outdated_packages(tmp_path, outdated):
+    """Test that pre-captured outdated packages are used for a single host or looked up by host."""
+    (cache, host) = (OutdatedPackagesCache(outdated_json=write_outdated_json(tmp_path, outdated)), FakeHost())
+    assert cache.get_outdated_packages(host, 'pip3') == VERSIONS
+    assert host.commands == []
+
+
+@pytest.mark.parametrize('pip_path,host_id', [('pip', 'docker://sut'), ('pip3', 'local')])
+def test_offline_outdated_packages_not_captured(tmp_path, pip_path, host_id):
+    """Test that a host that was not captured is not checked against another host."""
+    path = write_outdated_json(tmp_path, {'docker://sut': {'pip3': OUTDATED}})
+
+    with pytest.raises(KeyError, match=f'{pip_path} on {host_id} were not captured'):
+        OutdatedPackagesCache(outdated_json=path).get_outdated_packages(FakeHost(host_id), pip_path)
@@ -0,0 +1,27 @@
+"""Test resolving process filters from a snapshot of the process table."""
+import testinfra
+
+from testinfra_bdd.process_snapshot import (ProcessSnapshot,
+                                            get_process_count_mismatches)
+
+
+def test_process_snapshot():
+    """Test that the filters are resolved from the snapshot."""
+    snapshot = ProcessSnapshot(testinfra.get_host('docker://sut'))
+    ntpd = snapshot.filter('user=root,comm=ntpd')
+    assert len(ntpd) == 1
+    assert snapshot.filter('user=root,comm=ntpd') is ntpd
+    assert snapshot.filter(f'pid={ntpd[0].pid}') == ntpd
+    assert not snapshot.filter('user=nobody,comm=ntpd')
+
+
+def test_process_count_mismatches():
+    """Test that the process counts are compared against the expectations."""
+    snapshot = ProcessSnapshot(testinfra.get_host('docker://sut'))
+    rows = [
+        {'specification': 'comm=ntpd', 'count': '1'},
+        {'specification': 'comm=foo', 'count': '1'}
+    ]
+    assert get_process_count_mismatches(snapshot, rows) == [
+        'Expected the process count of "comm=foo" to be 1 but it is 0.'
+    ]
@@ -0,0 +1,13 @@
+"""Test the preparation of regex patterns."""
+from testinfra_bdd.regex_helpers import prepare_pattern
+
+
+def test_patterns_are_compiled_once():
+    """Test that a repeated pattern is taken from the cache."""
+    prepare_pattern.cache_clear()
+    first = prepare_pattern(r'openjdk version \"11\\W[0-9]')
+    second = prepare_pattern(r'openjdk version \"11\\W[0-9]')
+    assert first is second
+    assert first.search('openjdk version "11.0.2"') is not None
+    assert prepare_pattern.cache_info().hits == 1
+    assert prepare_pattern.cache_info().misses == 1
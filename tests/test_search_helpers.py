@@ -0,0 +1,105 @@
+"""Test searching the content of files."""
+import re
+
+import pytest
+import testinfra
+
+from testinfra_bdd import search_helpers, stream_search
+from testinfra_bdd.call_recorder import BackendCallRecorder
+from testinfra_bdd.instrumentation import InstrumentedHost
+from testinfra_bdd.search_helpers import grep_file, search_file
+from testinfra_bdd.stream_search import EXCERPT_LENGTH, get_excerpt
+
+
+@pytest.fixture
+def recorder():
+    """A recorder of the commands that are run on the local host."""
+    return BackendCallRecorder()
+
+
+@pytest.fixture
+def file(tmp_path, recorder):
+    """A local file that is searched through an instrumented host."""
+    path = tmp_path / 'foo.conf'
+    path.write_text('server 0.pool.ntp.org\nserver a.b\n')
+    host = InstrumentedHost(testinfra.get_host('local://'), recorder, 'local://')
+    return host.file(str(path))
+
+
+def test_excerpt_is_bounded():
+    """Test that only the start of long content is shown."""
+    assert get_excerpt('foo') == '"foo"'
+    excerpt = get_excerpt('x' * (EXCERPT_LENGTH * 2))
+    assert excerpt.endswith(f' (the first {EXCERPT_LENGTH} of {EXCERPT_LENGTH * 2} characters)')
+
+
+def test_grep_file():
+    """Test searching a file on the host."""
+    file = testinfra.get_host('docker://sut').file('/etc/ntp.conf')
+    assert grep_file(file, 'text', 'debian.pool.ntp')
+    assert not grep_file(file, 'text', 'debian.pool.ntp.com')
+    assert grep_file(file, 'regex', re.compile(r'pool [0-9]\.debian'))
+
+
+@pytest.mark.parametrize('search_type,needle', [
+    ('text', '0.pool.ntp'),
+    ('regex', re.compile(r'^server \d\.pool')),
+    ('regex', re.compile(r'org\nserver a'))
+])
+def test_a_match_costs_one_remote_command(file, recorder, search_type, needle):
+    """Test that a file that contains the needle is searched with a single remote command."""
+    calls = recorder.unattributed['calls']
+    assert search_file(file, search_type, needle)[0]
+    assert recorder.unattributed['calls'] == calls + 1
+
+
+def test_text_is_not_a_pattern(file):
+    """Test that text is searched for as it is rather than as a grep pattern."""
+    assert search_file(file, 'text', 'a.b')[0]
+    assert not search_file(file, 'text', r'a\.b')[0]
+    assert not search_file(file, 'text', '0.pool.ntp.org$')[0]
+
+
+def test_failures_have_an_excerpt(file, monkeypatch):
+    """Test that a failed search shows the start of the file."""
+    monkeypatch.setattr(search_helpers, 'EXCERPT_LENGTH', 6)
+    assert search_file(file, 'text', 'foo') == (False, '"server" (the first 6 of 33 bytes)')
+
+
+def test_excerpts_can_end_part_way_through_a_character(file, monkeypatch):
+    """Test that an excerpt that cuts a multibyte character in half is still shown."""
+    monkeypatch.setattr(search_helpers, 'EXCERPT_LENGTH', 2)
+    with open(file.path, 'w', encoding='utf-8') as stream:
+        stream.write('\u00e9t\u00e9')
+
+    assert search_file(file, 'text', 'foo') == (False, '"\u00e9" (the first 2 of 5 bytes)')
+    monkeypatch.setattr(search_helpers, 'EXCERPT_LENGTH', 4)
+    assert search_file(file, 'text', 'foo') == (False, '"\u00e9t\ufffd" (the first 4 of 5 bytes)')
+
+
+def test_large_files_are_searched_on_the_host(file, monkeypatch):
+    """Test that a regex is matched against the lines of a large file on the host."""
+    monkeypatch.setattr(search_helpers, 'FILE_SEARCH_THRESHOLD', 8)
+    assert search_file(file, 'regex', re.compile(r'^server a\.b$')) == (True, '')
+    assert not search_file(file, 'regex', re.compile(r'org\nserver'))[0]
+
+
+def test_large_files_are_streamed_without_grep_p(file, monkeypatch):
+    """Test that a large file is searched locally a chunk at a time if grep does not support -P."""
+    monkeypatch.setattr(search_helpers, 'FILE_SEARCH_THRESHOLD', 8)
+    monkeypatch.setitem(search_helpers.GREP_OPTIONS, 'regex', '--no-such-option')
+    monkeypatch.setattr(stream_search, 'CHUNK_SIZE', 4)
+    assert search_file(file, 'regex', re.compile(r'(?m)^server a\.b$'))[0]
+    assert search_file(file, 'regex', re.compile(r'org\nserver'))[0]
+    assert search_file(file, 'regex', re.compile('foo')) == (False, '"server 0.pool.ntp.org\nserver a.b\n"')
+
+
+def test_missing_files(file):
+    """Test that searching a missing file is an error rather than a failure."""
+    missing = file._host.file(f'{file.path}.missing')
+
+    with pytest.raises(AssertionError, match='Unable to search'):
+        search_file(missing, 'text', 'foo')
+
+    with pytest.raises(RuntimeError):
+        search_file(missing, 'regex', re.compile('foo'))
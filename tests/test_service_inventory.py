@@ -0,0 +1,26 @@
+"""Test looking services up in a snapshot of the services of a host."""
+import testinfra
+
+from testinfra_bdd.service_inventory import (InventoriedService, get_service,
+                                             get_service_mismatches)
+
+
+def test_service_inventory():
+    """Test that the services are looked up in the snapshot."""
+    host = testinfra.get_host('docker://sut')
+    service = get_service(host, 'ntp')
+    assert isinstance(service, InventoriedService)
+    assert service.is_running
+    assert service.is_enabled
+
+
+def test_service_mismatches():
+    """Test that the states of many services are compared against the expectations."""
+    host = testinfra.get_host('docker://sut')
+    rows = [
+        {'service': 'ntp', 'running': 'running', 'enabled': ''},
+        {'service': 'named', 'running': 'running', 'enabled': 'not enabled'}
+    ]
+    assert get_service_mismatches(host, rows) == [
+        'Expected service named to be running but it is not running.'
+    ]
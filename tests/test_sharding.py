@@ -0,0 +1,66 @@
+"""Test grouping the scenarios of each host on the same pytest-xdist worker."""
+import pytest
+
+from testinfra_bdd.sharding import get_hostspec
+
+pytest_plugins = ['pytester']
+
+FEATURE = '''Feature: Sharding
+  Scenario: Local
+    Given the TestInfra host with URL "local://" is ready within 10 seconds
+    When the TestInfra user is "root"
+
+  Scenario Outline: Outline
+    Given the TestInfra host with URL "<hostspec>" is ready
+    When the TestInfra user is "root"
+    Examples:
+      | hostspec     |
+      | docker://sut |
+      | local://     |
+
+  Scenario: Fleet
+    Given the TestInfra hosts matching "ssh://web-[01-02]" are ready
+
+  Scenario: Unknown
+    Given the TestInfra benchmark host is ready
+'''
+
+TEST_MODULE = '''
+from pytest_bdd import scenarios
+
+import testinfra_bdd
+
+scenarios('sharding.feature')
+
+pytest_plugins = testinfra_bdd.PYTEST_MODULES
+
+
+def test_not_a_scenario():
+    pass
+'''
+
+
+@pytest.fixture
+def items(pytester):
+    """The items of a feature, collected with the sharding plugin."""
+    pytester.makefile('.feature', sharding=FEATURE)
+    pytester.makepyfile(test_sharded_feature=TEST_MODULE)
+    (items, _) = pytester.inline_genitems('-p', 'no:cacheprovider')
+    return {item.name: item for item in items}
+
+
+def test_scenarios_are_grouped_by_hostspec(items):
+    """Test that each scenario is marked with the hostspec of its Given step."""
+    groups = {name: item.get_closest_marker('xdist_group') for (name, item) in items.items()}
+    assert {name: mark.args[0] for (name, mark) in groups.items() if mark} == {
+        'test_local': 'local://',
+        'test_outline[docker://sut]': 'docker://sut',
+        'test_outline[local://]': 'local://',
+        'test_fleet': 'ssh://web-[01-02]'
+    }
+
+
+def test_items_without_a_hostspec(items):
+    """Test that scenarios without a host and other tests are not grouped."""
+    assert get_hostspec(items['test_unknown']) is None
+    assert get_hostspec(items['test_not_a_scenario']) is None
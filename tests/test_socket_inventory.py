@@ -0,0 +1,61 @@
+"""Test checking sockets against an inventory of the listening sockets."""
+import types
+
+import pytest
+import testinfra
+
+from testinfra_bdd.socket_inventory import (SocketInventory,
+                                            get_socket_mismatches,
+                                            parse_listening_socket)
+
+LISTENING_SOCKETS = [
+    'udp://127.0.0.53%lo:53',
+    'tcp://[fe80::1]%eth0:22',
+    'tcp://fe80::2%eth0:80',
+    'tcp://0.0.0.0:8080',
+    'unix:///run/100%.sock',
+    'tcp://*:443'
+]
+
+
+class FakeHost:
+    """A host that lists canned listening sockets."""
+
+    def __init__(self):
+        """Create a FakeHost object."""
+        self.socket = types.SimpleNamespace(get_listening_sockets=lambda: LISTENING_SOCKETS)
+
+
+def test_socket_inventory():
+    """Test that the sockets are checked against a single listing."""
+    inventory = SocketInventory(testinfra.get_host('docker://sut'))
+    assert inventory.get_state('udp://123') == 'listening'
+    assert inventory.get_state('tcp://22') == 'not listening'
+    rows = [
+        {'url': 'udp://123', 'state': 'listening'},
+        {'url': 'tcp://22', 'state': 'listening'}
+    ]
+    assert get_socket_mismatches(inventory, rows) == [
+        'Expected socket tcp://22 to be listening but it is not listening.'
+    ]
+
+
+@pytest.mark.parametrize('socketspec,expected', [
+    ('udp://127.0.0.53%lo:53', ('udp', '127.0.0.53', 53)),
+    ('tcp://[fe80::1]%eth0:22', ('tcp', 'fe80::1', 22)),
+    ('tcp://fe80::2%eth0:80', ('tcp', 'fe80::2', 80)),
+    ('unix:///run/100%.sock', ('unix', '/run/100%.sock', None)),
+    ('tcp://*:443', None)
+])
+def test_parse_listening_socket(socketspec, expected):
+    """Test that the scope of an address is ignored and sockets that can't be parsed are left out."""
+    assert parse_listening_socket(socketspec) == expected
+
+
+def test_scoped_sockets():
+    """Test that sockets on an address with a scope are checked without it."""
+    inventory = SocketInventory(FakeHost())
+    assert inventory.get_state('udp://127.0.0.53:53') == 'listening'
+    assert inventory.get_state('tcp://fe80::1:22') == 'listening'
+    assert inventory.get_state('tcp://0.0.0.0:8080') == 'listening'
+    assert inventory.get_state('tcp://443') == 'not listening'